@@ -0,0 +1,65 @@
+"""Time the board engine (devig + consensus/edge/Kelly matrices) without Qt.
+
+Run from the repository root:
+
+    python benchmarks/bench_consensus.py [n_events] [n_books]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from consensus import compute_board  # noqa: E402
+from devig import devig_columns  # noqa: E402
+from snapshots import ColumnarOdds  # noqa: E402
+
+
+def synthetic_board(n_events: int, n_books: int, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    books = [f"book{b}" for b in range(n_books)]
+    events = []
+    for e in range(n_events):
+        fair_home = rng.uniform(0.25, 0.75)
+        bookmakers = []
+        for key in books:
+            margin = rng.uniform(1.02, 1.06)
+            noise = rng.normal(0, 0.015)
+            home = min(max(fair_home + noise, 0.05), 0.95)
+            bookmakers.append({'key': key, 'markets': [{'key': 'h2h', 'outcomes': [
+                {'name': 'Home', 'price': 1 / (home * margin)},
+                {'name': 'Away', 'price': 1 / ((1 - home) * margin)},
+            ]}]})
+        events.append({'id': f"ev{e}", 'home_team': 'Home', 'away_team': 'Away', 'bookmakers': bookmakers})
+    return events, books
+
+
+def main() -> None:
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    n_books = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    events, books = synthetic_board(n_events, n_books)
+
+    start = time.perf_counter()
+    columns = ColumnarOdds(events)
+    columns_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fair = devig_columns(columns)
+    devig_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    board = compute_board(events, 'h2h', books, books[:4], {books[0]: 3.0}, columns=columns, fair=fair)
+    board_s = time.perf_counter() - start
+
+    print(f"events={n_events} books={n_books} rows={len(board)}")
+    print(f"columns:       {columns_s * 1000:8.1f} ms")
+    print(f"devig:         {devig_s * 1000:8.1f} ms")
+    print(f"compute_board: {board_s * 1000:8.1f} ms")
+    print(f"+EV rows:      {int((board.best_edge > 0).sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Throughput of odds conversion and display formatting.
+
+Conversion compares vectorized arrays with a per-price loop; formatting
+compares the lookup tables with per-price arithmetic.
+
+Run from the repository root:
+
+    python benchmarks/bench_pricing.py [n_prices]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from pricing import (  # noqa: E402
+    DISPLAY_FORMATS,
+    FormatCache,
+    ODDS_FORMATS,
+    convert_odds,
+    format_decimal_price,
+    format_price,
+)
+
+
+def sample_prices(n: int, seed: int = 7) -> np.ndarray:
+    """Decimal prices between 1.05 and 15.0, with the +-100 edge (2.0) mixed in."""
+    rng = np.random.default_rng(seed)
+    prices = 1.05 + rng.gamma(2.0, 0.6, size=n)
+    prices[:: 97] = 2.0
+    return np.minimum(prices, 15.0)
+
+
+def time_call(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    decimal = sample_prices(n)
+    inputs = {fmt: convert_odds("decimal", fmt, decimal) for fmt in ODDS_FORMATS}
+    loop_n = min(n, 100_000)
+
+    print(f"{'pair':<26}{'vector Mprices/s':>18}{'scalar Mprices/s':>18}{'speedup':>10}")
+    for src in ODDS_FORMATS:
+        for dst in ODDS_FORMATS:
+            if src == dst:
+                continue
+            arr = inputs[src]
+            scalars = arr[:loop_n].tolist()
+            vec = time_call(lambda: convert_odds(src, dst, arr))
+            loop = time_call(lambda: [convert_odds(src, dst, x) for x in scalars], repeat=1)
+            vec_rate = n / vec / 1e6
+            loop_rate = loop_n / loop / 1e6
+            print(f"{src + ' -> ' + dst:<26}{vec_rate:>18.1f}{loop_rate:>18.2f}{vec_rate / loop_rate:>9.0f}x")
+
+    quoted = np.round(decimal[:loop_n], 2).tolist()
+    format_price(2.0, "american")  # build the table outside the timing
+    print(f"\n{'format':<26}{'table Mprices/s':>18}{'arith Mprices/s':>18}{'speedup':>10}")
+    for fmt in DISPLAY_FORMATS:
+        table = time_call(lambda: [format_price(x, fmt) for x in quoted])
+        arith = time_call(lambda: [format_decimal_price(x, fmt) for x in quoted])
+        print(f"{fmt:<26}{loop_n / table / 1e6:>18.2f}{loop_n / arith / 1e6:>18.2f}{arith / table:>9.1f}x")
+
+    # a 3,000-cell board redrawn 20 times through the memoized formatter
+    cells = quoted[:3000]
+    cache = FormatCache()
+    start = time.perf_counter()
+    for _ in range(20):
+        for x in cells:
+            cache.format(x, "decimal", "american")
+    per_draw = (time.perf_counter() - start) / 20
+    print(f"\n3000-cell redraw: {per_draw * 1000:.2f} ms, hit rate {cache.stats()['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
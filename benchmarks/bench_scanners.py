@@ -0,0 +1,116 @@
+"""Time the arbitrage and middle scans over synthetic boards.
+
+Run from the repository root:
+
+    python benchmarks/bench_scanners.py [n_events] [n_books]
+
+The middle scan runs over an NFL Sunday slate (16 games) with a 40-line
+alternate spread and total ladder per book.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from scanners import scan_middles, scan_snapshots  # noqa: E402
+from snapshots import SnapshotStore  # noqa: E402
+
+
+def synthetic_events(n_events: int, n_books: int, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    events = []
+    for e in range(n_events):
+        fair = rng.uniform(0.25, 0.75)
+        line = rng.choice([1.5, 2.5, 3.5, 6.5, 7.5])
+        total = rng.choice([41.5, 44.5, 47.5])
+        bookmakers = []
+        for b in range(n_books):
+            margin = rng.uniform(1.03, 1.06)
+            p = min(max(fair + rng.normal(0, 0.01), 0.05), 0.95)
+            side = min(max(0.5 + rng.normal(0, 0.01), 0.05), 0.95)
+            bookmakers.append({'key': f"book{b}", 'markets': [
+                {'key': 'h2h', 'outcomes': [
+                    {'name': 'Home', 'price': 1 / (p * margin)},
+                    {'name': 'Away', 'price': 1 / ((1 - p) * margin)}]},
+                {'key': 'spreads', 'outcomes': [
+                    {'name': 'Home', 'point': -line, 'price': 1 / (side * margin)},
+                    {'name': 'Away', 'point': line, 'price': 1 / ((1 - side) * margin)}]},
+                {'key': 'totals', 'outcomes': [
+                    {'name': 'Over', 'point': total, 'price': 1 / (side * margin)},
+                    {'name': 'Under', 'point': total, 'price': 1 / ((1 - side) * margin)}]},
+            ]})
+        events.append({'id': f"ev{e}", 'bookmakers': bookmakers})
+    return events
+
+
+def alternate_ladders(events, n_books: int, n_lines: int = 40, seed: int = 9):
+    """Half-point ladders around each event's main lines, priced off a logistic."""
+    rng = np.random.default_rng(seed)
+    steps = (np.arange(n_lines) - n_lines // 2) * 0.5
+    alternates = []
+    for event in events:
+        main = {m['key']: m['outcomes'] for m in event['bookmakers'][0]['markets']}
+        margin, total = -main['spreads'][0]['point'], main['totals'][0]['point']
+        bookmakers = []
+        for b in range(n_books):
+            expected_margin = margin + rng.normal(0, 0.25)
+            expected_total = total + rng.normal(0, 0.25)
+            spreads, totals = [], []
+            for home_point in -margin + steps:
+                p_home = 1 / (1 + np.exp(-0.12 * (expected_margin + home_point)))
+                spreads.append({'name': 'Home', 'point': home_point, 'price': 1 / (p_home * 1.04)})
+                spreads.append({'name': 'Away', 'point': -home_point, 'price': 1 / ((1 - p_home) * 1.04)})
+            for line in total + steps:
+                p_over = 1 / (1 + np.exp(-0.12 * (expected_total - line)))
+                totals.append({'name': 'Over', 'point': line, 'price': 1 / (p_over * 1.04)})
+                totals.append({'name': 'Under', 'point': line, 'price': 1 / ((1 - p_over) * 1.04)})
+            bookmakers.append({'key': f"book{b}", 'markets': [
+                {'key': 'alternate_spreads', 'outcomes': spreads},
+                {'key': 'alternate_totals', 'outcomes': totals},
+            ]})
+        alternates.append({'id': event['id'], 'sport_key': 'americanfootball_nfl', 'bookmakers': bookmakers})
+    return alternates
+
+
+def main() -> None:
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_books = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    events = synthetic_events(n_events, n_books)
+    store = SnapshotStore()
+    half = n_events // 2
+    snapshots = [store.publish('sport_a', events[:half]), store.publish('sport_b', events[half:])]
+    for snap in snapshots:
+        snap.columns  # built once per published snapshot in the app
+
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        opportunities = scan_snapshots(snapshots)
+        best = min(best, time.perf_counter() - start)
+    rows = sum(len(s.columns) for s in snapshots)
+    print(f"events={n_events} books={n_books} rows={rows}")
+    print(f"scan: {best * 1000:8.1f} ms, {len(opportunities)} opportunities")
+    if opportunities:
+        print(f"best margin: {opportunities[0].margin:.2%}")
+
+    slate = synthetic_events(16, n_books, seed=13)
+    nfl = store.publish(('americanfootball_nfl', 'spreads', ''), slate)
+    alternates = alternate_ladders(slate, n_books)
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        middles = scan_middles([nfl], alternates)
+        best = min(best, time.perf_counter() - start)
+    print(f"\nNFL slate: 16 games, {n_books} books, 40-line alternate ladders")
+    print(f"middles: {best * 1000:8.1f} ms, {len(middles)} with +EV")
+    if middles:
+        top = middles[0]
+        print(f"best: {top.market} {top.low:g}..{top.high:g} ev={top.ev:.2%} hit={top.hit_probability:.1%}")
+
+
+if __name__ == "__main__":
+    main()
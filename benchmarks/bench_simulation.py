@@ -0,0 +1,109 @@
+"""Time the chunked Monte Carlo kernel (float32 vs float64) and its peak memory,
+then the exact/binned P/L distribution against 100k sampled trials, then
+the sharded process-pool kernel at 1..N workers (N = CPU count), then the
+bankroll path simulator (5,000 paths x 100 slates).
+
+Run from the repository root:
+
+    python benchmarks/bench_simulation.py [trials] [n_wagers]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from simulation import (  # noqa: E402
+    pl_distribution, sample_stats, shutdown_pool, simulate_paths, simulate_pl, simulate_pl_sharded,
+)
+
+
+def synthetic_wagers(n_wagers: int, seed: int = 13):
+    """Side + total wagers on n_wagers / 2 games."""
+    rng = np.random.default_rng(seed)
+    wagers = []
+    for i in range(n_wagers):
+        game = i // 2
+        p = float(rng.uniform(0.3, 0.7))
+        total = i % 2 == 1
+        wagers.append({
+            'event_id': f"ev{game}",
+            'event': f"Away{game} @ Home{game}",
+            'outcome': 'Over' if total else f"Home{game}",
+            'market': 'totals' if total else 'h2h',
+            'consensus_probability': p,
+            'odds_decimal': 1.03 / p,
+            'stake': float(rng.uniform(5, 50)),
+            'sportsbook': f"book{game % 4}",
+        })
+    return wagers
+
+
+def main() -> None:
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    n_wagers = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    wagers = synthetic_wagers(n_wagers)
+    print(f"trials={trials:,} wagers={n_wagers}")
+    for dtype in (np.float32, np.float64):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = simulate_pl(wagers, trials, rng=np.random.default_rng(0), dtype=dtype)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{np.dtype(dtype).name:8s} {elapsed:7.2f} s  peak {peak / 2**20:7.1f} MB  "
+            f"mean {float(result.totals.mean()):9.2f}  P(loss) {float((result.totals < 0).mean()):.4f}"
+        )
+
+    for n in (8, 16, n_wagers):
+        slate = synthetic_wagers(n)
+        start = time.perf_counter()
+        dist = pl_distribution(slate)
+        exact_time = time.perf_counter() - start
+        start = time.perf_counter()
+        sim = simulate_pl(slate, 100_000, rng=np.random.default_rng(0))
+        sim_time = time.perf_counter() - start
+        if dist is None:
+            print(f"wagers={n:<4d} distribution too costly; Monte Carlo {sim_time * 1e3:7.1f} ms")
+            continue
+        stats, sampled = dist.stats(), sample_stats(sim.totals, sim.all_lose)
+        print(
+            f"wagers={n:<4d} {dist.mode:6s} {exact_time * 1e3:7.1f} ms (support {len(dist):,})  "
+            f"vs 100k trials {sim_time * 1e3:7.1f} ms  "
+            f"p5 {stats['p5']:9.2f}/{sampled['p5']:9.2f}  P(loss) {stats['prob_loss']:.4f}/{sampled['prob_loss']:.4f}"
+        )
+
+    cores = os.cpu_count() or 1
+    counts = sorted({1, *(w for w in (2, 4, 8, 16) if w < cores), cores})
+    baseline = None
+    for workers in counts:
+        # warm the pool so spawn time is not billed to the run
+        simulate_pl_sharded(wagers, workers, seed=0, workers=workers, shard_trials=1)
+        start = time.perf_counter()
+        result = simulate_pl_sharded(wagers, trials, seed=0, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(
+            f"workers={workers:<3d} {elapsed:7.2f} s  speedup {baseline / elapsed:5.2f}x  "
+            f"mean {float(result.totals.mean()):9.2f}"
+        )
+    shutdown_pool()
+
+    bankrolls = {f"book{i}": 2500.0 for i in range(4)}
+    start = time.perf_counter()
+    paths = simulate_paths(wagers, bankrolls, slates=100, paths=5_000, seed=0)
+    elapsed = time.perf_counter() - start
+    stats = paths.stats()
+    print(
+        f"paths    {elapsed:7.2f} s  median final P/L {stats['median']:12.2f}  "
+        f"drawdown p95 {stats['drawdown_p95']:.1%}  P(ruin) {stats['prob_ruin']:.2%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
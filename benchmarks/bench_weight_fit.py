@@ -0,0 +1,49 @@
+"""Time the offline sportsbook weight fit on synthetic settled markets.
+
+Run from the repository root:
+
+    python benchmarks/bench_weight_fit.py [n_markets] [n_books]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from weight_fit import TrainingRows, consensus_log_loss, fit_weights  # noqa: E402
+
+
+def synthetic_rows(n_markets: int, n_books: int, seed: int = 5) -> TrainingRows:
+    rng = np.random.default_rng(seed)
+    truth = rng.uniform(0.15, 0.85, n_markets)
+    won = rng.random(n_markets) < truth
+    noise = np.linspace(0.01, 0.12, n_books)
+    # each book quotes ~80% of the markets
+    quoted = rng.random((n_books, n_markets)) < 0.8
+    book, instance = np.nonzero(quoted)
+    p = np.clip(truth[instance] + rng.normal(0, noise[book]), 0.02, 0.98)
+    prob = np.where(won[instance], p, 1 - p)
+    return TrainingRows(instance, book, prob, [f"book{b}" for b in range(n_books)])
+
+
+def main() -> None:
+    n_markets = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_books = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    rows = synthetic_rows(n_markets, n_books)
+
+    start = time.perf_counter()
+    weights = fit_weights(rows, iterations=200)
+    fit_s = time.perf_counter() - start
+
+    print(f"markets={n_markets} books={n_books} rows={len(rows)}")
+    print(f"fit (200 steps): {fit_s * 1000:8.1f} ms")
+    print(f"log-loss equal:  {consensus_log_loss(rows, np.ones(n_books)):.5f}")
+    print(f"log-loss fitted: {consensus_log_loss(rows, weights):.5f}")
+    print("weights:", np.round(weights, 3).tolist())
+
+
+if __name__ == "__main__":
+    main()
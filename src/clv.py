@@ -0,0 +1,417 @@
+"""Closing line value (CLV) tracking for recommended wagers.
+
+Every wager the board recommends is recorded once with its bet-time price
+and consensus and persisted to ``data/clv_bets.json``. Until kickoff the
+live board keeps overwriting the bet's closing consensus, so the last
+pre-game snapshot wins. Bets that kick off without a live-board close are
+resolved from historical odds. Those fetches are batched: one
+`get_historical_odds` call per sport and cluster of kickoff times, never one
+call per bet.
+
+CLV is ``price * closing_consensus - 1``: the expected return of the bet
+priced against the fair closing line.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    from .devig import devig_columns
+    from .snapshots import ColumnarOdds
+except ImportError:
+    from devig import devig_columns
+    from snapshots import ColumnarOdds
+
+# Board snapshots taken this close to kickoff count as the closing line.
+CLOSE_WINDOW = 30 * 60
+# Kickoffs within this span share one historical snapshot per sport.
+BATCH_WINDOW = 15 * 60
+# Failed historical batches are retried after this long.
+RETRY_AFTER = 10 * 60
+# Markets the historical odds endpoint serves for a whole sport in one call.
+TRACKED_MARKETS = ("h2h", "spreads", "totals")
+
+HistoricalFetch = Callable[[str, str, str, str], Sequence[dict]]
+
+
+def parse_time(value) -> Optional[float]:
+    """ISO 8601 (``...Z``) or unix timestamp -> unix seconds; None if unparseable."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except Exception:
+        return None
+
+
+def format_time(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _clv_file_path(custom_path: Optional[str] = None) -> str:
+    if custom_path:
+        return custom_path
+    base = os.path.join(os.getcwd(), 'data')
+    try:
+        os.makedirs(base, exist_ok=True)
+    except Exception:
+        pass
+    return os.path.join(base, 'clv_bets.json')
+
+
+def bet_key(event_id, market, outcome, point, book) -> str:
+    point_text = "" if point is None else f"{float(point):g}"
+    return f"{event_id}|{market}|{outcome}|{point_text}|{book}"
+
+
+class TrackedBet:
+    """One recommended wager with its bet-time and closing prices."""
+
+    __slots__ = (
+        "sport", "event_id", "event", "market", "outcome", "point", "book", "commence_time",
+        "price", "consensus", "stake", "placed_at",
+        "closing_consensus", "closing_price", "closed_at", "close_source",
+    )
+
+    FIELDS = __slots__
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name))
+
+    @property
+    def key(self) -> str:
+        return bet_key(self.event_id, self.market, self.outcome, self.point, self.book)
+
+    @property
+    def kickoff(self) -> Optional[float]:
+        return parse_time(self.commence_time)
+
+    @property
+    def clv(self) -> Optional[float]:
+        """Expected return against the fair closing line (None until closed)."""
+        if self.closing_consensus is None or not self.price:
+            return None
+        return float(self.price) * float(self.closing_consensus) - 1.0
+
+    @property
+    def consensus_move(self) -> Optional[float]:
+        """Change in the outcome's consensus probability from bet time to close."""
+        if self.closing_consensus is None or self.consensus is None:
+            return None
+        return float(self.closing_consensus) - float(self.consensus)
+
+    def is_final(self, now: float) -> bool:
+        """Closed and kicked off: the closing values will not change anymore."""
+        kickoff = self.kickoff
+        return self.closing_consensus is not None and kickoff is not None and kickoff <= now
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "TrackedBet":
+        return cls(**{name: data.get(name) for name in cls.FIELDS})
+
+    @classmethod
+    def from_wager(cls, wager: Mapping, now: float) -> Optional["TrackedBet"]:
+        """Build from a board wager dict; None if it lacks the fields CLV needs."""
+        if not wager.get('event_id') or not wager.get('sport') or wager.get('odds_decimal') is None:
+            return None
+        if wager.get('market') not in TRACKED_MARKETS:
+            return None
+        point = wager.get('point')
+        return cls(
+            sport=wager.get('sport'),
+            event_id=wager.get('event_id'),
+            event=wager.get('event'),
+            market=wager.get('market'),
+            outcome=wager.get('outcome'),
+            point=float(point) if point is not None else None,
+            book=wager.get('sportsbook'),
+            commence_time=wager.get('commence_time'),
+            price=float(wager['odds_decimal']),
+            consensus=wager.get('consensus_probability'),
+            stake=wager.get('stake'),
+            placed_at=now,
+        )
+
+
+def _outcome_count(event: dict) -> int:
+    return sum(
+        len(market.get('outcomes', []) or [])
+        for bookmaker in event.get('bookmakers', []) or []
+        for market in bookmaker.get('markets', []) or []
+    )
+
+
+def _implied(outcome: dict) -> Optional[float]:
+    try:
+        price = float(outcome.get('price'))
+    except Exception:
+        return None
+    return 1.0 / price if price > 1.0 else None
+
+
+def closing_lines(
+    events: Iterable[dict],
+    bets: Iterable[TrackedBet],
+    sportsbook_weights: Optional[Mapping[str, float]] = None,
+    books: Optional[Sequence[str]] = None,
+    fair: Optional[Sequence[float]] = None,
+) -> Dict[str, Tuple[float, Optional[float]]]:
+    """Weighted consensus and the bet book's price for each bet's outcome in `events`.
+
+    No-vig probabilities come from `fair` (one per outcome in `ColumnarOdds`
+    row order, e.g. `devig.devig_snapshot`) or, when omitted, from the
+    outcomes themselves (``devig_events``). Quotes without one fall back to
+    the implied probability, as on the board. Spread/total bets only match
+    quotes on the same point. Returns
+    ``{bet.key: (closing_consensus, closing_price)}`` for the bets found.
+    """
+    weights = sportsbook_weights or {}
+    allowed = set(books) if books is not None else None
+    wanted: Dict[str, List[TrackedBet]] = {}
+    for bet in bets:
+        wanted.setdefault(bet.event_id, []).append(bet)
+    out: Dict[str, Tuple[float, Optional[float]]] = {}
+    event_row = 0
+    for event in events:
+        start = event_row
+        event_row += _outcome_count(event)
+        event_bets = wanted.get(event.get('id'))
+        if not event_bets:
+            continue
+        for bet in event_bets:
+            total = 0.0
+            weight_sum = 0.0
+            closing_price = None
+            row = start
+            for bookmaker in event.get('bookmakers', []) or []:
+                book = bookmaker.get('key')
+                for market in bookmaker.get('markets', []) or []:
+                    outcomes = market.get('outcomes', []) or []
+                    if market.get('key') != bet.market:
+                        row += len(outcomes)
+                        continue
+                    for outcome in outcomes:
+                        row += 1
+                        if outcome.get('name') != bet.outcome:
+                            continue
+                        point = outcome.get('point')
+                        if bet.point is not None and (point is None or float(point) != bet.point):
+                            continue
+                        if book == bet.book:
+                            closing_price = outcome.get('price')
+                        if allowed is not None and book not in allowed:
+                            continue
+                        if fair is not None:
+                            prob = float(fair[row - 1])
+                            prob = prob if prob > 0 else _implied(outcome)
+                        else:
+                            prob = outcome.get('no_vig_probability')
+                            if prob is None:
+                                prob = outcome.get('implied_probability')
+                        if prob is None:
+                            continue
+                        w = float(weights.get(book, 1.0))
+                        total += w * float(prob)
+                        weight_sum += w
+            if weight_sum > 0:
+                out[bet.key] = (total / weight_sum, float(closing_price) if closing_price is not None else None)
+    return out
+
+
+class CLVTracker:
+    """Persisted wager log with batched closing-line resolution.
+
+    Thread-safe: `resolve` may run on a worker (its fetches happen outside
+    the lock) while the board records wagers and takes closes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        close_window: float = CLOSE_WINDOW,
+        batch_window: float = BATCH_WINDOW,
+        retry_after: float = RETRY_AFTER,
+    ):
+        self.path = _clv_file_path(path)
+        self.close_window = close_window
+        self.batch_window = batch_window
+        self.retry_after = retry_after
+        self.bets: Dict[str, TrackedBet] = {}
+        self._attempts: Dict[Tuple[str, float], float] = {}
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self) -> None:
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    for data in json.load(f) or []:
+                        bet = TrackedBet.from_dict(data)
+                        self.bets[bet.key] = bet
+        except Exception as e:
+            print(f"Error loading CLV bets: {e}")
+
+    def save(self) -> bool:
+        try:
+            with self._lock:
+                rows = [bet.to_dict() for bet in self.bets.values()]
+                with open(self.path, 'w') as f:
+                    json.dump(rows, f, indent=2)
+            return True
+        except Exception as e:
+            print(f"Error saving CLV bets: {e}")
+            return False
+
+    def record(self, wagers: Iterable[Mapping], now: Optional[float] = None) -> int:
+        """Track new wagers; a bet already tracked keeps its original bet-time price."""
+        now = time.time() if now is None else now
+        added = 0
+        with self._lock:
+            for wager in wagers:
+                bet = TrackedBet.from_wager(wager, now)
+                if bet is None or bet.key in self.bets:
+                    continue
+                kickoff = bet.kickoff
+                if kickoff is not None and kickoff <= now:
+                    continue
+                self.bets[bet.key] = bet
+                added += 1
+            if added:
+                self.save()
+        return added
+
+    def close_from_board(
+        self,
+        events: Sequence[dict],
+        now: Optional[float] = None,
+        sportsbook_weights: Optional[Mapping[str, float]] = None,
+        books: Optional[Sequence[str]] = None,
+        fair: Optional[Sequence[float]] = None,
+    ) -> int:
+        """Take closing lines from a processed live board for bets about to start.
+
+        `fair` is the board's no-vig probabilities (see `closing_lines`).
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            pending = [
+                bet for bet in self.bets.values()
+                if bet.kickoff is not None and now < bet.kickoff <= now + self.close_window
+            ]
+            if not pending:
+                return 0
+            return self._apply(closing_lines(events, pending, sportsbook_weights, books, fair), now, "board")
+
+    def due_batches(self, now: Optional[float] = None) -> List[Tuple[str, float, List[TrackedBet]]]:
+        """Kicked-off bets without a close, as ``(sport, snapshot_ts, bets)`` batches.
+
+        Kickoffs of one sport are clustered within `batch_window`; each
+        cluster closes at its earliest kickoff, so one snapshot covers it.
+        """
+        now = time.time() if now is None else now
+        by_sport: Dict[str, List[TrackedBet]] = {}
+        with self._lock:
+            for bet in self.bets.values():
+                kickoff = bet.kickoff
+                if bet.close_source is None and kickoff is not None and kickoff <= now:
+                    by_sport.setdefault(bet.sport, []).append(bet)
+        batches = []
+        for sport, bets in by_sport.items():
+            bets.sort(key=lambda b: b.kickoff)
+            start = None
+            cluster: List[TrackedBet] = []
+            for bet in bets:
+                if start is not None and bet.kickoff - start > self.batch_window:
+                    batches.append((sport, start, cluster))
+                    start, cluster = None, []
+                if start is None:
+                    start = bet.kickoff
+                cluster.append(bet)
+            if cluster:
+                batches.append((sport, start, cluster))
+        return batches
+
+    def resolve(
+        self,
+        fetch: HistoricalFetch,
+        now: Optional[float] = None,
+        sportsbook_weights: Optional[Mapping[str, float]] = None,
+        books: Optional[Sequence[str]] = None,
+    ) -> int:
+        """Resolve kicked-off bets from historical snapshots; returns the API calls made.
+
+        `fetch(sport, date, markets, event_ids)` returns the events of one
+        historical odds snapshot (decimal prices). A failed batch is retried
+        after `retry_after` seconds; bets the snapshot does not quote are
+        marked ``close_source="missing"`` and never fetched again.
+        """
+        now = time.time() if now is None else now
+        calls = 0
+        for sport, snapshot_ts, bets in self.due_batches(now):
+            attempt_key = (sport, snapshot_ts)
+            with self._lock:
+                last = self._attempts.get(attempt_key)
+                if last is not None and now - last < self.retry_after:
+                    continue
+                self._attempts[attempt_key] = now
+            markets = ','.join(sorted({bet.market for bet in bets}))
+            event_ids = ','.join(sorted({bet.event_id for bet in bets}))
+            calls += 1
+            try:
+                events = list(fetch(sport, format_time(snapshot_ts), markets, event_ids) or [])
+                fair = devig_columns(ColumnarOdds(events))
+            except Exception as e:
+                print(f"Error fetching closing odds for {sport}: {e}")
+                continue
+            closes = closing_lines(events, bets, sportsbook_weights, books, fair)
+            with self._lock:
+                for bet in bets:
+                    # not quoted at close (e.g. the line moved off the bet's point)
+                    if bet.key not in closes:
+                        bet.closed_at = snapshot_ts
+                        bet.close_source = "missing"
+                self._apply(closes, snapshot_ts, "historical")
+        return calls
+
+    def _apply(self, closes: Mapping[str, Tuple[float, Optional[float]]], ts: float, source: str) -> int:
+        if not closes:
+            return 0
+        with self._lock:
+            changed = False
+            for key, (consensus, price) in closes.items():
+                bet = self.bets[key]
+                if (bet.closing_consensus, bet.closing_price, bet.close_source) != (consensus, price, source):
+                    changed = True
+                bet.closing_consensus = consensus
+                bet.closing_price = price
+                bet.closed_at = ts
+                bet.close_source = source
+            if changed:
+                self.save()
+        return len(closes)
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Aggregate CLV over final bets: mean, stake-weighted mean and beat-the-close rate."""
+        now = time.time() if now is None else now
+        with self._lock:
+            final = [bet for bet in self.bets.values() if bet.is_final(now)]
+        clvs = [bet.clv for bet in final]
+        stakes = [float(bet.stake or 0) for bet in final]
+        stake_total = sum(stakes)
+        return {
+            "tracked": len(self.bets),
+            "closed": len(final),
+            "mean_clv": sum(clvs) / len(clvs) if clvs else 0.0,
+            "stake_weighted_clv": sum(c * s for c, s in zip(clvs, stakes)) / stake_total if stake_total > 0 else 0.0,
+            "beat_close_rate": sum(1 for c in clvs if c > 0) / len(clvs) if clvs else 0.0,
+        }
@@ -16,6 +16,52 @@ THEODDSAPI_KEY_TEST = os.getenv('THEODDSAPI_KEY_TEST')
 THEODDSAPI_KEY_PROD = os.getenv('THEODDSAPI_KEY_PROD')
 
 ODDS_FORMAT = 'american'
+# Prices are always requested in decimal and stored canonically; the display
+# format (ODDS_FORMAT / user pref) is applied at render time only.
+API_ODDS_FORMAT = 'decimal'
+
+# Odds payload caches (seconds / megabytes). Entries older than the TTL are
+# refetched; entries inside the stale window are only served when the API
+# rate-limits us. All odds caches share one memory cap.
+ODDS_CACHE_TTL = 12
+ODDS_CACHE_STALE_TTL = 300
+ODDS_CACHE_MAX_MB = 256
+
+# No-vig method: 'multiplicative', 'additive', 'power' or 'shin'. Per-market
+# overrides are keyed by market key, e.g. {'outrights': 'power'}.
+DEVIG_METHOD = 'multiplicative'
+DEVIG_MARKET_METHODS = {}
+
+# Kelly sizing: fractional multiplier (0.5 = half Kelly), cap per bet and cap
+# on the combined fraction staked at one book (None = uncapped). The book cap
+# may also be a {book_key: fraction} mapping.
+KELLY_MULTIPLIER = 1.0
+KELLY_MAX_BET_FRACTION = None
+KELLY_MAX_BOOK_FRACTION = None
+
+# Background +EV sweep: seconds between sweeps of every selected sport and
+# market, how many opportunities the panel keeps and concurrent fetches.
+SWEEP_INTERVAL = 60
+SWEEP_TOP_K = 50
+SWEEP_MAX_WORKERS = 4
+
+# Analytics Monte Carlo: accumulate simulated P/L in float32 (half the memory
+# of float64; ample precision for dollar amounts).
+MONTE_CARLO_FLOAT32 = False
+
+# Analytics Monte Carlo: processes for large runs (0 = one per CPU core).
+# Trials are sharded with fixed-size seeded streams, so results for a given
+# seed do not depend on this.
+MONTE_CARLO_WORKERS = 0
+
+# Analytics bankroll paths: default number of sequential slates, and the share
+# of the starting bankroll below which a path counts as ruined.
+PATH_SLATES = 100
+PATH_RUIN_FRACTION = 0.1
+
+# Analytics window: wait this long after the last filter change before
+# re-running the simulation (restarted on every slider tick).
+ANALYTICS_DEBOUNCE_MS = 150
 
 PALETTES = {
     'dark': {
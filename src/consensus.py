@@ -0,0 +1,475 @@
+"""Board-wide consensus / edge engine.
+
+`compute_board` turns a processed odds snapshot into dense matrices indexed
+by board row (one row per (event, outcome), in render order): the outcome
+each display book quotes, its probability, the weighted consensus, each
+account's edge, the best account, its Kelly fraction and the event hold.
+Quotes are looked up in the snapshot's `ColumnarOdds` with sorted group and
+name keys; only spread/total line picks go through `match_outcome`.
+
+It is pure Python/NumPy (no Qt), so the table layer only reads results and
+the engine can be benchmarked on its own (see benchmarks/bench_consensus.py).
+
+`consensus_points` is the batched form of `utils.compute_consensus_point`:
+the mode line and favorite of every event in one grouped count over the
+columnar snapshot. `with_consensus_points` puts a board on those lines
+without touching the shared payload.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .devig import MarketHolds
+    from .kelly import kelly_fractions
+    from .ladders import ladder_for, normalize_name
+    from .snapshots import ColumnarOdds
+except ImportError:
+    from devig import MarketHolds
+    from kelly import kelly_fractions
+    from ladders import ladder_for, normalize_name
+    from snapshots import ColumnarOdds
+
+LINE_MARKETS = ('spreads', 'totals')
+
+
+def outcome_names_for(event: dict, market_key: str) -> List[str]:
+    """Outcome rows the board shows for `event`, in order."""
+    if market_key == 'spreads':
+        return [event.get('home_team'), event.get('away_team')]
+    try:
+        first_market = event['bookmakers'][0]['markets'][0]
+    except (KeyError, IndexError, TypeError):
+        return []
+    return [o['name'] for o in first_market.get('outcomes', [])]
+
+
+def match_outcome(
+    event: dict,
+    market: Optional[dict],
+    outcome_name: Optional[str],
+    market_key: str,
+    point_fallback: bool = False,
+) -> Optional[dict]:
+    """The board's outcome matching rules for one market.
+
+    Spreads/totals with a consensus point pick the outcome on that line;
+    otherwise match the name exactly, then (spreads) by team substring, then
+    (spreads, `point_fallback`) the first outcome carrying a point.
+    """
+    if not market:
+        return None
+    consensus_point = event.get('_consensus_point') if market_key in LINE_MARKETS else None
+    if market_key in LINE_MARKETS and consensus_point is not None:
+        try:
+            cp = float(consensus_point)
+        except Exception:
+            return None
+        return ladder_for(market).select(outcome_name, market_key, cp, event.get('_consensus_favorite'))
+
+    outcomes = market.get('outcomes', [])
+    outcome = next((o for o in outcomes if o.get('name') == outcome_name), None)
+    if outcome is None and market_key == 'spreads' and outcome_name:
+        outcome = next((o for o in outcomes if outcome_name in (o.get('name') or '')), None)
+    if outcome is None and market_key == 'spreads' and point_fallback:
+        outcome = next((o for o in outcomes if 'point' in o and o.get('point') is not None), None)
+    return outcome
+
+
+def event_hold(event: dict, market_key: str) -> float:
+    """Average hold (overround, floored at 0) across the books quoting `market_key`."""
+    hold_values = []
+    for bookmaker in event.get('bookmakers', []):
+        market = next((m for m in bookmaker.get('markets', []) if m.get('key') == market_key), None)
+        if not market:
+            continue
+        total_prob = sum(
+            o['implied_probability']
+            for o in market.get('outcomes', [])
+            if o.get('implied_probability') is not None
+        )
+        hold_values.append(max(total_prob - 1, 0))
+    return sum(hold_values) / len(hold_values) if hold_values else np.nan
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return np.nan
+
+
+class BoardMatrices:
+    """Dense results for one board; row `r` is (events[row_event[r]], outcome_names[r]).
+
+    Shapes: `probability` rows x books, `user_probability` / `user_price` /
+    `edge` rows x accounts, everything else per row. Missing values are NaN;
+    `best_account` is -1 when no account qualifies.
+    """
+
+    __slots__ = (
+        "market_key",
+        "books",
+        "accounts",
+        "events",
+        "event_offsets",
+        "row_event",
+        "outcome_names",
+        "cells",
+        "probability",
+        "weights",
+        "consensus",
+        "user_outcomes",
+        "user_probability",
+        "user_price",
+        "edge",
+        "best_account",
+        "best_edge",
+        "best_price",
+        "best_user_probability",
+        "kelly",
+        "hold",
+    )
+
+    def __len__(self) -> int:
+        return int(self.row_event.size)
+
+    def rows_for(self, event_index: int) -> range:
+        return range(int(self.event_offsets[event_index]), int(self.event_offsets[event_index + 1]))
+
+    def best_account_key(self, row: int) -> Optional[str]:
+        idx = int(self.best_account[row])
+        return self.accounts[idx] if idx >= 0 else None
+
+
+def _quote_rows(
+    columns: ColumnarOdds,
+    market_id: int,
+    row_event: np.ndarray,
+    row_name: np.ndarray,
+    book_ids: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Group and exact-name quote of every (board row, book) cell.
+
+    Returns `(groups, rows)`, both board rows x books: the (event, book,
+    market) group index and the columnar row quoting the outcome by name,
+    -1 where missing. The first group / outcome wins, as in the API order.
+    """
+    shape = (row_event.size, book_ids.size)
+    groups = np.full(shape, -1, dtype=np.int64)
+    rows = np.full(shape, -1, dtype=np.int64)
+    quoted_groups = np.nonzero(columns.group_market == market_id)[0]
+    if market_id < 0 or not quoted_groups.size or not row_event.size or not book_ids.size:
+        return groups, rows
+
+    n_book_keys = len(columns.book_keys)
+    group_keys = columns.group_event[quoted_groups].astype(np.int64) * n_book_keys + columns.group_book[quoted_groups]
+    group_keys, first = np.unique(group_keys, return_index=True)
+    present = book_ids >= 0
+    wanted = row_event[:, None] * n_book_keys + np.where(present, book_ids, 0)[None, :]
+    pos = np.minimum(np.searchsorted(group_keys, wanted), group_keys.size - 1)
+    hit = present[None, :] & (group_keys[pos] == wanted)
+    groups[hit] = quoted_groups[first][pos[hit]]
+
+    n_names = max(len(columns.names), 1)
+    market_rows = np.nonzero(columns.market == market_id)[0]
+    name_keys = columns.group[market_rows].astype(np.int64) * n_names + columns.name[market_rows]
+    name_keys, first = np.unique(name_keys, return_index=True)
+    wanted = groups * n_names + row_name[:, None]
+    pos = np.minimum(np.searchsorted(name_keys, wanted), name_keys.size - 1)
+    hit = (groups >= 0) & (row_name >= 0)[:, None] & (name_keys[pos] == wanted)
+    rows[hit] = market_rows[first][pos[hit]]
+    return groups, rows
+
+
+def _annotated_fair(outcomes: Sequence[dict]) -> np.ndarray:
+    """No-vig probabilities already written on the outcomes (NaN when absent)."""
+    return np.array([_float(o.get('no_vig_probability')) for o in outcomes], dtype=np.float64)
+
+
+def compute_board(
+    events: Sequence[dict],
+    market_key: str,
+    books: Sequence[str],
+    accounts: Sequence[str],
+    sportsbook_weights: Optional[Mapping[str, float]] = None,
+    fallback_implied: bool = True,
+    kelly_multiplier: float = 1.0,
+    kelly_max_fraction: Optional[float] = None,
+    kelly_book_cap: Any = None,
+    event_holds: Optional[np.ndarray] = None,
+    columns: Optional[ColumnarOdds] = None,
+    fair: Optional[np.ndarray] = None,
+) -> BoardMatrices:
+    """Compute consensus, edges, best account, Kelly and hold for every row.
+
+    Args:
+        events: Processed events.
+        market_key: Market shown on the board.
+        books: Display sportsbooks (consensus sources, in column order).
+        accounts: The user's accounts, in preference order (ties keep the first).
+        sportsbook_weights: Consensus weight per book (default 1.0).
+        fallback_implied: Use the implied probability when a quote has no
+            no-vig probability.
+        event_holds: Precomputed mean hold per event (see
+            `devig.MarketHolds.event_hold`); summed from the columns if omitted.
+        columns: The snapshot's `ColumnarOdds` (built here if omitted).
+        fair: No-vig probability per columnar row (`devig.devig_columns`);
+            read from the outcomes' ``no_vig_probability`` if omitted.
+    """
+    weights_map = sportsbook_weights or {}
+    books = list(books)
+    accounts = list(accounts)
+    n_accounts = len(accounts)
+
+    if columns is None or columns.n_events != len(events):
+        columns = ColumnarOdds(events)
+    outcomes = columns.outcomes
+    if fair is None or len(fair) != len(columns):
+        fair = _annotated_fair(outcomes)
+
+    name_index = {name: i for i, name in enumerate(columns.names)}
+    row_event: List[int] = []
+    row_name: List[int] = []
+    outcome_names: List[Any] = []
+    event_offsets = [0]
+    for ev_idx, event in enumerate(events):
+        for name in outcome_names_for(event, market_key):
+            row_event.append(ev_idx)
+            # columns store a missing name as '': leave those rows to match_outcome
+            row_name.append(name_index.get(name, -1) if name else -1)
+            outcome_names.append(name)
+        event_offsets.append(len(row_event))
+    row_event_arr = np.asarray(row_event, dtype=np.int64)
+    row_name_arr = np.asarray(row_name, dtype=np.int64)
+    n_rows = len(row_event)
+
+    market_id = columns.market_id(market_key)
+    book_groups, book_rows = _quote_rows(
+        columns, market_id, row_event_arr, row_name_arr,
+        np.array([columns.book_id(b) for b in books], dtype=np.int64),
+    )
+    account_groups, account_rows = _quote_rows(
+        columns, market_id, row_event_arr, row_name_arr,
+        np.array([columns.book_id(a) for a in accounts], dtype=np.int64),
+    )
+
+    # spread/total picks on the consensus line, spread name/point fallbacks
+    # and unnamed rows go through the per-cell rules
+    on_line = np.array(
+        [market_key in LINE_MARKETS and e.get('_consensus_point') is not None for e in events] or [False],
+        dtype=bool,
+    )[row_event_arr][:, None]
+    unmatched = ((row_name_arr < 0) | (market_key == 'spreads'))[:, None]
+    for groups, rows, point_fallback in ((book_groups, book_rows, True), (account_groups, account_rows, False)):
+        pending = (groups >= 0) & (on_line | ((rows < 0) & unmatched))
+        for r, c in zip(*np.nonzero(pending)):
+            g = int(groups[r, c])
+            outcome = match_outcome(events[row_event[r]], columns.markets[g], outcome_names[r], market_key, point_fallback)
+            rows[r, c] = -1
+            if outcome is not None:
+                for i in range(int(columns.group_offsets[g]), int(columns.group_offsets[g + 1])):
+                    if outcomes[i] is outcome:
+                        rows[r, c] = i
+                        break
+
+    # index -1 (no quote) reads the trailing None / NaN
+    outcome_col = np.empty(len(outcomes) + 1, dtype=object)
+    outcome_col[:-1] = outcomes
+    cells = outcome_col[book_rows].tolist()
+    user_outcomes = outcome_col[account_rows].tolist()
+    fair_col = np.append(np.asarray(fair, dtype=np.float64), np.nan)
+    prob_col = np.append(columns.prob, np.nan)
+    price_col = np.append(columns.price, np.nan)
+    probability = fair_col[book_rows]
+    probability = np.where(probability > 0, probability, np.nan)
+    if fallback_implied:
+        probability = np.where(np.isnan(probability), prob_col[book_rows], probability)
+    user_probability = prob_col[account_rows]
+    user_price = price_col[account_rows]
+
+    if event_holds is None or len(event_holds) != len(events):
+        event_holds = MarketHolds(columns, fair).event_hold(market_key)
+    hold = np.where(np.diff(event_offsets) > 0, event_holds, np.nan) if len(events) else np.empty(0)
+
+    weights = np.array([float(weights_map.get(b, 1.0)) for b in books], dtype=np.float64)
+    quoted = ~np.isnan(probability)
+    weight_sum = (quoted * weights).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        consensus = np.where(
+            quoted.any(axis=1) & (weight_sum > 0),
+            np.where(quoted, probability, 0.0) @ weights / weight_sum,
+            np.nan,
+        )
+
+    has_consensus = ~np.isnan(consensus)
+    valid = (
+        ~np.isnan(user_probability)
+        & (user_price > 1)
+        & ((consensus > 0) & (consensus < 1))[:, None]
+    )
+    edge = np.where(valid, consensus[:, None] - user_probability, np.nan)
+    masked = np.where(valid, edge, -np.inf)
+    if n_accounts:
+        best = np.argmax(masked, axis=1)
+        any_valid = valid.any(axis=1)
+    else:
+        best = np.zeros(n_rows, dtype=np.int64)
+        any_valid = np.zeros(n_rows, dtype=bool)
+    best_account = np.where(any_valid, best, -1)
+    rows = np.arange(n_rows)
+    pick = np.maximum(best_account, 0)
+    best_edge = np.where(any_valid, masked[rows, pick] if n_accounts else 0.0, np.where(has_consensus, -np.inf, 0.0))
+    best_price = np.where(any_valid, user_price[rows, pick] if n_accounts else np.nan, np.nan)
+    best_user_probability = np.where(any_valid, user_probability[rows, pick] if n_accounts else np.nan, np.nan)
+
+    kelly = np.zeros(n_rows)
+    if any_valid.any():
+        chosen = np.nonzero(any_valid)[0]
+        kelly[chosen] = np.nan_to_num(kelly_fractions(
+            consensus[chosen],
+            best_price[chosen],
+            multiplier=kelly_multiplier,
+            max_fraction=kelly_max_fraction,
+            books=[accounts[i] for i in best_account[chosen]],
+            book_cap=kelly_book_cap,
+        ))
+
+    board = BoardMatrices()
+    board.market_key = market_key
+    board.books = books
+    board.accounts = accounts
+    board.events = events
+    board.event_offsets = np.asarray(event_offsets, dtype=np.int64)
+    board.row_event = row_event_arr
+    board.outcome_names = outcome_names
+    board.cells = cells
+    board.probability = probability
+    board.weights = weights
+    board.consensus = consensus
+    board.user_outcomes = user_outcomes
+    board.user_probability = user_probability
+    board.user_price = user_price
+    board.edge = edge
+    board.best_account = best_account
+    board.best_edge = best_edge
+    board.best_price = best_price
+    board.best_user_probability = best_user_probability
+    board.kelly = kelly
+    board.hold = hold
+    return board
+
+
+def _mode_points(event_idx: np.ndarray, values: np.ndarray, n_events: int) -> np.ndarray:
+    """Most frequent value per event (ties -> smallest); NaN where an event has none."""
+    mode = np.full(n_events, np.nan)
+    if values.size == 0:
+        return mode
+    pairs, counts = np.unique(np.stack([event_idx.astype(np.float64), values], axis=1), axis=0, return_counts=True)
+    # order by event, then count desc, then value asc; the first row per event wins
+    order = np.lexsort((pairs[:, 1], -counts, pairs[:, 0]))
+    pairs = pairs[order]
+    first = np.ones(len(pairs), dtype=bool)
+    first[1:] = pairs[1:, 0] != pairs[:-1, 0]
+    mode[pairs[first, 0].astype(np.int64)] = pairs[first, 1]
+    return mode
+
+
+def consensus_points(
+    events: Sequence[dict],
+    market_type: str = 'spreads',
+    market_key: Optional[str] = None,
+    columns: Optional[ColumnarOdds] = None,
+) -> Tuple[List[Optional[float]], List[Optional[str]]]:
+    """Consensus point and favorite for every event, matching `compute_consensus_point`.
+
+    Points are rounded to the nearest half point and the most common absolute
+    line wins (ties -> the smallest). For spreads the favorite is the team
+    named on the most negative quotes at that line (ties -> no favorite) and
+    the point is signed negative for a home favorite.
+
+    Returns parallel lists `(points, favorites)`, one entry per event.
+    """
+    n_events = len(events)
+    points: List[Optional[float]] = [None] * n_events
+    favorites: List[Optional[str]] = [None] * n_events
+    if market_type not in LINE_MARKETS or not n_events:
+        return points, favorites
+    columns = columns if columns is not None else ColumnarOdds(events)
+    market_id = columns.market_id(market_key or market_type)
+    if market_id < 0:
+        return points, favorites
+
+    rows = np.nonzero((columns.market == market_id) & ~np.isnan(columns.point))[0]
+    if market_type == 'spreads':
+        has_teams = np.array([bool(e.get('home_team')) and bool(e.get('away_team')) for e in events])
+        rows = rows[has_teams[columns.event[rows]]]
+    ev = columns.event[rows].astype(np.int64)
+    normalized = np.round(columns.point[rows] * 2) / 2.0
+    mode = _mode_points(ev, np.abs(normalized), n_events)
+
+    if market_type == 'totals':
+        for i in np.nonzero(~np.isnan(mode))[0]:
+            points[i] = float(mode[i])
+        return points, favorites
+
+    # favorite votes: negative quotes on the mode line, matched to home/away by name
+    at_mode = (np.abs(normalized) == mode[ev]) & (normalized < 0)
+    vote_rows = rows[at_mode]
+    vote_ev = ev[at_mode]
+    name_norm = [normalize_name(n) for n in columns.names]
+    team_norm = [(normalize_name(e.get('home_team')), normalize_name(e.get('away_team'))) for e in events]
+    side_cache: Dict[Tuple[int, int], int] = {}
+    sides = np.zeros(vote_rows.size, dtype=np.int64)
+    for k, (e_idx, n_idx) in enumerate(zip(vote_ev.tolist(), columns.name[vote_rows].tolist())):
+        side = side_cache.get((e_idx, n_idx))
+        if side is None:
+            home_norm, away_norm = team_norm[e_idx]
+            name = name_norm[n_idx]
+            if home_norm and (home_norm in name or name in home_norm):
+                side = 1
+            elif away_norm and (away_norm in name or name in away_norm):
+                side = -1
+            else:
+                side = 0
+            side_cache[(e_idx, n_idx)] = side
+        sides[k] = side
+    home_votes = np.bincount(vote_ev, weights=(sides == 1), minlength=n_events)
+    away_votes = np.bincount(vote_ev, weights=(sides == -1), minlength=n_events)
+
+    for i in np.nonzero(~np.isnan(mode))[0]:
+        line = float(mode[i])
+        if home_votes[i] > away_votes[i]:
+            points[i], favorites[i] = -line, events[i].get('home_team')
+        elif away_votes[i] > home_votes[i]:
+            points[i], favorites[i] = line, events[i].get('away_team')
+        else:
+            points[i] = line
+    return points, favorites
+
+
+def with_consensus_points(
+    events: Sequence[dict],
+    market_type: str,
+    columns: Optional[ColumnarOdds] = None,
+) -> List[dict]:
+    """`events` with each event that has a consensus line replaced by a copy carrying it.
+
+    The copies are shallow (bookmakers are shared) and hold `_consensus_point`
+    and, for spreads, `_consensus_favorite`. The input events are never
+    written to, so a payload shared with the odds cache stays pristine.
+    """
+    events = list(events)
+    if market_type not in LINE_MARKETS:
+        return events
+    points, favorites = consensus_points(events, market_type, columns=columns)
+    for i, (cp, fav) in enumerate(zip(points, favorites)):
+        if cp is None:
+            continue
+        event = dict(events[i])
+        event['_consensus_point'] = cp
+        if market_type == 'spreads':
+            event['_consensus_favorite'] = fav
+        events[i] = event
+    return events
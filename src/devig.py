@@ -0,0 +1,288 @@
+"""Vectorized no-vig (devig) engine over a columnar odds snapshot.
+
+Every (event, bookmaker, market) group in a `ColumnarOdds` is devigged in one
+pass: per-group sums come from `np.bincount` over the `group` column, and the
+iterative methods run one Newton solve for all groups at once. Because the
+columns are flat, a snapshot holding several sports costs the same single pass.
+
+Methods (fair probabilities sum to 1 within each group):
+
+- ``multiplicative``: p / sum(p) (proportional normalization).
+- ``additive``: p - (sum(p) - 1) / n, clipped at 0 and renormalized.
+- ``power``: p ** k with k solved so the powers sum to 1.
+- ``shin``: Shin's insider-trading model, solving for the insider share z.
+
+The same pass records overround, hold and no-vig sums per group
+(`MarketHolds`), stored on the snapshot so the board and analytics read them
+instead of re-summing prices per row.
+"""
+
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .snapshots import ColumnarOdds, OddsSnapshot
+except ImportError:
+    from snapshots import ColumnarOdds, OddsSnapshot
+
+METHODS = ("multiplicative", "additive", "power", "shin")
+DEFAULT_METHOD = "multiplicative"
+
+_NEWTON_TOL = 1e-10
+_NEWTON_MAX_ITER = 50
+
+
+def _group_sum(values: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    return np.bincount(group, weights=values, minlength=n_groups)
+
+
+def _multiplicative(prob: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    total = _group_sum(prob, group, n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return prob / total[group]
+
+
+def _additive(prob: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    valid = prob > 0
+    total = _group_sum(prob, group, n_groups)
+    count = np.bincount(group, weights=valid.astype(np.float64), minlength=n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fair = np.where(valid, prob - (total[group] - 1.0) / count[group], 0.0)
+    # longshots can go negative under a flat margin; clip and renormalize
+    return _multiplicative(np.maximum(fair, 0.0), group, n_groups)
+
+
+def _power(prob: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    """Solve sum(p ** k) = 1 per group with Newton's method on k."""
+    log_p = np.log(np.where(prob > 0, prob, 1.0))
+    k = np.ones(n_groups)
+    active = np.ones(n_groups, dtype=bool)
+    for _ in range(_NEWTON_MAX_ITER):
+        powered = np.where(prob > 0, np.exp(k[group] * log_p), 0.0)
+        f = _group_sum(powered, group, n_groups) - 1.0
+        df = _group_sum(powered * log_p, group, n_groups)
+        active &= np.abs(f) > _NEWTON_TOL
+        if not active.any():
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = np.where(active & (df != 0), f / df, 0.0)
+        k = np.maximum(k - step, 1e-6)
+    powered = np.where(prob > 0, np.exp(k[group] * log_p), 0.0)
+    return _multiplicative(powered, group, n_groups)
+
+
+def _shin_fair(q: np.ndarray, z: np.ndarray) -> np.ndarray:
+    root = np.sqrt(z * z + 4.0 * (1.0 - z) * q)
+    return (root - z) / (2.0 * (1.0 - z))
+
+
+def _shin(prob: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    """Solve Shin's z per group so the fair probabilities sum to 1."""
+    total = _group_sum(prob, group, n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        q = np.where(prob > 0, prob * prob / total[group], 0.0)
+    z = np.zeros(n_groups)
+    # no overround -> z = 0, which reduces to multiplicative below
+    active = total > 1.0
+    for _ in range(_NEWTON_MAX_ITER):
+        zg = z[group]
+        root = np.sqrt(zg * zg + 4.0 * (1.0 - zg) * q)
+        fair = (root - zg) / (2.0 * (1.0 - zg))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d_root = np.where(root > 0, (zg - 2.0 * q) / root, 0.0)
+        d_fair = ((d_root - 1.0) * 2.0 * (1.0 - zg) + 2.0 * (root - zg)) / (4.0 * (1.0 - zg) ** 2)
+        f = _group_sum(np.where(q > 0, fair, 0.0), group, n_groups) - 1.0
+        df = _group_sum(np.where(q > 0, d_fair, 0.0), group, n_groups)
+        active &= np.abs(f) > _NEWTON_TOL
+        if not active.any():
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = np.where(active & (df != 0), f / df, 0.0)
+        z = np.clip(z - step, 0.0, 0.99)
+    fair = np.where(q > 0, _shin_fair(q, z[group]), 0.0)
+    return _multiplicative(fair, group, n_groups)
+
+
+_KERNELS = {
+    "multiplicative": _multiplicative,
+    "additive": _additive,
+    "power": _power,
+    "shin": _shin,
+}
+
+
+def devig_columns(
+    columns: ColumnarOdds,
+    method: str = DEFAULT_METHOD,
+    market_methods: Optional[Mapping[str, str]] = None,
+) -> np.ndarray:
+    """Fair probability for every row of `columns` (NaN where the price is invalid).
+
+    `market_methods` overrides `method` per market key, e.g.
+    ``{"outrights": "power"}``.
+    """
+    for name in [method, *(market_methods or {}).values()]:
+        if name not in _KERNELS:
+            raise ValueError(f"Unknown devig method: {name}")
+
+    prob = np.nan_to_num(columns.prob, nan=0.0)
+    group = columns.group
+    n_groups = columns.n_groups
+    if prob.size == 0:
+        return np.empty(0)
+
+    # method code per group, then compute each method used on the whole column
+    codes = np.full(n_groups, METHODS.index(method), dtype=np.int8)
+    for market_key, name in (market_methods or {}).items():
+        market_id = columns.market_id(market_key)
+        if market_id >= 0:
+            codes[columns.group_market == market_id] = METHODS.index(name)
+    row_codes = codes[group]
+
+    fair = np.full(prob.size, np.nan)
+    for code in np.unique(codes):
+        rows = row_codes == code
+        fair[rows] = _KERNELS[METHODS[code]](prob, group, n_groups)[rows]
+    fair[~(prob > 0)] = np.nan
+    fair.flags.writeable = False
+    return fair
+
+
+def _devig_key(method: str, market_methods: Optional[Mapping[str, str]]) -> str:
+    return f"devig:{method}:{tuple(sorted((market_methods or {}).items()))}"
+
+
+def devig_snapshot(
+    snapshot: OddsSnapshot,
+    method: str = DEFAULT_METHOD,
+    market_methods: Optional[Mapping[str, str]] = None,
+) -> np.ndarray:
+    """`devig_columns` for a snapshot, computed once per method selection."""
+    overrides = dict(market_methods or {})
+    return snapshot.derived(
+        _devig_key(method, overrides),
+        lambda snap: devig_columns(snap.columns, method, overrides),
+    )
+
+
+class MarketHolds:
+    """Overround, hold and no-vig sum per (event, book, market) group.
+
+    Arrays are aligned with the groups of `columns` (see `group_event`,
+    `group_book`, `group_market`). `hold` is the overround minus 1, floored
+    at 0; `no_vig_sum` is the sum of the group's fair probabilities.
+    """
+
+    __slots__ = ("columns", "overround", "hold", "no_vig_sum", "_event_hold")
+
+    def __init__(self, columns: ColumnarOdds, fair: np.ndarray):
+        n_groups = columns.n_groups
+        self.columns = columns
+        self.overround = _group_sum(np.nan_to_num(columns.prob, nan=0.0), columns.group, n_groups)
+        self.hold = np.maximum(self.overround - 1.0, 0.0)
+        self.no_vig_sum = _group_sum(np.nan_to_num(fair, nan=0.0), columns.group, n_groups)
+        for arr in (self.overround, self.hold, self.no_vig_sum):
+            arr.flags.writeable = False
+        self._event_hold: Dict[str, np.ndarray] = {}
+
+    def group_hold(self, event_index: int, book_key: str, market_key: str) -> Optional[float]:
+        """Hold for one (event, book, market), or None when it is not quoted."""
+        cols = self.columns
+        book_id = cols.book_id(book_key)
+        market_id = cols.market_id(market_key)
+        if book_id < 0 or market_id < 0:
+            return None
+        lo, hi = np.searchsorted(cols.group_event, [event_index, event_index + 1])
+        for g in range(lo, hi):
+            if cols.group_book[g] == book_id and cols.group_market[g] == market_id:
+                return float(self.hold[g])
+        return None
+
+    def event_hold(self, market_key: str) -> np.ndarray:
+        """Mean hold per event across the books quoting `market_key` (NaN if none)."""
+        cached = self._event_hold.get(market_key)
+        if cached is not None:
+            return cached
+        cols = self.columns
+        n_events = cols.n_events
+        market_id = cols.market_id(market_key)
+        if market_id < 0:
+            out = np.full(n_events, np.nan)
+        else:
+            quoted = cols.group_market == market_id
+            events = cols.group_event[quoted]
+            total = np.bincount(events, weights=self.hold[quoted], minlength=n_events)
+            count = np.bincount(events, minlength=n_events)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out = np.where(count > 0, total / count, np.nan)
+        out.flags.writeable = False
+        self._event_hold[market_key] = out
+        return out
+
+
+HOLD_KEY = "hold"
+
+
+def market_holds(snapshot: OddsSnapshot) -> MarketHolds:
+    """Holds for a snapshot (precomputed by `devig_stage`, else built once)."""
+    return snapshot.derived(HOLD_KEY, lambda snap: MarketHolds(snap.columns, devig_snapshot(snap)))
+
+
+def iter_outcomes(events: Sequence[dict]) -> Iterator[dict]:
+    """Outcome dicts in `ColumnarOdds` row order."""
+    for event in events:
+        for bookmaker in event.get('bookmakers', []) or []:
+            for market in bookmaker.get('markets', []) or []:
+                for outcome in market.get('outcomes', []) or []:
+                    yield outcome
+
+
+def annotate_outcomes(events: Sequence[dict], columns: ColumnarOdds, fair: np.ndarray) -> None:
+    """Write implied / no-vig probability and no-vig decimal price onto each outcome."""
+    implied = columns.prob.tolist()
+    fair_list = fair.tolist()
+    for outcome, prob, no_vig in zip(iter_outcomes(events), implied, fair_list):
+        outcome["implied_probability"] = None if prob != prob else prob
+        if no_vig != no_vig or no_vig <= 0:
+            outcome["no_vig_probability"] = None
+            outcome["no_vig_price"] = None
+        else:
+            outcome["no_vig_probability"] = no_vig
+            outcome["no_vig_price"] = 1.0 / no_vig
+
+
+def devig_stage(
+    events: Sequence[dict],
+    method: str = DEFAULT_METHOD,
+    market_methods: Optional[Mapping[str, str]] = None,
+    columns: Optional[ColumnarOdds] = None,
+) -> Tuple[ColumnarOdds, Dict[str, Any]]:
+    """Devig `events` and precompute per-market holds, leaving the dicts untouched.
+
+    Returns the columns plus the derived values to seed the published
+    snapshot with (`SnapshotStore.publish(..., derived=...)`), so neither the
+    fair probabilities nor the holds are recomputed downstream. The payload
+    may be shared with the odds cache, so nothing is written onto it; read
+    fair probabilities with `devig_snapshot`.
+    """
+    columns = columns if columns is not None else ColumnarOdds(events)
+    fair = devig_columns(columns, method, market_methods)
+    derived = {
+        _devig_key(method, market_methods): fair,
+        HOLD_KEY: MarketHolds(columns, fair),
+    }
+    return columns, derived
+
+
+def devig_events(
+    events: Sequence[dict],
+    method: str = DEFAULT_METHOD,
+    market_methods: Optional[Mapping[str, str]] = None,
+    columns: Optional[ColumnarOdds] = None,
+) -> ColumnarOdds:
+    """Devig a private payload in place (see `annotate_outcomes`) and return its columns."""
+    columns = columns if columns is not None else ColumnarOdds(events)
+    annotate_outcomes(events, columns, devig_columns(columns, method, market_methods))
+    return columns
+
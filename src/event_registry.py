@@ -0,0 +1,188 @@
+"""Event-id registry shared by the odds board views.
+
+A single place that resolves an event id to where it lives: its index in the
+current odds snapshot, the table rows it occupies, and when its prices last
+changed. Every lookup (including the reverse row -> event lookup) is a dict
+access, so detail views, targeted refreshes and watchlists never scan the board.
+
+Per-event odds payloads are not kept here: `cached_odds` reads through the
+shared event-odds TTL cache, so they stay under its byte budget. Entries that
+are neither in the latest snapshot nor in the events-endpoint id lists are
+pruned on every `index_snapshot`.
+"""
+
+import time
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+class EventEntry:
+    """Everything the registry knows about one event id."""
+
+    __slots__ = (
+        "event_id",
+        "sport",
+        "snapshot_index",
+        "header_row",
+        "rows",
+        "label",
+        "fingerprint",
+        "last_change",
+    )
+
+    def __init__(self, event_id: str, sport: Optional[str] = None):
+        self.event_id = event_id
+        self.sport = sport
+        self.snapshot_index: Optional[int] = None
+        self.header_row: Optional[int] = None
+        self.rows: Tuple[int, ...] = ()
+        self.label = ""
+        self.fingerprint: Optional[tuple] = None
+        self.last_change: Optional[float] = None
+
+
+def _event_fingerprint(event: dict) -> tuple:
+    """Cheap signature of an event's prices used to detect line movement."""
+    parts = []
+    for bookmaker in event.get('bookmakers', []) or []:
+        for market in bookmaker.get('markets', []) or []:
+            for outcome in market.get('outcomes', []) or []:
+                parts.append((
+                    bookmaker.get('key'),
+                    market.get('key'),
+                    outcome.get('name'),
+                    outcome.get('point'),
+                    outcome.get('price'),
+                ))
+    return tuple(parts)
+
+
+class EventRegistry:
+    """Map event ids to snapshot positions and table rows.
+
+    `odds_cache` is the TTL cache the per-event odds are stored in (keyed
+    ``(event_id, market_key, bookmakers)``); `cached_odds` reads from it.
+    """
+
+    def __init__(self, odds_cache: Any = None):
+        self._odds_cache = odds_cache
+        self._entries: Dict[str, EventEntry] = {}
+        self._row_to_event: Dict[int, str] = {}
+        self._ordered_ids: List[str] = []
+        self._sport_ids: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, event_id: object) -> bool:
+        return event_id in self._entries
+
+    def _ensure(self, event_id: str, sport: Optional[str] = None) -> EventEntry:
+        entry = self._entries.get(event_id)
+        if entry is None:
+            entry = EventEntry(event_id, sport)
+            self._entries[event_id] = entry
+        elif sport and not entry.sport:
+            entry.sport = sport
+        return entry
+
+    @staticmethod
+    def event_key(event: dict, index: int) -> str:
+        """Return the registry key for the event at `index` of the snapshot (its id, else ``#index``)."""
+        return str(event.get('id') or f"#{index}")
+
+    def _prune(self, keep: Set[str]) -> None:
+        for event_id in [k for k in self._entries if k not in keep]:
+            del self._entries[event_id]
+
+    def set_sport_ids(self, mapping: Dict[str, List[str]]) -> int:
+        """Register the `{sport_key: [event_ids]}` mapping from the events endpoint.
+
+        Returns the number of known event ids.
+        """
+        self._sport_ids = {k: list(v or []) for k, v in (mapping or {}).items()}
+        for sport, ids in self._sport_ids.items():
+            for event_id in ids:
+                self._ensure(event_id, sport)
+        self._prune(self._live_ids())
+        return sum(len(v) for v in self._sport_ids.values())
+
+    def known_id_count(self) -> int:
+        return sum(len(v) for v in self._sport_ids.values())
+
+    def index_snapshot(self, events: Optional[Sequence[dict]], sport: Optional[str] = None, now: Optional[float] = None) -> None:
+        """Record each event's position in `events` and stamp price changes."""
+        now = time.time() if now is None else now
+        for entry in self._entries.values():
+            entry.snapshot_index = None
+        for idx, event in enumerate(events or []):
+            if not isinstance(event, dict):
+                continue
+            entry = self._ensure(self.event_key(event, idx), sport)
+            entry.snapshot_index = idx
+            fingerprint = _event_fingerprint(event)
+            if fingerprint != entry.fingerprint:
+                entry.fingerprint = fingerprint
+                entry.last_change = now
+        self._prune(self._live_ids())
+
+    def _live_ids(self) -> Set[str]:
+        """Ids still worth keeping: in the snapshot, on the table, or listed by the events endpoint."""
+        keep = {k for k, entry in self._entries.items() if entry.snapshot_index is not None}
+        keep.update(self._ordered_ids)
+        for ids in self._sport_ids.values():
+            keep.update(ids)
+        return keep
+
+    def clear_rows(self) -> None:
+        """Forget table row assignments ahead of a redraw."""
+        for event_id in self._ordered_ids:
+            entry = self._entries.get(event_id)
+            if entry is not None:
+                entry.header_row = None
+                entry.rows = ()
+        self._row_to_event = {}
+        self._ordered_ids = []
+
+    def assign_rows(self, event_id: str, header_row: int, rows: Sequence[int], label: str = "") -> None:
+        """Attach the table rows rendered for `event_id`."""
+        entry = self._ensure(event_id)
+        entry.header_row = header_row
+        entry.rows = tuple(rows)
+        entry.label = label
+        for row in entry.rows:
+            self._row_to_event[row] = event_id
+        self._ordered_ids.append(event_id)
+
+    def entry(self, event_id: str) -> Optional[EventEntry]:
+        return self._entries.get(event_id)
+
+    def event_for_row(self, row: int) -> Optional[str]:
+        return self._row_to_event.get(row)
+
+    def snapshot_index(self, event_id: str) -> Optional[int]:
+        entry = self._entries.get(event_id)
+        return entry.snapshot_index if entry else None
+
+    def rows_for(self, event_id: str) -> Tuple[int, ...]:
+        entry = self._entries.get(event_id)
+        return entry.rows if entry else ()
+
+    def sport_for(self, event_id: str) -> Optional[str]:
+        entry = self._entries.get(event_id)
+        return entry.sport if entry else None
+
+    def cached_odds(self, event_id: str, market_key: str, bookmakers: Hashable) -> Any:
+        """The per-event odds payload for `market_key`, if still in the TTL cache."""
+        if self._odds_cache is None:
+            return None
+        return self._odds_cache.get((event_id, market_key, bookmakers))
+
+    def row_groups(self) -> Iterator[Tuple[int, Tuple[int, ...], str]]:
+        """Yield `(header_row, rows, label)` in render order."""
+        for event_id in self._ordered_ids:
+            entry = self._entries.get(event_id)
+            if entry is not None and entry.header_row is not None:
+                yield entry.header_row, entry.rows, entry.label
+
+    def row_count(self) -> int:
+        return len(self._row_to_event)
@@ -0,0 +1,161 @@
+"""Sorted point ladders for spread/total markets.
+
+Alternate spread and total markets can carry 40+ lines per book. A
+`PointLadder` parses every outcome's point once, keeps the lines sorted by
+absolute point, and answers "which outcomes sit on this line" and "what are
+the neighbouring lines" with a binary search instead of a linear scan.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+POINT_TOL = 1e-6
+LADDER_MEMO_MAX = 4096
+
+# Ladders memoized by `id(market)`, outside the payload: odds payloads are
+# shared read-only snapshots. An entry is only reused while its `source` is
+# still the market's outcomes list, so a recycled id never returns a stale
+# ladder.
+_LADDERS: Dict[int, "PointLadder"] = {}
+
+
+def normalize_name(value: Optional[str]) -> str:
+    return re.sub(r'[^a-z0-9]+', '', str(value or '').lower())
+
+
+class PointLadder:
+    """Outcomes of one market sorted by absolute point.
+
+    Parallel lists `abs_points`, `points`, `sides`, `names` and `prices` are
+    aligned with `outcomes`. `sides` holds the normalized outcome name.
+    """
+
+    __slots__ = ("source", "outcomes", "abs_points", "points", "sides", "names", "prices")
+
+    def __init__(self, outcomes: Optional[List[dict]]):
+        self.source = outcomes
+        rows: List[Tuple[float, float, str, dict]] = []
+        for outcome in outcomes or []:
+            try:
+                point = float(outcome.get('point'))
+            except Exception:
+                continue
+            rows.append((abs(point), point, normalize_name(outcome.get('name')), outcome))
+        # stable sort: outcomes on the same line keep their API order
+        rows.sort(key=lambda r: r[0])
+        self.outcomes = [r[3] for r in rows]
+        self.abs_points = [r[0] for r in rows]
+        self.points = [r[1] for r in rows]
+        self.sides = [r[2] for r in rows]
+        self.names = [str(r[3].get('name', '')) for r in rows]
+        self.prices = [r[3].get('price') for r in rows]
+
+    def __len__(self) -> int:
+        return len(self.outcomes)
+
+    def _span(self, point: float, tol: float = POINT_TOL) -> Tuple[int, int]:
+        target = abs(float(point))
+        return bisect_left(self.abs_points, target - tol), bisect_right(self.abs_points, target + tol)
+
+    def at(self, point: float, tol: float = POINT_TOL) -> List[dict]:
+        """Outcomes whose absolute point equals `abs(point)`."""
+        lo, hi = self._span(point, tol)
+        return self.outcomes[lo:hi]
+
+    def count_at(self, point: float, tol: float = POINT_TOL) -> int:
+        lo, hi = self._span(point, tol)
+        return hi - lo
+
+    def distinct_points(self) -> List[float]:
+        out: List[float] = []
+        for p in self.abs_points:
+            if not out or p - out[-1] > POINT_TOL:
+                out.append(p)
+        return out
+
+    def neighbors(self, point: float, tol: float = POINT_TOL) -> Tuple[Optional[float], Optional[float]]:
+        """Closest distinct absolute points strictly below and above `point`."""
+        lo, hi = self._span(point, tol)
+        below = self.abs_points[lo - 1] if lo > 0 else None
+        above = self.abs_points[hi] if hi < len(self.abs_points) else None
+        return below, above
+
+    def nearest_point(self, point: float) -> Optional[float]:
+        """Absolute point on the ladder closest to `abs(point)`."""
+        if not self.abs_points:
+            return None
+        target = abs(float(point))
+        idx = bisect_left(self.abs_points, target)
+        candidates = [self.abs_points[i] for i in (idx - 1, idx) if 0 <= i < len(self.abs_points)]
+        return min(candidates, key=lambda p: (abs(p - target), p))
+
+    def select(
+        self,
+        outcome_name: Optional[str],
+        market_key: str,
+        consensus_point: float,
+        favorite: Optional[str] = None,
+    ) -> Optional[dict]:
+        """Pick the outcome for `outcome_name` on the consensus line.
+
+        Matches the board's rules: totals prefer the Over/Under side named in
+        `outcome_name`; spreads prefer a name match and, when the favorite is
+        known, the signed point (-line for the favorite, +line otherwise).
+        """
+        lo, hi = self._span(consensus_point)
+        if lo == hi:
+            return None
+        idxs = range(lo, hi)
+
+        if market_key == 'totals':
+            name_lower = (outcome_name or '').lower()
+            target_side = 'over' if 'over' in name_lower else 'under' if 'under' in name_lower else None
+            if target_side:
+                for i in idxs:
+                    if target_side in self.names[i].lower():
+                        return self.outcomes[i]
+            return self.outcomes[lo]
+
+        if market_key == 'spreads':
+            target_abs = abs(float(consensus_point))
+            expected_point = None
+            if favorite and outcome_name:
+                expected_point = -target_abs if outcome_name == favorite else target_abs
+
+            def matches(i: int) -> bool:
+                if expected_point is None:
+                    return True
+                return abs(self.points[i] - expected_point) < POINT_TOL
+
+            target_norm = normalize_name(outcome_name)
+            for i in idxs:
+                side = self.sides[i]
+                if target_norm and side and (target_norm in side or side in target_norm) and matches(i):
+                    return self.outcomes[i]
+            for i in idxs:
+                if matches(i):
+                    return self.outcomes[i]
+            return None
+
+        return None
+
+
+def ladder_for(market: Optional[Dict[str, Any]], memo: Optional[Dict[int, PointLadder]] = None) -> PointLadder:
+    """Return the (memoized) ladder for `market`, rebuilding if its outcomes changed.
+
+    `market` is never written to. Pass `memo` (e.g. a snapshot's derived
+    cache) to scope the memo; the default is a bounded module-level one.
+    """
+    if not isinstance(market, dict):
+        return PointLadder([])
+    if memo is None:
+        memo = _LADDERS
+    outcomes = market.get('outcomes')
+    ladder = memo.get(id(market))
+    if ladder is None or ladder.source is not outcomes:
+        ladder = PointLadder(outcomes)
+        if memo is _LADDERS and len(memo) >= LADDER_MEMO_MAX:
+            memo.clear()
+        memo[id(market)] = ladder
+    return ladder
@@ -0,0 +1,357 @@
+"""Odds format conversion for scalars and NumPy arrays.
+
+Formats: "probability", "american", "decimal", "fractional" (fractional is
+the net-profit ratio, i.e. decimal - 1). Every pair is dispatched through
+module-level tables, so a call is one dict lookup plus the arithmetic.
+
+Python scalars keep the exact semantics of the original converter (invalid
+inputs raise, e.g. ZeroDivisionError). Array inputs are converted with
+vectorized masks and invalid prices (decimal <= 1, American 0, probability
+outside (0, 1]) come back as NaN instead of raising.
+
+Quoted prices live on small grids (whole American numbers, decimal prices in
+cents), so `PriceTable` precomputes every conversion and display string over
+them once; `format_price` and American array conversions then reduce to an
+index lookup, with the arithmetic kept as the off-grid fallback.
+"""
+
+from numbers import Real
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ODDS_FORMATS = ("probability", "american", "decimal", "fractional")
+
+
+# -- scalar kernels -----------------------------------------------------------
+
+def _s_identity(x):
+    return x
+
+
+def _s_probability_to_decimal(prob):
+    return 1 / prob
+
+
+def _s_decimal_to_probability(dec):
+    return 1 / dec
+
+
+def _s_decimal_to_american(dec):
+    return (dec - 1) * 100 if dec >= 2 else -100 / (dec - 1)
+
+
+def _s_american_to_decimal(amer):
+    return (amer / 100) + 1 if amer > 0 else (100 / -amer) + 1
+
+
+def _s_decimal_to_fractional(dec):
+    return dec - 1
+
+
+def _s_fractional_to_decimal(frac):
+    return frac + 1
+
+
+def _compose(*steps: Callable) -> Callable:
+    def converted(x):
+        for step in steps:
+            x = step(x)
+        return x
+    return converted
+
+
+_SCALAR_TO_DECIMAL: Dict[str, Callable] = {
+    "decimal": _s_identity,
+    "probability": _s_probability_to_decimal,
+    "american": _s_american_to_decimal,
+    "fractional": _s_fractional_to_decimal,
+}
+_SCALAR_FROM_DECIMAL: Dict[str, Callable] = {
+    "decimal": _s_identity,
+    "probability": _s_decimal_to_probability,
+    "american": _s_decimal_to_american,
+    "fractional": _s_decimal_to_fractional,
+}
+
+
+# -- vectorized kernels -------------------------------------------------------
+
+def _v_identity(x: np.ndarray) -> np.ndarray:
+    return x
+
+
+def _v_probability_to_decimal(prob: np.ndarray) -> np.ndarray:
+    valid = (prob > 0) & (prob <= 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(valid, 1.0 / prob, np.nan)
+
+
+def _v_decimal_to_probability(dec: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(dec > 1, 1.0 / dec, np.nan)
+
+
+def _v_decimal_to_american(dec: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = np.where(dec >= 2, (dec - 1.0) * 100.0, -100.0 / (dec - 1.0))
+    return np.where(dec > 1, out, np.nan)
+
+
+def _v_american_to_decimal(amer: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = np.where(amer > 0, amer / 100.0 + 1.0, 100.0 / -amer + 1.0)
+    return np.where(amer != 0, out, np.nan)
+
+
+def _v_decimal_to_fractional(dec: np.ndarray) -> np.ndarray:
+    return np.where(dec > 1, dec - 1.0, np.nan)
+
+
+def _v_fractional_to_decimal(frac: np.ndarray) -> np.ndarray:
+    return np.where(frac > 0, frac + 1.0, np.nan)
+
+
+_VECTOR_TO_DECIMAL: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "decimal": _v_identity,
+    "probability": _v_probability_to_decimal,
+    "american": _v_american_to_decimal,
+    "fractional": _v_fractional_to_decimal,
+}
+_VECTOR_FROM_DECIMAL: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "decimal": _v_identity,
+    "probability": _v_decimal_to_probability,
+    "american": _v_decimal_to_american,
+    "fractional": _v_decimal_to_fractional,
+}
+
+def _build_pairs(to_dec: Dict[str, Callable], from_dec: Dict[str, Callable]) -> Dict[Tuple[str, str], Callable]:
+    pairs: Dict[Tuple[str, str], Callable] = {}
+    for src in ODDS_FORMATS:
+        for dst in ODDS_FORMATS:
+            if src == dst:
+                pairs[(src, dst)] = to_dec["decimal"]
+            elif src == "decimal":
+                pairs[(src, dst)] = from_dec[dst]
+            elif dst == "decimal":
+                pairs[(src, dst)] = to_dec[src]
+            else:
+                pairs[(src, dst)] = _compose(to_dec[src], from_dec[dst])
+    return pairs
+
+
+SCALAR_CONVERSIONS = _build_pairs(_SCALAR_TO_DECIMAL, _SCALAR_FROM_DECIMAL)
+VECTOR_CONVERSIONS = _build_pairs(_VECTOR_TO_DECIMAL, _VECTOR_FROM_DECIMAL)
+
+
+# -- lookup tables ------------------------------------------------------------
+
+AMERICAN_MIN = -20000
+AMERICAN_MAX = 20000
+DECIMAL_MAX_CENTS = 20100  # 201.00, i.e. +20000
+DISPLAY_FORMATS = ("american", "decimal", "probability", "fractional")
+
+
+def _format_from_probability(prob: float, fmt: str) -> str:
+    if fmt == "probability":
+        return f"{prob:.1%}"
+    converted = SCALAR_CONVERSIONS[("probability", fmt)](prob)
+    if fmt == "american":
+        ival = int(round(float(converted)))
+        return f"{ival:+d}" if ival > 0 else f"{ival}"
+    if fmt == "decimal":
+        return f"{float(converted):.2f}"
+    return str(converted)
+
+
+def format_decimal_price(price: float, fmt: str) -> str:
+    """Display string for a decimal `price` in `fmt` (raises on invalid prices)."""
+    if fmt == "decimal":
+        return f"{float(price):.2f}"
+    return _format_from_probability(SCALAR_CONVERSIONS[("decimal", "probability")](price), fmt)
+
+
+class PriceTable:
+    """Conversions and display strings precomputed over a grid of prices.
+
+    Rows are aligned with `decimal`; each of `VECTOR_CONVERSIONS`' target
+    formats has a column, and `display(fmt)` holds the `format_decimal_price`
+    string per row (None where the price is invalid).
+    """
+
+    __slots__ = ("decimal", "columns", "_display")
+
+    def __init__(self, decimal: np.ndarray):
+        self.decimal = decimal
+        self.columns = {fmt: VECTOR_CONVERSIONS[("decimal", fmt)](decimal) for fmt in ODDS_FORMATS}
+        for column in self.columns.values():
+            column.flags.writeable = False
+        self._display: Dict[str, List[Optional[str]]] = {}
+
+    def __len__(self) -> int:
+        return self.decimal.size
+
+    def display(self, fmt: str) -> List[Optional[str]]:
+        strings = self._display.get(fmt)
+        if strings is None:
+            strings = []
+            for price in self.decimal.tolist():
+                try:
+                    strings.append(format_decimal_price(price, fmt) if price > 1 else None)
+                except Exception:
+                    strings.append(None)
+            self._display[fmt] = strings
+        return strings
+
+
+_AMERICAN_TABLE: Optional[PriceTable] = None
+_DECIMAL_TABLE: Optional[PriceTable] = None
+
+
+def american_table() -> PriceTable:
+    """Table over every whole American price in [AMERICAN_MIN, AMERICAN_MAX]."""
+    global _AMERICAN_TABLE
+    if _AMERICAN_TABLE is None:
+        grid = np.arange(AMERICAN_MIN, AMERICAN_MAX + 1, dtype=np.float64)
+        _AMERICAN_TABLE = PriceTable(_v_american_to_decimal(grid))
+    return _AMERICAN_TABLE
+
+
+def decimal_table() -> PriceTable:
+    """Table over every decimal price in cents from 1.00 to 201.00."""
+    global _DECIMAL_TABLE
+    if _DECIMAL_TABLE is None:
+        _DECIMAL_TABLE = PriceTable(np.arange(100, DECIMAL_MAX_CENTS + 1, dtype=np.float64) / 100.0)
+    return _DECIMAL_TABLE
+
+
+def american_index(american: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Row of each whole American price in `american_table()` and the on-grid mask."""
+    hit = (american == np.rint(american)) & (american >= AMERICAN_MIN) & (american <= AMERICAN_MAX)
+    index = np.where(hit, american, AMERICAN_MIN).astype(np.int64) - AMERICAN_MIN
+    return index, hit
+
+
+def decimal_index(decimal: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Row of each cent-exact decimal price in `decimal_table()` and the on-grid mask."""
+    with np.errstate(invalid='ignore'):
+        cents = np.rint(decimal * 100.0)
+        hit = (cents >= 100) & (cents <= DECIMAL_MAX_CENTS)
+    index = np.where(hit, cents, 100).astype(np.int64) - 100
+    hit &= decimal_table().decimal[index] == decimal
+    return index, hit
+
+
+def _v_american_via_table(dst: str, fallback: Callable[[np.ndarray], np.ndarray]) -> Callable:
+    def converted(american: np.ndarray) -> np.ndarray:
+        index, hit = american_index(american)
+        if hit.all():
+            return american_table().columns[dst][index]
+        return fallback(american)
+    return converted
+
+
+for _dst in ODDS_FORMATS:
+    if _dst != "american":
+        VECTOR_CONVERSIONS[("american", _dst)] = _v_american_via_table(_dst, VECTOR_CONVERSIONS[("american", _dst)])
+del _dst
+
+
+def format_price(price: Any, fmt: str) -> str:
+    """`format_decimal_price` through the decimal table when `price` is on its grid."""
+    cents = round(price * 100)
+    if 100 < cents <= DECIMAL_MAX_CENTS and cents / 100 == price:
+        text = decimal_table().display(fmt)[cents - 100]
+        if text is not None:
+            return text
+    return format_decimal_price(price, fmt)
+
+
+def format_prices(prices: Any, fmt: str, missing: str = "N/A") -> List[str]:
+    """Display strings for an array of decimal prices (`missing` where invalid)."""
+    arr = np.asarray(prices, dtype=np.float64).reshape(-1)
+    index, hit = decimal_index(arr)
+    strings = decimal_table().display(fmt)
+    out = []
+    for price, row, on_grid in zip(arr.tolist(), index.tolist(), hit.tolist()):
+        text = strings[row] if on_grid else None
+        if text is None:
+            try:
+                text = format_decimal_price(price, fmt) if price > 1 else missing
+            except Exception:
+                text = missing
+        out.append(text)
+    return out
+
+
+def convert_odds(odds_from: str, odds_to: str, odds_value: Any) -> Any:
+    """Convert `odds_value` from `odds_from` to `odds_to`.
+
+    Real scalars go through the scalar kernels; lists and arrays return a
+    float64 ndarray of the same shape.
+    """
+    key = (odds_from, odds_to)
+    if isinstance(odds_value, Real) and not isinstance(odds_value, np.ndarray):
+        fn = SCALAR_CONVERSIONS.get(key)
+        if fn is None:
+            raise ValueError(f"Conversion from {odds_from} to {odds_to} is not supported.")
+        return fn(odds_value)
+    fn = VECTOR_CONVERSIONS.get(key)
+    if fn is None:
+        raise ValueError(f"Conversion from {odds_from} to {odds_to} is not supported.")
+    return fn(np.asarray(odds_value, dtype=np.float64))
+
+
+def format_odds(value: Any, odds_from: str, fmt: str) -> str:
+    """Display string for `value` given in `odds_from`, shown in `fmt`."""
+    if odds_from == "decimal":
+        return format_price(value, fmt)
+    if odds_from != "probability":
+        value = SCALAR_CONVERSIONS[(odds_from, "probability")](value)
+    return _format_from_probability(value, fmt)
+
+
+class FormatCache:
+    """Bounded memo of `format_odds` strings keyed by (value, source, display format).
+
+    Boards repeat the same prices across books and events, so most cells are
+    a dict hit. When full, the oldest entries are dropped first. Errors are
+    not cached; they propagate to the caller as from `format_odds`. Not
+    thread-safe: it is meant for the GUI thread that renders the tables.
+    """
+
+    __slots__ = ("max_entries", "_data", "_stats")
+
+    def __init__(self, max_entries: int = 8192):
+        self.max_entries = max(int(max_entries), 1)
+        self._data: Dict[Tuple[Any, str, str], str] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def format(self, value: Any, odds_from: str, fmt: str) -> str:
+        key = (value, odds_from, fmt)
+        text = self._data.get(key)
+        if text is not None:
+            self._stats["hits"] += 1
+            return text
+        self._stats["misses"] += 1
+        text = format_odds(value, odds_from, fmt)
+        if len(self._data) >= self.max_entries:
+            del self._data[next(iter(self._data))]
+            self._stats["evictions"] += 1
+        self._data[key] = text
+        return text
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. when the display format changes); counters are kept."""
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of hit/miss/eviction counters and current size."""
+        out: Dict[str, Any] = dict(self._stats)
+        lookups = out["hits"] + out["misses"]
+        out["hit_rate"] = out["hits"] / lookups if lookups else 0.0
+        out["entries"] = len(self._data)
+        return out
@@ -0,0 +1,560 @@
+"""Cross-book scanners over columnar snapshots.
+
+`find_arbitrage` looks for lines where the best price for every outcome,
+taken across all books, implies less than 100% in total: backing each
+outcome at its best book in proportion to its implied probability returns
+the same payout whatever happens, above the total staked.
+
+Rows from several `ColumnarOdds` (every selected sport's snapshot plus any
+cached alternate-line payloads) are stacked and scanned in one grouped pass:
+rows are keyed by (event, market, line), the best price per outcome is a
+grouped max over books, and the implied sum per line is one `bincount`.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .snapshots import ColumnarOdds, OddsSnapshot
+except ImportError:
+    from snapshots import ColumnarOdds, OddsSnapshot
+
+ARB_MARKETS = ("h2h", "spreads", "totals", "h2h_3_way")
+# alternate-line markets are scanned as more lines of their main market
+MARKET_ALIASES = {"alternate_spreads": "spreads", "alternate_totals": "totals"}
+POINT_SCALE = 100  # lines are matched on hundredths of a point
+
+
+class ArbitrageOpportunity:
+    """One arbitrage line: a leg per outcome at its best book.
+
+    `legs` are dicts with `outcome`, `book`, `price`, `point` and
+    `stake_fraction` (share of the total stake; they sum to 1). `margin` is
+    the guaranteed return on the total stake, ``1 / implied_sum - 1``.
+    """
+
+    __slots__ = ("event_id", "market", "point", "legs", "implied_sum", "margin", "event")
+
+    def __init__(
+        self,
+        event_id: str,
+        market: str,
+        point: Optional[float],
+        legs: List[Dict[str, Any]],
+        implied_sum: float,
+        event: Optional[dict] = None,
+    ):
+        self.event_id = event_id
+        self.market = market
+        self.point = point
+        self.legs = legs
+        self.implied_sum = implied_sum
+        self.margin = 1.0 / implied_sum - 1.0
+        self.event = event
+
+    def stakes(self, total: float) -> List[float]:
+        """Stake per leg for `total`, each returning ``total / implied_sum``."""
+        return [total * leg["stake_fraction"] for leg in self.legs]
+
+    def __repr__(self) -> str:
+        return f"ArbitrageOpportunity({self.event_id!r}, {self.market!r}, point={self.point}, margin={self.margin:.4f})"
+
+
+def _group_ids(*keys: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Dense id per distinct key tuple (ids follow the sorted key order)."""
+    n = keys[0].size
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), 0
+    # pack the keys into one int64 when their ranges allow: one sort instead of a lexsort
+    packed = np.zeros(n, dtype=np.int64)
+    span = 1
+    for key in keys:
+        lo = int(key.min())
+        width = int(key.max()) - lo + 1
+        span *= width
+        if span >= 2 ** 62:
+            packed = None
+            break
+        packed = packed * width + (key - lo)
+    if packed is not None:
+        order = np.argsort(packed, kind='stable')
+        sorted_key = packed[order]
+        new = np.r_[True, sorted_key[1:] != sorted_key[:-1]]
+    else:
+        order = np.lexsort(keys[::-1])
+        new = np.zeros(n, dtype=bool)
+        new[0] = True
+        for key in keys:
+            sorted_key = key[order]
+            new[1:] |= sorted_key[1:] != sorted_key[:-1]
+    ids_sorted = np.cumsum(new) - 1
+    ids = np.empty(n, dtype=np.int64)
+    ids[order] = ids_sorted
+    return ids, int(ids_sorted[-1]) + 1
+
+
+def _remap(keys: Sequence[Any], table: Dict[Any, int]) -> np.ndarray:
+    return np.fromiter((table.setdefault(k, len(table)) for k in keys), dtype=np.int64, count=len(keys))
+
+
+class _Stacked:
+    """Rows of several `ColumnarOdds` on shared event/book/name/market ids."""
+
+    def __init__(self, sources: Iterable[ColumnarOdds], markets: Sequence[str]):
+        market_table = {m: i for i, m in enumerate(markets)}
+        event_table: Dict[str, int] = {}
+        book_table: Dict[Any, int] = {}
+        name_table: Dict[str, int] = {}
+        parts: Dict[str, List[np.ndarray]] = {k: [] for k in ("event", "book", "name", "kind", "point", "price")}
+        for columns in sources:
+            if not len(columns):
+                continue
+            kinds = np.array(
+                [market_table.get(MARKET_ALIASES.get(k, k), -1) for k in columns.market_keys] or [-1],
+                dtype=np.int64,
+            )
+            parts["event"].append(_remap(columns.event_ids, event_table)[columns.event])
+            parts["book"].append(_remap(columns.book_keys, book_table)[columns.book])
+            parts["name"].append(_remap(columns.names, name_table)[columns.name])
+            parts["kind"].append(kinds[columns.market])
+            parts["point"].append(np.asarray(columns.point))
+            parts["price"].append(np.asarray(columns.price))
+        for key, chunks in parts.items():
+            dtype = np.float64 if key in ("point", "price") else np.int64
+            setattr(self, key, np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype))
+        self.event_ids = list(event_table)
+        self.book_keys = list(book_table)
+        self.names = list(name_table)
+
+
+def _first_side(event: np.ndarray, name: np.ndarray, mask: np.ndarray, n_events: int) -> np.ndarray:
+    """Rows (under `mask`) quoting their event's first side: the lowest name id."""
+    first = np.full(n_events, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first, event[mask], name[mask])
+    return name == first[event]
+
+
+def _best_rows(group_id: np.ndarray, price: np.ndarray) -> np.ndarray:
+    """Row of the highest price per group id (the first book on ties)."""
+    order = np.argsort(group_id, kind='stable')
+    sorted_group = group_id[order]
+    sorted_price = price[order]
+    starts = np.flatnonzero(np.r_[True, sorted_group[1:] != sorted_group[:-1]])
+    best_price = np.maximum.reduceat(sorted_price, starts)
+    at_best = np.flatnonzero(sorted_price == best_price[sorted_group])
+    first = np.r_[True, sorted_group[at_best[1:]] != sorted_group[at_best[:-1]]]
+    return order[at_best[first]]
+
+
+def _events_by_id(snapshots: Sequence[OddsSnapshot]) -> Dict[str, dict]:
+    by_id: Dict[str, dict] = {}
+    for snap in snapshots:
+        for ev_id, event in zip(snap.columns.event_ids, snap.events):
+            by_id.setdefault(ev_id, event)
+    return by_id
+
+
+def find_arbitrage(
+    sources: Iterable[ColumnarOdds],
+    markets: Sequence[str] = ARB_MARKETS,
+    min_margin: float = 0.0,
+) -> List[ArbitrageOpportunity]:
+    """Arbitrage lines across every book quoting them, best margin first.
+
+    Args:
+        sources: Columnar boards to scan together (events are matched by id,
+            so the same event may appear in several of them).
+        markets: Market keys to scan; `MARKET_ALIASES` fold alternate
+            lines into their main market.
+        min_margin: Minimum guaranteed return to report.
+
+    A line counts only when the outcomes quoted across books are exactly the
+    set a single book quotes for it (two for spreads/totals/2-way moneylines,
+    three with a draw), so a name mismatch can never fake a missing leg.
+    Spread lines pair each side's point with the opposite sign of the other's.
+    """
+    rows = _Stacked(sources, markets)
+    kinds = {m: i for i, m in enumerate(markets)}
+    spreads, totals = kinds.get("spreads", -1), kinds.get("totals", -1)
+    is_line = (rows.kind == spreads) | (rows.kind == totals)
+    keep = (rows.kind >= 0) & np.isfinite(rows.price) & (rows.price > 1.0) & (~is_line | np.isfinite(rows.point))
+    idx = np.nonzero(keep)[0]
+    if idx.size == 0:
+        return []
+    event, book, name, kind = rows.event[idx], rows.book[idx], rows.name[idx], rows.kind[idx]
+    point, price = rows.point[idx], rows.price[idx]
+
+    # canonical line: totals share a point; spread sides quote +x / -x, so
+    # the line is keyed by the point of each event's first-listed side
+    line = np.where(kind == totals, point, 0.0)
+    spread_rows = kind == spreads
+    if spread_rows.any():
+        first = _first_side(event, name, spread_rows, len(rows.event_ids))
+        line = np.where(spread_rows, np.where(first, point, -point), line)
+    line_q = np.rint(line * POINT_SCALE).astype(np.int64)
+
+    line_id, n_lines = _group_ids(event, kind, line_q)
+    outcome_id, n_outcomes = _group_ids(line_id, name)
+
+    best_row = _best_rows(outcome_id, price)
+    outcome_line = line_id[best_row]
+    best_prob = 1.0 / price[best_row]
+
+    n_names = np.bincount(outcome_line, minlength=n_lines)
+    implied = np.bincount(outcome_line, weights=best_prob, minlength=n_lines)
+
+    # outcomes one book quotes on each line (duplicate rows counted once)
+    pair_id, _ = _group_ids(outcome_id, book)
+    pair_first = np.unique(pair_id, return_index=True)[1]
+    book_line, n_book_lines = _group_ids(line_id[pair_first], book[pair_first])
+    per_book = np.bincount(book_line, minlength=n_book_lines)
+    required = np.zeros(n_lines, dtype=np.int64)
+    book_line_first = np.unique(book_line, return_index=True)[1]
+    np.maximum.at(required, line_id[pair_first][book_line_first], per_book)
+
+    with np.errstate(divide='ignore'):
+        margin = 1.0 / implied - 1.0
+    arb = (n_names >= 2) & (n_names == required) & (margin > 0.0) & (margin >= min_margin)
+    if not arb.any():
+        return []
+
+    legs_by_line: Dict[int, List[int]] = {}
+    arb_outcomes = np.nonzero(arb[outcome_line])[0]
+    for outcome, line_of in zip(arb_outcomes.tolist(), outcome_line[arb_outcomes].tolist()):
+        legs_by_line.setdefault(line_of, []).append(outcome)
+
+    opportunities: List[ArbitrageOpportunity] = []
+    for line_of, outcomes in legs_by_line.items():
+        total = float(implied[line_of])
+        legs = []
+        for outcome in outcomes:
+            r = int(best_row[outcome])
+            leg_point = float(point[r])
+            legs.append({
+                "outcome": rows.names[name[r]],
+                "book": rows.book_keys[book[r]],
+                "price": float(price[r]),
+                "point": leg_point if leg_point == leg_point else None,
+                "stake_fraction": float(best_prob[outcome]) / total,
+            })
+        r0 = int(best_row[outcomes[0]])
+        market = markets[int(kind[r0])]
+        opportunities.append(ArbitrageOpportunity(
+            rows.event_ids[event[r0]],
+            market,
+            float(abs(line[r0])) if market in ("spreads", "totals") else None,
+            legs,
+            total,
+        ))
+    opportunities.sort(key=lambda o: -o.margin)
+    return opportunities
+
+
+def scan_snapshots(
+    snapshots: Sequence[OddsSnapshot],
+    alternate_events: Sequence[dict] = (),
+    markets: Sequence[str] = ARB_MARKETS,
+    min_margin: float = 0.0,
+) -> List[ArbitrageOpportunity]:
+    """`find_arbitrage` over published snapshots plus cached alternate-line events.
+
+    Each snapshot's columns are built once and shared; opportunities get the
+    snapshot event dict they refer to as `event`.
+    """
+    sources = [snap.columns for snap in snapshots]
+    if alternate_events:
+        sources.append(ColumnarOdds(alternate_events))
+    opportunities = find_arbitrage(sources, markets, min_margin)
+    if opportunities:
+        by_id = _events_by_id(snapshots)
+        for opp in opportunities:
+            opp.event = by_id.get(opp.event_id)
+    return opportunities
+
+
+# -- middles ------------------------------------------------------------------
+
+# Approximate long-run NFL final-margin frequencies (% of games by absolute
+# margin). Only their lumpiness relative to neighbouring margins is used.
+NFL_MARGIN_FREQUENCIES = {
+    0: 0.3, 1: 3.6, 2: 3.9, 3: 14.6, 4: 5.2, 5: 3.6, 6: 6.2, 7: 9.1, 8: 3.6, 9: 2.2,
+    10: 5.6, 11: 2.9, 12: 2.2, 13: 2.6, 14: 4.6, 15: 2.3, 16: 2.2, 17: 3.4, 18: 1.8,
+    19: 1.3, 20: 1.9, 21: 2.3, 22: 1.1, 23: 1.1, 24: 1.5, 25: 1.0, 26: 0.8, 27: 1.1,
+    28: 1.2, 29: 0.5, 30: 0.5, 31: 0.7, 32: 0.4, 33: 0.4, 34: 0.5, 35: 0.5,
+}
+# Approximate NFL game-total frequencies (%) around the common key totals.
+NFL_TOTAL_FREQUENCIES = {
+    33: 2.3, 34: 2.0, 35: 2.2, 36: 1.9, 37: 3.3, 38: 2.3, 39: 2.2, 40: 2.2, 41: 3.6,
+    42: 2.1, 43: 3.2, 44: 3.3, 45: 2.6, 46: 2.0, 47: 3.0, 48: 2.4, 49: 1.9, 50: 2.0,
+    51: 2.5, 52: 1.7, 53: 1.7, 54: 1.9, 55: 1.6,
+}
+
+
+def _lumpiness(frequencies: Dict[int, float], window: int = 2) -> Dict[int, float]:
+    """Frequency of each value over the mean of its neighbourhood (1 = smooth)."""
+    ratios = {}
+    for value, freq in frequencies.items():
+        near = [frequencies[v] for v in range(value - window, value + window + 1) if v in frequencies]
+        ratios[value] = freq / (sum(near) / len(near))
+    return ratios
+
+
+class KeyNumberModel:
+    """Integer result distribution used to price a middle window.
+
+    P(X = k) is a normal density around the market's line (`sigma` points
+    wide) reweighted by an empirical key-number ratio: values that land more
+    often than their neighbours (NFL margins of 3 and 7) get more mass.
+    Spread models key on the absolute margin, total models on the total.
+    """
+
+    __slots__ = ("sigma", "ratios", "absolute", "support")
+
+    def __init__(self, sigma: float, ratios: Optional[Dict[int, float]] = None, absolute: bool = True,
+                 support: Tuple[int, int] = (-80, 80)):
+        self.sigma = float(sigma)
+        self.ratios = dict(ratios or {})
+        self.absolute = absolute
+        self.support = np.arange(support[0], support[1] + 1)
+
+    def pmf(self, centers: np.ndarray) -> np.ndarray:
+        """Rows of P(X = support[j]) for each center."""
+        k = self.support
+        key = np.abs(k) if self.absolute else k
+        ratio = np.array([self.ratios.get(int(v), 1.0) for v in key])
+        z = (k[None, :] - np.asarray(centers, dtype=np.float64)[:, None]) / self.sigma
+        weights = np.exp(-0.5 * z * z) * ratio[None, :]
+        return weights / weights.sum(axis=1, keepdims=True)
+
+
+KEY_NUMBER_MODELS: Dict[Tuple[str, str], KeyNumberModel] = {
+    ("americanfootball_nfl", "spreads"): KeyNumberModel(13.5, _lumpiness(NFL_MARGIN_FREQUENCIES)),
+    ("americanfootball_nfl", "totals"): KeyNumberModel(
+        13.0, _lumpiness(NFL_TOTAL_FREQUENCIES), absolute=False, support=(0, 120)),
+    ("americanfootball_ncaaf", "spreads"): KeyNumberModel(16.0, _lumpiness(NFL_MARGIN_FREQUENCIES)),
+    ("americanfootball_ncaaf", "totals"): KeyNumberModel(16.0, absolute=False, support=(0, 150)),
+    ("basketball_nba", "spreads"): KeyNumberModel(12.0),
+    # NBA totals have no strong key numbers: the window mass is the normal's
+    ("basketball_nba", "totals"): KeyNumberModel(18.0, absolute=False, support=(120, 330)),
+    ("basketball_ncaab", "spreads"): KeyNumberModel(11.0),
+    ("basketball_ncaab", "totals"): KeyNumberModel(15.0, absolute=False, support=(60, 240)),
+}
+
+
+class Middle:
+    """Opposite sides of one game at two books with a window where both win.
+
+    `low` / `high` bound the window in result terms (first side's margin for
+    spreads, game total for totals): the first leg wins above `low`, the
+    second below `high`, and landing exactly on a bound pushes that leg.
+    `legs` are as in `ArbitrageOpportunity`, staked to pay the same when only
+    one leg wins; `ev` is the expected return per unit of total stake.
+    """
+
+    __slots__ = ("event_id", "market", "low", "high", "legs", "hit_probability", "push_probability", "ev", "event")
+
+    def __init__(self, event_id: str, market: str, low: float, high: float, legs: List[Dict[str, Any]],
+                 hit_probability: float, push_probability: float, ev: float, event: Optional[dict] = None):
+        self.event_id = event_id
+        self.market = market
+        self.low = low
+        self.high = high
+        self.legs = legs
+        self.hit_probability = hit_probability
+        self.push_probability = push_probability
+        self.ev = ev
+        self.event = event
+
+    @property
+    def width(self) -> float:
+        return self.high - self.low
+
+    def stakes(self, total: float) -> List[float]:
+        return [total * leg["stake_fraction"] for leg in self.legs]
+
+    def __repr__(self) -> str:
+        return f"Middle({self.event_id!r}, {self.market!r}, {self.low:g}..{self.high:g}, ev={self.ev:.4f})"
+
+
+def find_middles(
+    sources: Iterable[ColumnarOdds],
+    sport_of: Mapping[str, str],
+    models: Mapping[Tuple[str, str], KeyNumberModel] = KEY_NUMBER_MODELS,
+    min_ev: float = 0.0,
+    max_width: Optional[float] = None,
+) -> List[Middle]:
+    """Spread/total middles over full ladders, ranked by expected value.
+
+    Args:
+        sources: Columnar boards, typically snapshots plus alternate-line
+            payloads (`alternate_spreads` / `alternate_totals`).
+        sport_of: Sport key per event id; events whose (sport, market) has
+            no model in `models` are skipped.
+        min_ev: Minimum expected return per unit staked to report.
+        max_width: Optional cap on the window width.
+
+    Each side's best price per line is taken across books, every first-side
+    line is paired with every opposite-side line above it in one broadcast
+    per (event, market), and the window, push and miss probabilities come
+    from one cumulative distribution per (event, market).
+    """
+    markets = ("spreads", "totals")
+    rows = _Stacked(sources, markets)
+    keep = (rows.kind >= 0) & np.isfinite(rows.price) & (rows.price > 1.0) & np.isfinite(rows.point)
+    # model per (event, market)
+    model_keys = list(models)
+    model_list = [models[k] for k in model_keys]
+    model_index = {k: i for i, k in enumerate(model_keys)}
+    event_model = np.array(
+        [[model_index.get((sport_of.get(ev_id, ""), market), -1) for market in markets] for ev_id in rows.event_ids]
+        or np.zeros((0, 2)),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    keep &= event_model[rows.event, np.maximum(rows.kind, 0)] >= 0
+    idx = np.nonzero(keep)[0]
+    if idx.size == 0:
+        return []
+    event, book, name, kind = rows.event[idx], rows.book[idx], rows.name[idx], rows.kind[idx]
+    point, price = rows.point[idx], rows.price[idx]
+
+    # side 0 (first team / Over) wins above `bound`, side 1 below it
+    is_total = kind == 1
+    lowered = [n.lower() for n in rows.names]
+    over = np.array([('over' in n) for n in lowered] or [False])[name]
+    under = np.array([('under' in n) for n in lowered] or [False])[name]
+    first = _first_side(event, name, ~is_total, len(rows.event_ids))
+    side = np.where(is_total, np.where(over, 0, 1), np.where(first, 0, 1))
+    bound = np.where(is_total, point, np.where(first, -point, point))
+    valid = ~is_total | over | under
+    event, book, name, kind, point, price, side, bound = (
+        a[valid] for a in (event, book, name, kind, point, price, side, bound))
+    if event.size == 0:
+        return []
+
+    # best price per (event, market, side, line)
+    quote_id, _ = _group_ids(event, kind, side, np.rint(bound * POINT_SCALE).astype(np.int64))
+    q = _best_rows(quote_id, price)
+    q_event, q_kind, q_side, q_bound, q_price = event[q], kind[q], side[q], bound[q], price[q]
+    market_id, n_markets = _group_ids(q_event, q_kind)
+
+    # center each (event, market) on the first-side line priced closest to even
+    closeness = np.where(q_side == 0, np.abs(1.0 / q_price - 0.5), np.inf)
+    center = np.full(n_markets, np.nan)
+    order = np.lexsort((closeness, market_id))
+    firsts = order[np.r_[True, market_id[order][1:] != market_id[order][:-1]]]
+    has_center = np.isfinite(closeness[firsts])
+    center[market_id[firsts[has_center]]] = q_bound[firsts[has_center]]
+
+    # every (side 0, side 1) pair within a market, as one broadcast
+    order = np.lexsort((q_side, market_id))
+    grp = market_id[order]
+    n0 = np.bincount(market_id[q_side == 0], minlength=n_markets)
+    n1 = np.bincount(market_id[q_side == 1], minlength=n_markets)
+    start = np.searchsorted(grp, np.arange(n_markets))
+    n_pairs = n0 * n1
+    total_pairs = int(n_pairs.sum())
+    if total_pairs == 0:
+        return []
+    pair_market = np.repeat(np.arange(n_markets), n_pairs)
+    t = np.arange(total_pairs) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+    leg_a = order[start[pair_market] + t // n1[pair_market]]
+    leg_b = order[start[pair_market] + n0[pair_market] + t % n1[pair_market]]
+    low, high = q_bound[leg_a], q_bound[leg_b]
+    window = (high > low) & np.isfinite(center[pair_market])
+    if max_width is not None:
+        window &= high - low <= max_width
+    leg_a, leg_b, low, high, pair_market = (a[window] for a in (leg_a, leg_b, low, high, pair_market))
+    if leg_a.size == 0:
+        return []
+
+    # window / push probabilities from one CDF per (event, market)
+    hit = np.zeros(leg_a.size)
+    push_low = np.zeros(leg_a.size)
+    push_high = np.zeros(leg_a.size)
+    market_event = np.zeros(n_markets, dtype=np.int64)
+    market_kind = np.zeros(n_markets, dtype=np.int64)
+    market_event[market_id] = q_event
+    market_kind[market_id] = q_kind
+    market_model = event_model[market_event, market_kind]
+    pair_model = market_model[pair_market]
+    for m, model in enumerate(model_list):
+        sel = np.nonzero(pair_model == m)[0]
+        if sel.size == 0:
+            continue
+        used, local = np.unique(pair_market[sel], return_inverse=True)
+        pmf = model.pmf(center[used])
+        cdf = np.concatenate((np.zeros((used.size, 1)), np.cumsum(pmf, axis=1)), axis=1)
+        k0, n_k = int(model.support[0]), model.support.size
+
+        def cdf_at(k):  # P(X <= k)
+            return cdf[local, np.clip(k - k0 + 1, 0, n_k)]
+
+        def pmf_at(k):
+            inside = (k >= k0) & (k < k0 + n_k)
+            return np.where(inside, pmf[local, np.clip(k - k0, 0, n_k - 1)], 0.0)
+
+        lo, hi = low[sel], high[sel]
+        hit[sel] = cdf_at(np.ceil(hi).astype(np.int64) - 1) - cdf_at(np.floor(lo).astype(np.int64))
+        lo_int, hi_int = lo == np.floor(lo), hi == np.floor(hi)
+        push_low[sel] = np.where(lo_int, pmf_at(lo.astype(np.int64)), 0.0)
+        push_high[sel] = np.where(hi_int, pmf_at(hi.astype(np.int64)), 0.0)
+
+    # stakes pay the same when one leg wins; a push refunds that leg
+    inv_a, inv_b = 1.0 / q_price[leg_a], 1.0 / q_price[leg_b]
+    total_inv = inv_a + inv_b
+    share_a, share_b = inv_a / total_inv, inv_b / total_inv
+    single = 1.0 / total_inv - 1.0
+    miss = 1.0 - hit - push_low - push_high
+    ev = hit * (2.0 / total_inv - 1.0) + push_low * (share_a + single) + push_high * (share_b + single) + miss * single
+
+    chosen = np.nonzero(ev >= min_ev)[0]
+    chosen = chosen[np.argsort(-ev[chosen], kind='stable')]
+    middles: List[Middle] = []
+    for i in chosen.tolist():
+        legs = []
+        for r, share in ((q[leg_a[i]], share_a[i]), (q[leg_b[i]], share_b[i])):
+            legs.append({
+                "outcome": rows.names[name[r]],
+                "book": rows.book_keys[book[r]],
+                "price": float(price[r]),
+                "point": float(point[r]),
+                "stake_fraction": float(share),
+            })
+        r0 = q[leg_a[i]]
+        middles.append(Middle(
+            rows.event_ids[event[r0]], markets[int(kind[r0])], float(low[i]), float(high[i]), legs,
+            float(hit[i]), float(push_low[i] + push_high[i]), float(ev[i]),
+        ))
+    return middles
+
+
+def scan_middles(
+    snapshots: Sequence[OddsSnapshot],
+    alternate_events: Sequence[dict] = (),
+    models: Mapping[Tuple[str, str], KeyNumberModel] = KEY_NUMBER_MODELS,
+    min_ev: float = 0.0,
+    max_width: Optional[float] = None,
+) -> List[Middle]:
+    """`find_middles` over published snapshots plus cached alternate ladders.
+
+    The sport of each event is its `sport_key`, else the first element of
+    the snapshot key it was published under.
+    """
+    sources = [snap.columns for snap in snapshots]
+    if alternate_events:
+        sources.append(ColumnarOdds(alternate_events))
+    sport_of: Dict[str, str] = {}
+    for snap in snapshots:
+        default = snap.key[0] if isinstance(snap.key, tuple) and snap.key else ""
+        for ev_id, event in zip(snap.columns.event_ids, snap.events):
+            sport_of.setdefault(ev_id, event.get('sport_key') or default)
+    for event in alternate_events:
+        if event.get('id') and event.get('sport_key'):
+            sport_of.setdefault(str(event['id']), event['sport_key'])
+    middles = find_middles(sources, sport_of, models, min_ev, max_width)
+    if middles:
+        by_id = _events_by_id(snapshots)
+        for middle in middles:
+            middle.event = by_id.get(middle.event_id)
+    return middles
@@ -0,0 +1,753 @@
+"""Correlation-aware Monte Carlo of a wager set's profit and loss.
+
+Wagers on the same game are not independent: both sides of a market can
+never win together, and a moneyline and a spread on the same team move
+together. Each event's result is drawn once per trial, and every wager's
+payoff is read off that shared draw:
+
+- The *side* axis is one uniform per event, ordered from the home team's
+  best result to its worst. It drives h2h, 3-way and spread wagers: the
+  home team wins on ``[0, p)``, the away team on ``[1 - p, 1)`` and a draw
+  sits between them. A spread bet is the same kind of threshold, so nested
+  lines (-3.5 covers only if the moneyline also wins) stay consistent.
+- The *total* axis is a second uniform per event: Over wins on ``[0, p)``,
+  Under on ``[1 - p, 1)``.
+- Anything else (outrights, names that are not the event's teams) is a
+  categorical draw per (event, market): outcomes are stacked on their own
+  uniform in order, so at most one of them wins.
+
+Each wager wins when its axis' uniform lands in its interval ``[lo, hi)``, so
+its marginal win probability is exactly its consensus probability.
+
+The kernel works on fixed-size chunks of trials, so memory stays bounded
+however many trials are asked for. For each chunk it:
+
+1. draws a ``(chunk, axes)`` block of raw 32-bit uniforms;
+2. gathers the block into ``(chunk, wagers)`` and turns it into a win matrix
+   with one wrapping compare per cell, ``(u - lo) mod 2**32 < width``;
+3. reduces the P/L with one matrix-vector product.
+
+A trial whose product is zero lost every bet. ``dtype=np.float32`` halves
+the accumulator and output memory.
+
+`simulate_pl_sharded` splits large runs into fixed-size shards, each with
+its own stream from ``SeedSequence(seed).spawn``, and runs them on a
+process pool. Shards are concatenated in shard order, so a seeded run gives
+the same trials (and therefore the same histogram and moments) whatever
+the number of workers.
+
+`simulate_paths` replays the slate sequentially with compounding stakes:
+each wager keeps its fraction of its account's bankroll, so every account
+grows or shrinks slate by slate. It tracks quantiles of the total bankroll
+per slate, each path's maximum drawdown, and the slate at which it was
+ruined.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from typing import Callable, Dict, Hashable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+SIDE_MARKETS = ("h2h", "h2h_3_way", "spreads", "alternate_spreads")
+TOTAL_MARKETS = ("totals", "alternate_totals")
+DRAW_NAMES = ("draw", "tie")
+# cells per (chunk x wagers) block; ~1M keeps the temporaries near the CPU cache
+DEFAULT_CHUNK_ELEMENTS = 1 << 20
+_U32 = float(1 << 32)
+
+
+class WagerIntervals:
+    """Valid wagers as win intervals on shared per-event uniforms."""
+
+    __slots__ = ("axis", "lo", "hi", "stake", "profit", "n_axes", "index", "axis_keys")
+
+    def __init__(self, axis, lo, hi, stake, profit, n_axes, index, axis_keys):
+        self.axis = np.asarray(axis, dtype=np.int64)
+        self.lo = np.asarray(lo, dtype=np.float64)
+        self.hi = np.asarray(hi, dtype=np.float64)
+        self.stake = np.asarray(stake, dtype=np.float64)
+        self.profit = np.asarray(profit, dtype=np.float64)
+        self.n_axes = int(n_axes)
+        self.index = list(index)
+        self.axis_keys = list(axis_keys)
+
+    def __len__(self) -> int:
+        return int(self.stake.size)
+
+    @property
+    def total_stake(self) -> float:
+        return float(self.stake.sum())
+
+    def wins(self, uniforms: np.ndarray) -> np.ndarray:
+        """(trials, wagers) win matrix for a (trials, n_axes) block of uniforms."""
+        u = uniforms[:, self.axis]
+        return (u >= self.lo) & (u < self.hi)
+
+    def thresholds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Intervals on the 32-bit grid: ``lo <= u < lo + width`` with ``u`` uint32."""
+        lo = np.clip(np.rint(self.lo * _U32), 0, _U32 - 1)
+        hi = np.clip(np.rint(self.hi * _U32), 0, _U32 - 1)
+        return lo.astype(np.uint32), np.maximum(hi - lo, 0).astype(np.uint32)
+
+
+class SimulationResult:
+    """Per-trial P/L of the wager set plus the all-bets-lose mask."""
+
+    __slots__ = ("totals", "all_lose", "n_wagers", "total_stake")
+
+    def __init__(self, totals: np.ndarray, all_lose: np.ndarray, n_wagers: int, total_stake: float):
+        self.totals = totals
+        self.all_lose = all_lose
+        self.n_wagers = n_wagers
+        self.total_stake = total_stake
+
+
+def _teams(wager: dict) -> Tuple[str, str]:
+    home = wager.get("home_team")
+    away = wager.get("away_team")
+    if home and away:
+        return str(home), str(away)
+    label = str(wager.get("event") or "")
+    if " @ " in label:
+        away, home = label.split(" @ ", 1)
+        return home.strip(), away.strip()
+    return "", ""
+
+
+def wager_intervals(wagers: Sequence[dict]) -> WagerIntervals:
+    """Map each valid wager (stake > 0, decimal odds > 1, probability > 0) to its interval."""
+    axis_index: Dict[Hashable, int] = {}
+    stacked: Dict[Hashable, float] = {}
+    # side-axis probability already taken by each (event, market)'s home / away outcome,
+    # used to place a draw between them
+    side_taken: Dict[Hashable, List[float]] = {}
+    rows = []
+    for i, wager in enumerate(wagers):
+        try:
+            prob = float(wager.get("consensus_probability", 0))
+            stake = float(wager.get("stake", 0))
+            dec = float(wager.get("odds_decimal", 0))
+        except Exception:
+            continue
+        if stake <= 0 or dec <= 1 or not prob > 0:
+            continue
+        prob = min(prob, 1.0)
+        event = wager.get("event_id") or wager.get("event")
+        market = str(wager.get("market") or "")
+        name = str(wager.get("outcome") or "").strip()
+        home, away = _teams(wager)
+        lowered = name.lower()
+        kind = None
+        if market in SIDE_MARKETS:
+            if name and name == home:
+                kind = "home"
+            elif name and name == away:
+                kind = "away"
+            elif lowered in DRAW_NAMES:
+                kind = "draw"
+        elif market in TOTAL_MARKETS:
+            if lowered == "over":
+                kind = "over"
+            elif lowered == "under":
+                kind = "under"
+        if kind in ("home", "away", "draw"):
+            key = (event, "side")
+            taken = side_taken.setdefault((event, market), [0.0, 0.0])
+            if kind == "home":
+                taken[0] = max(taken[0], prob)
+            elif kind == "away":
+                taken[1] = max(taken[1], prob)
+        elif kind in ("over", "under"):
+            key = (event, "total")
+        else:
+            key = (event, "market", market)
+        rows.append((i, key, kind, prob, stake, dec, (event, market)))
+
+    axis, lo, hi, stake_col, profit, index = [], [], [], [], [], []
+    for i, key, kind, prob, stake, dec, group in rows:
+        a = axis_index.setdefault(key, len(axis_index))
+        if kind in ("home", "over"):
+            start = 0.0
+        elif kind in ("away", "under"):
+            start = 1.0 - prob
+        elif kind == "draw":
+            home_p, away_p = side_taken.get(group, (0.0, 0.0))
+            if home_p > 0:
+                start = home_p
+            elif away_p > 0:
+                start = 1.0 - away_p - prob
+            else:
+                start = (1.0 - prob) / 2.0
+            start = min(max(start, 0.0), 1.0 - prob)
+        else:
+            start = stacked.get(key, 0.0)
+            stacked[key] = start + prob
+        axis.append(a)
+        lo.append(start)
+        hi.append(start + prob)
+        stake_col.append(stake)
+        profit.append(stake * (dec - 1.0))
+        index.append(i)
+    return WagerIntervals(axis, lo, hi, stake_col, profit, len(axis_index), index, list(axis_index))
+
+
+def _uniform_bits(rng: np.random.Generator, shape: Tuple[int, int]) -> np.ndarray:
+    """uint32 uniforms straight from the bit generator (no float conversion)."""
+    count = shape[0] * shape[1]
+    raw = rng.bit_generator.random_raw((count + 1) // 2)
+    return raw.view(np.uint32)[:count].reshape(shape)
+
+
+def simulate_pl(
+    wagers: Sequence[dict],
+    trials: int,
+    rng: Optional[np.random.Generator] = None,
+    dtype=np.float64,
+    chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Optional[SimulationResult]:
+    """Simulate `trials` joint outcomes of `wagers`; None when no wager is valid.
+
+    Trials run in chunks of about ``chunk_elements / wagers``; peak memory
+    beyond the ``trials``-long outputs is a few blocks of that size.
+    `should_stop` is checked between chunks; the run returns None once it
+    is true.
+    """
+    intervals = wager_intervals(wagers)
+    if not len(intervals) or trials <= 0:
+        return None
+    return _simulate_intervals(intervals, trials, rng, dtype, chunk_elements, should_stop)
+
+
+def _simulate_intervals(
+    intervals: WagerIntervals,
+    trials: int,
+    rng: Optional[np.random.Generator] = None,
+    dtype=np.float64,
+    chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Optional[SimulationResult]:
+    rng = rng if rng is not None else np.random.default_rng()
+    trials = int(trials)
+    dtype = np.dtype(dtype)
+    n_wagers = len(intervals)
+    chunk = max(1, int(chunk_elements) // max(n_wagers, intervals.n_axes))
+    lo, width = intervals.thresholds()
+    # a win returns stake + profit on top of the -stake every wager starts from
+    payoff = (intervals.profit + intervals.stake).astype(dtype)
+    identity = intervals.n_axes == n_wagers and bool(np.all(intervals.axis == np.arange(n_wagers)))
+
+    totals = np.empty(trials, dtype=dtype)
+    all_lose = np.empty(trials, dtype=bool)
+    for start in range(0, trials, chunk):
+        if should_stop is not None and should_stop():
+            return None
+        stop = min(start + chunk, trials)
+        bits = _uniform_bits(rng, (stop - start, intervals.n_axes))
+        u = bits if identity else bits[:, intervals.axis]
+        u -= lo
+        returned = (u < width).astype(dtype) @ payoff
+        all_lose[start:stop] = returned == 0
+        np.subtract(returned, intervals.total_stake, out=totals[start:stop])
+    return SimulationResult(totals, all_lose, n_wagers, intervals.total_stake)
+
+
+# Trials per shard. Fixed, not derived from the worker count, so a seed
+# always maps to the same streams.
+SHARD_TRIALS = 1 << 18
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def shard_sizes(trials: int, shard_trials: int = SHARD_TRIALS) -> List[int]:
+    trials = int(trials)
+    shard_trials = max(1, int(shard_trials))
+    sizes = [shard_trials] * (trials // shard_trials)
+    if trials % shard_trials:
+        sizes.append(trials % shard_trials)
+    return sizes
+
+
+def _run_shard(intervals: WagerIntervals, trials: int, seed: np.random.SeedSequence, dtype, chunk_elements: int):
+    result = _simulate_intervals(intervals, trials, np.random.default_rng(seed), dtype, chunk_elements)
+    return result.totals, result.all_lose
+
+
+def _shared_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool reused across runs (spawned workers, safe next to Qt threads)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def simulate_pl_sharded(
+    wagers: Sequence[dict],
+    trials: int,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    dtype=np.float64,
+    chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+    shard_trials: int = SHARD_TRIALS,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Optional[SimulationResult]:
+    """`simulate_pl` split into seeded shards, run on up to `workers` processes.
+
+    ``seed=None`` draws fresh entropy. `workers` defaults to the CPU count;
+    1 (or a single shard) runs in this process. Returns None when no wager
+    is valid or once `should_stop()` is true; shards already running in the
+    pool finish in the background and are discarded.
+    """
+    intervals = wager_intervals(wagers)
+    if not len(intervals) or trials <= 0:
+        return None
+    sizes = shard_sizes(trials, shard_trials)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(int(workers or os.cpu_count() or 1), len(sizes))
+    stopped = should_stop if should_stop is not None else (lambda: False)
+    parts = []
+    if workers <= 1:
+        for size, shard_seed in zip(sizes, seeds):
+            result = _simulate_intervals(
+                intervals, size, np.random.default_rng(shard_seed), dtype, chunk_elements, stopped
+            )
+            if result is None:
+                return None
+            parts.append((result.totals, result.all_lose))
+    else:
+        pool = _shared_pool(workers)
+        futures = [pool.submit(_run_shard, intervals, size, shard_seed, dtype, chunk_elements)
+                   for size, shard_seed in zip(sizes, seeds)]
+        for future in futures:
+            while not wait([future], timeout=0.05).done:
+                if stopped():
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+            parts.append(future.result())
+    totals = np.concatenate([part[0] for part in parts])
+    all_lose = np.concatenate([part[1] for part in parts])
+    return SimulationResult(totals, all_lose, len(intervals), intervals.total_stake)
+
+
+# Exact engine: supports up to this many distinct P/L values are kept exactly;
+# larger slates are convolved on a grid of `DEFAULT_BINS` points.
+EXACT_MAX_SUPPORT = 1 << 16
+DEFAULT_BINS = 1 << 13
+# axes x FFT length above which the caller should sample instead
+MAX_BINNED_COST = 1 << 26
+
+
+class PLDistribution:
+    """Discrete P/L distribution: sorted `values` with probabilities `probs`.
+
+    `mode` is ``"exact"`` (every reachable P/L, merged to 1e-6) or
+    ``"binned"`` (mass split linearly onto an even grid, which preserves
+    the mean). `prob_all_lose` is always exact.
+    """
+
+    __slots__ = ("values", "probs", "mode", "prob_all_lose", "total_stake")
+
+    def __init__(self, values: np.ndarray, probs: np.ndarray, mode: str, prob_all_lose: float, total_stake: float):
+        self.values = values
+        self.probs = probs
+        self.mode = mode
+        self.prob_all_lose = prob_all_lose
+        self.total_stake = total_stake
+
+    def __len__(self) -> int:
+        return int(self.values.size)
+
+    def scaled(self, factor: float) -> "PLDistribution":
+        """The distribution with every stake multiplied by `factor` (e.g. 0.5 Kelly)."""
+        return PLDistribution(self.values * factor, self.probs, self.mode, self.prob_all_lose, self.total_stake * factor)
+
+    def mean(self) -> float:
+        return float(self.values @ self.probs)
+
+    def percentile(self, q: float) -> float:
+        """Smallest value whose cumulative probability reaches `q` percent."""
+        cdf = np.cumsum(self.probs)
+        idx = int(np.searchsorted(cdf, q / 100.0 * cdf[-1] - 1e-12))
+        return float(self.values[min(idx, self.values.size - 1)])
+
+    def prob_below(self, x: float) -> float:
+        return float(self.probs[self.values < x].sum())
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "mean": self.mean(),
+            "median": self.percentile(50),
+            "p5": self.percentile(5),
+            "p95": self.percentile(95),
+            "prob_loss": self.prob_below(-1e-9),
+            "prob_ruin": self.prob_all_lose,
+        }
+
+
+def sample_stats(totals: np.ndarray, all_lose: np.ndarray) -> Dict[str, float]:
+    """`PLDistribution.stats` keys for simulated trials."""
+    p5, median, p95 = np.percentile(totals, [5, 50, 95]).tolist()
+    return {
+        "mean": float(np.mean(totals)),
+        "median": float(median),
+        "p5": float(p5),
+        "p95": float(p95),
+        "prob_loss": float(np.mean(totals < 0)),
+        "prob_ruin": float(np.mean(all_lose)),
+    }
+
+
+def axis_distributions(intervals: WagerIntervals) -> List[Tuple[np.ndarray, np.ndarray, float]]:
+    """Per axis: the P/L of each segment between breakpoints, its probability and P(no win)."""
+    out = []
+    payoff = intervals.profit + intervals.stake
+    order = np.argsort(intervals.axis, kind="stable")
+    bounds = np.searchsorted(intervals.axis[order], np.arange(intervals.n_axes + 1))
+    for a in range(intervals.n_axes):
+        members = order[bounds[a]:bounds[a + 1]]
+        lo = np.clip(intervals.lo[members], 0.0, 1.0)
+        hi = np.clip(intervals.hi[members], 0.0, 1.0)
+        edges = np.unique(np.concatenate(([0.0, 1.0], lo, hi)))
+        widths = np.diff(edges)
+        mids = (edges[:-1] + edges[1:]) / 2.0
+        wins = (mids[:, None] >= lo) & (mids[:, None] < hi)
+        values = wins.astype(np.float64) @ payoff[members] - intervals.stake[members].sum()
+        keep = widths > 0
+        lose_all = float(widths[keep & ~wins.any(axis=1)].sum())
+        out.append((values[keep], widths[keep], lose_all))
+    return out
+
+
+def _merge(values: np.ndarray, probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    keys, inverse = np.unique(np.round(values, 6), return_inverse=True)
+    return keys, np.bincount(inverse.reshape(-1), probs, keys.size)
+
+
+def pl_distribution(
+    wagers: Sequence[dict],
+    max_support: int = EXACT_MAX_SUPPORT,
+    bins: int = DEFAULT_BINS,
+    max_cost: int = MAX_BINNED_COST,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Optional[PLDistribution]:
+    """The P/L distribution of `wagers` without sampling, or None.
+
+    Axes (see the module notes) are independent, so the distribution is
+    the convolution of each axis' few-point distribution. The convolution
+    stays exact while the merged support fits in `max_support`. Past that
+    it is redone on a `bins`-point grid with FFTs. Returns None when no
+    wager is valid or when even the binned convolution would cost more
+    than `max_cost`; the caller should fall back to `simulate_pl` then.
+    Also returns None once `should_stop()` is true (checked per axis).
+    """
+    intervals = wager_intervals(wagers)
+    if not len(intervals):
+        return None
+    axes = axis_distributions(intervals)
+    prob_all_lose = float(np.prod([lose for _, _, lose in axes]))
+
+    values = np.zeros(1)
+    probs = np.ones(1)
+    for axis_values, axis_probs, _ in axes:
+        if should_stop is not None and should_stop():
+            return None
+        if values.size * axis_values.size > max_support:
+            break
+        values, probs = _merge((values[:, None] + axis_values).ravel(), (probs[:, None] * axis_probs).ravel())
+    else:
+        return PLDistribution(values, probs / probs.sum(), "exact", prob_all_lose, intervals.total_stake)
+
+    # Linear splitting sends each axis' mass to floor or floor + 1, so summed
+    # indices reach bins - 1 + len(axes); the FFT must be long enough that
+    # the circular convolution never wraps that top mass onto the low bins.
+    n_fft = 1 << int(np.ceil(np.log2(bins + len(axes))))
+    if len(axes) * n_fft > max_cost:
+        return None
+    base = sum(float(v.min()) for v, _, _ in axes)
+    span = sum(float(v.max() - v.min()) for v, _, _ in axes)
+    step = span / (bins - 1) if span > 0 else 1.0
+    spectrum = np.ones(n_fft // 2 + 1, dtype=np.complex128)
+    for axis_values, axis_probs, _ in axes:
+        if should_stop is not None and should_stop():
+            return None
+        pos = (axis_values - axis_values.min()) / step
+        left = np.floor(pos).astype(np.int64)
+        frac = pos - left
+        kernel = np.bincount(left, axis_probs * (1.0 - frac), n_fft)
+        kernel += np.bincount(left + 1, axis_probs * frac, n_fft)
+        spectrum *= np.fft.rfft(kernel[:n_fft])
+    size = bins + len(axes)
+    mass = np.fft.irfft(spectrum, n_fft)[:size]
+    mass = np.clip(mass, 0.0, None)
+    mass /= mass.sum()
+    grid = base + step * np.arange(size)
+    keep = mass > 1e-15
+    return PLDistribution(grid[keep], mass[keep], "binned", prob_all_lose, intervals.total_stake)
+
+
+# Progressive refinement: the first stage is computed on a small grid (or
+# with a few thousand trials) so the caller has something to draw at once.
+COARSE_SUPPORT = 1 << 10
+COARSE_BINS = 1 << 9
+COARSE_TRIALS = 2_000
+
+
+class PLSummary:
+    """One stage of `pl_stages`: Kelly and half-Kelly stats plus what to plot.
+
+    `values`/`values_half` are distribution points weighted by `weights`
+    (``mode`` ``"exact"`` or ``"binned"``), or raw simulated totals with
+    ``weights`` and ``mode`` None. `final` is False for a coarse stage.
+    """
+
+    __slots__ = ("stats", "stats_half", "values", "values_half", "weights", "mode", "final")
+
+    def __init__(self, stats, stats_half, values, values_half, weights, mode, final):
+        self.stats = stats
+        self.stats_half = stats_half
+        self.values = values
+        self.values_half = values_half
+        self.weights = weights
+        self.mode = mode
+        self.final = final
+
+    @classmethod
+    def from_distribution(cls, dist: PLDistribution, final: bool) -> "PLSummary":
+        half = dist.scaled(0.5)
+        return cls(dist.stats(), half.stats(), dist.values, half.values, dist.probs, dist.mode, final)
+
+    @classmethod
+    def from_simulation(cls, result: SimulationResult, final: bool) -> "PLSummary":
+        totals_half = result.totals * 0.5
+        # Half Kelly halves every stake, so the same trials lose every bet.
+        return cls(
+            sample_stats(result.totals, result.all_lose), sample_stats(totals_half, result.all_lose),
+            result.totals, totals_half, None, None, final,
+        )
+
+
+def pl_stages(
+    wagers: Sequence[dict],
+    trials: int,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    dtype=np.float64,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[PLSummary]:
+    """Yield progressively refined summaries of `wagers`' P/L, ending with a final one.
+
+    Uses the distribution engine when it is affordable (a coarse grid first,
+    then the full one) and Monte Carlo otherwise (`COARSE_TRIALS` first, then
+    `trials`, sharded over `workers` processes with `seed`). Yields nothing
+    when no wager is valid, and stops without a final stage once
+    `should_stop()` is true.
+    """
+    stopped = should_stop if should_stop is not None else (lambda: False)
+    coarse = pl_distribution(wagers, max_support=COARSE_SUPPORT, bins=COARSE_BINS, should_stop=stopped)
+    if coarse is not None:
+        if coarse.mode == "exact":
+            yield PLSummary.from_distribution(coarse, final=True)
+            return
+        yield PLSummary.from_distribution(coarse, final=False)
+    if stopped():
+        return
+    dist = pl_distribution(wagers, should_stop=stopped)
+    if dist is not None:
+        yield PLSummary.from_distribution(dist, final=True)
+        return
+    if stopped() or trials <= 0:
+        return
+    if coarse is None and trials > 2 * COARSE_TRIALS:
+        result = simulate_pl_sharded(wagers, COARSE_TRIALS, seed=seed, workers=1, dtype=dtype, should_stop=stopped)
+        if result is None:
+            return
+        yield PLSummary.from_simulation(result, final=False)
+    result = simulate_pl_sharded(wagers, trials, seed=seed, workers=workers, dtype=dtype, should_stop=stopped)
+    if result is not None:
+        yield PLSummary.from_simulation(result, final=True)
+
+
+# Bankroll paths: quantile levels tracked per slate, and the share of the
+# starting bankroll below which a path counts as ruined (and stops betting).
+PATH_QUANTILES = (5, 25, 50, 75, 95)
+RUIN_FRACTION = 0.1
+
+
+class PathResult:
+    """Total bankroll over `slates` sequential replays of one slate.
+
+    `quantiles[i, t]` is the `levels[i]` percentile of the total bankroll
+    after slate `t` (column 0 is the start). `max_drawdown` is each path's
+    largest fall from its running peak, as a fraction of that peak.
+    `ruin_slate` is the 1-based slate at which a path was ruined, or 0.
+    """
+
+    __slots__ = ("levels", "quantiles", "start", "final", "max_drawdown", "ruin_slate", "ruin_fraction")
+
+    def __init__(self, levels, quantiles, start, final, max_drawdown, ruin_slate, ruin_fraction):
+        self.levels = levels
+        self.quantiles = quantiles
+        self.start = start
+        self.final = final
+        self.max_drawdown = max_drawdown
+        self.ruin_slate = ruin_slate
+        self.ruin_fraction = ruin_fraction
+
+    @property
+    def slates(self) -> int:
+        return int(self.quantiles.shape[1] - 1)
+
+    @property
+    def paths(self) -> int:
+        return int(self.final.size)
+
+    def band(self, level: float) -> np.ndarray:
+        return self.quantiles[list(self.levels).index(level)]
+
+    def prob_ruin(self) -> float:
+        return float(np.mean(self.ruin_slate > 0))
+
+    def survival(self) -> np.ndarray:
+        """Share of paths not yet ruined after each slate (index 0 is the start)."""
+        ruined = np.bincount(self.ruin_slate[self.ruin_slate > 0], minlength=self.slates + 1)
+        return 1.0 - np.cumsum(ruined) / max(self.paths, 1)
+
+    def ruin_slate_percentile(self, q: float) -> Optional[float]:
+        """Percentile of the time to ruin among ruined paths; None if none was."""
+        ruined = self.ruin_slate[self.ruin_slate > 0]
+        return float(np.percentile(ruined, q)) if ruined.size else None
+
+    def stats(self) -> Dict[str, float]:
+        """`PLDistribution.stats` keys for the final P/L, plus drawdown and ruin timing."""
+        pl = self.final - self.start
+        p5, median, p95 = np.percentile(pl, [5, 50, 95]).tolist()
+        dd_median, dd_p95 = np.percentile(self.max_drawdown, [50, 95]).tolist()
+        return {
+            "mean": float(pl.mean()),
+            "median": float(median),
+            "p5": float(p5),
+            "p95": float(p95),
+            "prob_loss": float(np.mean(pl < 0)),
+            "prob_ruin": self.prob_ruin(),
+            "drawdown_median": float(dd_median),
+            "drawdown_p95": float(dd_p95),
+            "ruin_median_slate": self.ruin_slate_percentile(50),
+        }
+
+
+def _path_accounts(wagers: Sequence[dict], intervals: WagerIntervals, bankrolls: Mapping[str, float]):
+    """(fractions, account column per wager, starting bankroll per account).
+
+    A wager's fraction is its stake over its book's bankroll; a book with no
+    bankroll gets one implied by the wager's ``kelly_fraction``. Books in
+    `bankrolls` without wagers are kept so the total includes them.
+    """
+    start: Dict[str, float] = {}
+    for book, value in (bankrolls or {}).items():
+        try:
+            value = float(value or 0)
+        except (TypeError, ValueError):
+            continue
+        if value > 0:
+            start[str(book)] = value
+    fractions, columns = [], []
+    for i, stake in zip(intervals.index, intervals.stake.tolist()):
+        book = str(wagers[i].get("sportsbook") or "")
+        if book not in start:
+            try:
+                kelly = float(wagers[i].get("kelly_fraction") or 0)
+            except (TypeError, ValueError):
+                kelly = 0.0
+            if kelly <= 0:
+                fractions.append(0.0)
+                columns.append(0)
+                continue
+            start[book] = stake / kelly
+        fractions.append(stake / start[book])
+        columns.append(list(start).index(book))
+    return np.asarray(fractions, dtype=np.float64), np.asarray(columns, dtype=np.int64), np.asarray(list(start.values()))
+
+
+def simulate_paths(
+    wagers: Sequence[dict],
+    bankrolls: Mapping[str, float],
+    slates: int,
+    paths: int,
+    stake_scale: float = 1.0,
+    seed: Optional[int] = None,
+    ruin_fraction: float = RUIN_FRACTION,
+    levels: Sequence[float] = PATH_QUANTILES,
+    chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Optional[PathResult]:
+    """Replay `wagers` as `slates` sequential slates on `paths` bankroll paths.
+
+    Stakes compound: each wager bets its current fraction of its account's
+    bankroll, times `stake_scale` (0.5 for half Kelly). An account never
+    stakes more than its whole bankroll on one slate. Outcomes within a slate
+    are correlated exactly as in `simulate_pl`. A path whose total falls
+    below `ruin_fraction` of the start is ruined and stops betting. The same
+    `seed` draws the same outcomes for any `stake_scale`, so Kelly and half
+    Kelly can be compared path by path. Returns None when no wager is valid
+    or once `should_stop()` is true (checked per slate).
+    """
+    intervals = wager_intervals(wagers)
+    if not len(intervals) or slates <= 0 or paths <= 0:
+        return None
+    fractions, columns, start = _path_accounts(wagers, intervals, bankrolls)
+    if not start.size:
+        return None
+    fractions = fractions * float(stake_scale)
+    exposure = np.bincount(columns, fractions, start.size)
+    scale = np.where(exposure > 1.0, 1.0 / np.maximum(exposure, 1e-12), 1.0)
+    fractions = fractions * scale[columns]
+    # growth of each account: 1 - its staked fraction, plus fraction x decimal odds per win
+    base = 1.0 - np.bincount(columns, fractions, start.size)
+    returns = np.zeros((len(intervals), start.size))
+    returns[np.arange(len(intervals)), columns] = fractions * (intervals.profit + intervals.stake) / intervals.stake
+    lo, width = intervals.thresholds()
+
+    paths, slates = int(paths), int(slates)
+    rng = np.random.default_rng(seed)
+    chunk = max(1, int(chunk_elements) // max(len(intervals), intervals.n_axes))
+    balances = np.tile(start, (paths, 1))
+    start_total = float(start.sum())
+    peak = np.full(paths, start_total)
+    max_drawdown = np.zeros(paths)
+    ruin_slate = np.zeros(paths, dtype=np.int64)
+    quantiles = np.empty((len(levels), slates + 1))
+    quantiles[:, 0] = start_total
+    for t in range(1, slates + 1):
+        if should_stop is not None and should_stop():
+            return None
+        for lo_row in range(0, paths, chunk):
+            hi_row = min(lo_row + chunk, paths)
+            u = _uniform_bits(rng, (hi_row - lo_row, intervals.n_axes))[:, intervals.axis]
+            u -= lo
+            growth = base + (u < width) @ returns
+            growth[ruin_slate[lo_row:hi_row] > 0] = 1.0
+            balances[lo_row:hi_row] *= growth
+        total = balances.sum(axis=1)
+        np.maximum(peak, total, out=peak)
+        np.maximum(max_drawdown, 1.0 - total / peak, out=max_drawdown)
+        ruin_slate[(ruin_slate == 0) & (total < ruin_fraction * start_total)] = t
+        quantiles[:, t] = np.percentile(total, levels)
+    return PathResult(tuple(levels), quantiles, start_total, balances.sum(axis=1), max_drawdown, ruin_slate, ruin_fraction)
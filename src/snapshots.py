@@ -0,0 +1,323 @@
+"""Application-wide, versioned odds snapshots shared by every window.
+
+One `SnapshotStore` lives for the whole app. Windows publish the boards they
+fetch and subscribe to each other's updates by reference: a published
+`OddsSnapshot` is never copied, only handed out. The store also owns the odds
+payload caches, so a second board (or the analytics view) opening on a sport
+that is already loaded costs no extra API call.
+
+Snapshots are read-only by contract. The event dicts are shared with the
+publishing window and the odds caches and must not be mutated by anyone:
+boards hydrate copies (`consensus.with_consensus_points`) and keep no-vig
+values in the snapshot's derived arrays, never on the dicts. The columnar
+arrays exposed by `OddsSnapshot.columns` are flagged non-writeable so NumPy
+enforces it for them.
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .ttl_cache import MemoryBudget, TTLCache
+except ImportError:
+    from ttl_cache import MemoryBudget, TTLCache
+
+
+def _frozen(values, dtype) -> np.ndarray:
+    arr = np.asarray(values, dtype=dtype)
+    arr.flags.writeable = False
+    return arr
+
+
+class ColumnarOdds:
+    """Flat, column-per-field layout of every quoted outcome in a snapshot.
+
+    One row per (event, bookmaker, market, outcome). Rows are ordered by
+    event, then bookmaker, then market, so each event and each
+    (event, book, market) group is a contiguous slice: `event_offsets` and
+    `group_offsets` give zero-copy `[start, stop)` bounds.
+
+    Columns: `event`, `book`, `market`, `name` (indices into `event_ids`,
+    `book_keys`, `market_keys`, `names`), `group`, `point` (NaN when absent),
+    `price` (decimal, NaN when invalid) and `prob` (implied, 1 / price).
+    `outcomes` and `markets` hold the source dicts per row and per group.
+    """
+
+    def __init__(self, events: Sequence[dict]):
+        book_index: Dict[str, int] = {}
+        market_index: Dict[str, int] = {}
+        name_index: Dict[str, int] = {}
+        ev_col: List[int] = []
+        book_col: List[int] = []
+        market_col: List[int] = []
+        name_col: List[int] = []
+        group_col: List[int] = []
+        point_col: List[float] = []
+        price_col: List[float] = []
+        group_event: List[int] = []
+        group_book: List[int] = []
+        group_market: List[int] = []
+        self.outcomes: List[dict] = []
+        self.markets: List[dict] = []
+        event_offsets = [0]
+        group_offsets = [0]
+
+        self.event_ids = [str(e.get('id') or f"#{i}") for i, e in enumerate(events)]
+        for ev_idx, event in enumerate(events):
+            for bookmaker in event.get('bookmakers', []) or []:
+                b_idx = book_index.setdefault(bookmaker.get('key'), len(book_index))
+                for market in bookmaker.get('markets', []) or []:
+                    m_idx = market_index.setdefault(market.get('key'), len(market_index))
+                    outcomes = market.get('outcomes', []) or []
+                    if not outcomes:
+                        continue
+                    g_idx = len(group_event)
+                    group_event.append(ev_idx)
+                    group_book.append(b_idx)
+                    group_market.append(m_idx)
+                    self.markets.append(market)
+                    self.outcomes.extend(outcomes)
+                    for outcome in outcomes:
+                        ev_col.append(ev_idx)
+                        book_col.append(b_idx)
+                        market_col.append(m_idx)
+                        name_col.append(name_index.setdefault(str(outcome.get('name') or ''), len(name_index)))
+                        group_col.append(g_idx)
+                        try:
+                            point_col.append(float(outcome.get('point')))
+                        except Exception:
+                            point_col.append(np.nan)
+                        try:
+                            price = float(outcome.get('price'))
+                            price_col.append(price if price > 1.0 else np.nan)
+                        except Exception:
+                            price_col.append(np.nan)
+                    group_offsets.append(len(ev_col))
+            event_offsets.append(len(ev_col))
+
+        self.book_keys = list(book_index)
+        self.market_keys = list(market_index)
+        self.names = list(name_index)
+        self.event = _frozen(ev_col, np.int32)
+        self.book = _frozen(book_col, np.int32)
+        self.market = _frozen(market_col, np.int32)
+        self.name = _frozen(name_col, np.int32)
+        self.group = _frozen(group_col, np.int32)
+        self.point = _frozen(point_col, np.float64)
+        self.price = _frozen(price_col, np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.prob = _frozen(1.0 / self.price, np.float64)
+        self.group_event = _frozen(group_event, np.int32)
+        self.group_book = _frozen(group_book, np.int32)
+        self.group_market = _frozen(group_market, np.int32)
+        self.event_offsets = _frozen(event_offsets, np.int64)
+        self.group_offsets = _frozen(group_offsets, np.int64)
+
+    def __len__(self) -> int:
+        return int(self.price.size)
+
+    @property
+    def n_groups(self) -> int:
+        return int(self.group_event.size)
+
+    @property
+    def n_events(self) -> int:
+        return len(self.event_ids)
+
+    def event_slice(self, event_idx: int) -> slice:
+        return slice(int(self.event_offsets[event_idx]), int(self.event_offsets[event_idx + 1]))
+
+    def group_slice(self, group_idx: int) -> slice:
+        return slice(int(self.group_offsets[group_idx]), int(self.group_offsets[group_idx + 1]))
+
+    def book_id(self, key: str) -> int:
+        """Index of bookmaker `key`, or -1 when absent."""
+        try:
+            return self.book_keys.index(key)
+        except ValueError:
+            return -1
+
+    def market_id(self, key: str) -> int:
+        try:
+            return self.market_keys.index(key)
+        except ValueError:
+            return -1
+
+
+class OddsSnapshot:
+    """An immutable, versioned board: the events plus lazily derived views."""
+
+    __slots__ = ("key", "version", "fetched_at", "events", "_columns", "_derived", "_lock")
+
+    def __init__(
+        self,
+        key: Hashable,
+        version: int,
+        events: Sequence[dict],
+        fetched_at: Optional[float] = None,
+        columns: Optional[ColumnarOdds] = None,
+        derived: Optional[Dict[str, Any]] = None,
+    ):
+        self.key = key
+        self.version = version
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self.events: Tuple[dict, ...] = tuple(events or ())
+        self._columns: Optional[ColumnarOdds] = columns
+        self._derived: Dict[str, Any] = dict(derived or {})
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def columns(self) -> ColumnarOdds:
+        """Columnar view, built once on first access."""
+        if self._columns is None:
+            with self._lock:
+                if self._columns is None:
+                    self._columns = ColumnarOdds(self.events)
+        return self._columns
+
+    def derived(self, name: str, factory: Callable[["OddsSnapshot"], Any]) -> Any:
+        """Compute-once cache for values derived from this snapshot."""
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = factory(self)
+            return self._derived[name]
+
+
+class WagerSet:
+    """Immutable, versioned set of Kelly wagers published by a board."""
+
+    __slots__ = ("source", "version", "wagers")
+
+    def __init__(self, source: Hashable, version: int, wagers: Sequence[dict]):
+        self.source = source
+        self.version = version
+        self.wagers: Tuple[dict, ...] = tuple(wagers or ())
+
+
+Subscriber = Callable[[Any], None]
+
+
+class SnapshotStore:
+    """Process-wide registry of the latest snapshots, wager sets and caches.
+
+    Snapshots age out `snapshot_ttl` seconds after they were fetched (default
+    `stale_ttl`, the oldest odds the caches will serve), and at most
+    `max_snapshots` are kept, so boards viewed long ago do not pin their
+    payloads. Wager sets are kept per publishing `source`.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 12,
+        stale_ttl: float = 300,
+        max_bytes: int = 256 * 1024 * 1024,
+        snapshot_ttl: Optional[float] = None,
+        max_snapshots: int = 64,
+    ):
+        self._lock = threading.RLock()
+        self._versions = itertools.count(1)
+        self._snapshots: Dict[Hashable, OddsSnapshot] = {}
+        self.snapshot_ttl = float(snapshot_ttl if snapshot_ttl is not None else stale_ttl)
+        self.max_snapshots = int(max_snapshots)
+        self._wagers: Dict[Hashable, WagerSet] = {}
+        self._last_wager_source: Optional[Hashable] = None
+        self._snapshot_subscribers: List[Subscriber] = []
+        self._wager_subscribers: List[Subscriber] = []
+        self.budget = MemoryBudget(max_bytes)
+        self.odds_cache = TTLCache(ttl=ttl, stale_ttl=stale_ttl, budget=self.budget, name="odds")
+        self.event_odds_cache = TTLCache(ttl=ttl, stale_ttl=stale_ttl, budget=self.budget, name="event_odds")
+
+    def publish(
+        self,
+        key: Hashable,
+        events: Sequence[dict],
+        fetched_at: Optional[float] = None,
+        columns: Optional[ColumnarOdds] = None,
+        derived: Optional[Dict[str, Any]] = None,
+    ) -> OddsSnapshot:
+        """Store `events` as the latest snapshot for `key` and notify subscribers.
+
+        Republishing the very same payload for a key returns the existing
+        snapshot without bumping its version. `columns` may pass a
+        `ColumnarOdds` already built for `events` so it is not rebuilt, and
+        `derived` pre-seeds `OddsSnapshot.derived` values computed with it.
+        """
+        with self._lock:
+            current = self._snapshots.get(key)
+            if (
+                current is not None
+                and current.fetched_at == fetched_at
+                and len(current.events) == len(events or ())
+                and all(a is b for a, b in zip(current.events, events or ()))
+            ):
+                return current
+            snapshot = OddsSnapshot(key, next(self._versions), events, fetched_at, columns, derived)
+            self._snapshots.pop(key, None)
+            self._snapshots[key] = snapshot
+            self._evict_snapshots()
+            subscribers = list(self._snapshot_subscribers)
+        for callback in subscribers:
+            callback(snapshot)
+        return snapshot
+
+    def _evict_snapshots(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        for key in [k for k, snap in self._snapshots.items() if now - snap.fetched_at >= self.snapshot_ttl]:
+            del self._snapshots[key]
+        while len(self._snapshots) > self.max_snapshots:
+            oldest = min(self._snapshots, key=lambda k: self._snapshots[k].fetched_at)
+            del self._snapshots[oldest]
+
+    def latest(self, key: Hashable) -> Optional[OddsSnapshot]:
+        with self._lock:
+            self._evict_snapshots()
+            return self._snapshots.get(key)
+
+    def snapshots(self) -> List[OddsSnapshot]:
+        with self._lock:
+            self._evict_snapshots()
+            return list(self._snapshots.values())
+
+    def publish_wagers(self, source: Hashable, wagers: Sequence[dict]) -> WagerSet:
+        """Replace `source`'s wager set; unchanged wagers keep their version."""
+        with self._lock:
+            current = self._wagers.get(source)
+            self._last_wager_source = source
+            if current is not None and list(current.wagers) == list(wagers or ()):
+                return current
+            wager_set = WagerSet(source, next(self._versions), wagers)
+            self._wagers[source] = wager_set
+            subscribers = list(self._wager_subscribers)
+        for callback in subscribers:
+            callback(wager_set)
+        return wager_set
+
+    def latest_wagers(self, source: Optional[Hashable] = None) -> Optional[WagerSet]:
+        """`source`'s wager set, or the most recently published one when omitted."""
+        with self._lock:
+            return self._wagers.get(self._last_wager_source if source is None else source)
+
+    def drop_wagers(self, source: Hashable) -> None:
+        with self._lock:
+            self._wagers.pop(source, None)
+            if self._last_wager_source == source:
+                self._last_wager_source = None
+
+    def subscribe(self, callback: Subscriber, wagers: bool = False) -> None:
+        with self._lock:
+            target = self._wager_subscribers if wagers else self._snapshot_subscribers
+            if callback not in target:
+                target.append(callback)
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        with self._lock:
+            for target in (self._snapshot_subscribers, self._wager_subscribers):
+                if callback in target:
+                    target.remove(callback)
@@ -8,26 +8,41 @@ from PyQt6.QtWidgets import (
     QLineEdit, QButtonGroup, QStyledItemDelegate, QStyle, QFileDialog, QStyleOptionViewItem,
     QSlider, QSpinBox, QFrame
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread, QSize, QModelIndex
-from PyQt6.QtGui import QColor, QBrush, QFontMetrics, QPalette, QPainter
+from PyQt6.QtCore import Qt, pyqtSignal, QThread, QSize, QModelIndex, QTimer
+from PyQt6.QtGui import QColor, QBrush, QFontMetrics, QPalette, QPainter, QIntValidator
 import sys
 import csv
 import time
-import re
+import threading
+import secrets
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 import numpy as np
 from the_odds_api import OddsAPI
+from event_registry import EventRegistry
+from snapshots import SnapshotStore, OddsSnapshot, WagerSet
+from ladders import ladder_for
+from devig import devig_snapshot, devig_stage, market_holds
+from pricing import FormatCache
+from kelly import simultaneous_kelly
+from consensus import compute_board, with_consensus_points
+from scanners import scan_middles, scan_snapshots
+from sweep import TopK, board_opportunities, run_sweep
+from clv import CLVTracker
+from weight_fit import PREFS_KEY as FITTED_WEIGHTS_KEY
+from simulation import pl_stages, shutdown_pool, simulate_paths
 from config import (
-    PALETTE, PALETTES, THEODDSAPI_KEY_PROD, ODDS_FORMAT
+    PALETTE, PALETTES, THEODDSAPI_KEY_PROD, ODDS_FORMAT, API_ODDS_FORMAT,
+    ODDS_CACHE_TTL, ODDS_CACHE_STALE_TTL, ODDS_CACHE_MAX_MB, DEVIG_METHOD, DEVIG_MARKET_METHODS,
+    KELLY_MULTIPLIER, KELLY_MAX_BET_FRACTION, KELLY_MAX_BOOK_FRACTION,
+    SWEEP_INTERVAL, SWEEP_TOP_K, SWEEP_MAX_WORKERS, MONTE_CARLO_FLOAT32, MONTE_CARLO_WORKERS,
+    ANALYTICS_DEBOUNCE_MS, PATH_SLATES, PATH_RUIN_FRACTION
 )
 from utils import (
-    kelly_criterion,
     odds_converter,
     set_stylesheet,
     convert_to_eastern,
     fetch_event_ids_for_sports,
-    compute_consensus_point,
     load_user_prefs,
     save_user_prefs,
 )
@@ -43,8 +58,48 @@ def _require_odds_api() -> OddsAPI:
         raise RuntimeError("OddsAPI is not initialized.")
     return odds_api
 
+
+def _cached_get_odds(cache, sport, market, bookmakers, now=None, fetch=None):
+    """`(data, fetched_at, cached)` for one board through the shared odds cache.
+
+    A fresh entry is returned as is; otherwise the board is fetched (with
+    `fetch()` when given, else `get_odds`) and stored. When the fetch is
+    rate limited (429) a stale entry is served instead; any other failure
+    propagates.
+    """
+    cache_key = (sport, market, bookmakers)
+    now = time.time() if now is None else now
+    cached = cache.get_entry(cache_key, now=now)
+    if cached:
+        return cached[0], cached[1], True
+    try:
+        if fetch is not None:
+            response = fetch()
+        else:
+            response = _require_odds_api().get_odds(
+                sport=sport,
+                markets=market,
+                odds_format=API_ODDS_FORMAT,
+                bookmakers=bookmakers
+            )
+    except Exception as e:
+        stale = cache.get_entry(cache_key, allow_stale=True, now=now) if "429" in str(e) else None
+        if stale:
+            return stale[0], stale[1], True
+        raise
+    cache.put(cache_key, response, ts=now)
+    return response, now, False
+
 SPORTSBOOK_HEADER_HEIGHT = 96
 
+# App-wide snapshot store: every window shares its odds caches, published
+# boards and wager sets by reference.
+SNAPSHOT_STORE = SnapshotStore(
+    ttl=ODDS_CACHE_TTL,
+    stale_ttl=ODDS_CACHE_STALE_TTL,
+    max_bytes=ODDS_CACHE_MAX_MB * 1024 * 1024,
+)
+
 
 def _export_table_to_csv(parent: QWidget, table: QTableWidget, default_prefix: str) -> None:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -93,6 +148,119 @@ class EventDetailsDialog(QDialog):
         layout.addWidget(buttons)
 
 
+class ScanResultsDialog(QDialog):
+    """Read-only table of scanner results (arbitrage lines, middles)."""
+
+    def __init__(self, parent=None, title: str = "", summary: str = "", headers=(), rows=()):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setMinimumSize(900, 400)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(summary, self))
+
+        table = QTableWidget(len(rows), len(headers), self)
+        table.setHorizontalHeaderLabels(list(headers))
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                table.setItem(row, col, QTableWidgetItem(value))
+        header = table.horizontalHeader()
+        if header is not None and headers:
+            header.setSectionResizeMode(len(headers) - 1, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(table)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok, self)
+        buttons.accepted.connect(self.accept)
+        layout.addWidget(buttons)
+
+
+class SweepPanel(QDialog):
+    """Live global top-K +EV list fed by a background `SweepWorker`."""
+
+    HEADERS = ["Sport", "Event", "Market", "Outcome", "Book", "Price", "Consensus", "Edge", "Kelly $"]
+
+    def __init__(self, parent, worker: "SweepWorker", sport_title=None, book_title=None, format_price=None):
+        super().__init__(parent)
+        self.setWindowTitle("+EV Sweep")
+        self.setMinimumSize(1000, 500)
+        self.worker = worker
+        self._sport_title = sport_title or (lambda key: key)
+        self._book_title = book_title or (lambda key: key)
+        self._format_price = format_price or (lambda price: f"{price:.2f}")
+        self._boards_done = 0
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Rank by:", self))
+        self.rank_dropdown = QComboBox(self)
+        self.rank_dropdown.addItem("Edge", "edge")
+        self.rank_dropdown.addItem("Kelly $", "kelly_dollars")
+        self.rank_dropdown.currentIndexChanged.connect(self._on_rank_changed)
+        controls.addWidget(self.rank_dropdown)
+        controls.addStretch(1)
+        self.status_label = QLabel("Sweeping...", self)
+        controls.addWidget(self.status_label)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(self.HEADERS), self)
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setSortingEnabled(False)
+        header = self.table.horizontalHeader()
+        if header is not None:
+            header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        worker.board_swept.connect(self._on_board_swept)
+        worker.sweep_finished.connect(self._on_sweep_finished)
+
+    def _on_rank_changed(self, _index):
+        try:
+            self.worker.top.set_rank(self.rank_dropdown.currentData())
+        except Exception as e:
+            print(f"Error changing sweep ranking: {e}")
+        self.render()
+
+    def _on_board_swept(self, sport, market, count):
+        self._boards_done += 1
+        self.status_label.setText(f"{self._sport_title(sport)} {market}: {count} +EV | boards swept: {self._boards_done}")
+        self.render()
+
+    def _on_sweep_finished(self, boards, seconds):
+        self.status_label.setText(
+            f"Swept {boards} boards in {seconds:.1f}s | next sweep in {self.worker.interval:g}s"
+        )
+
+    def render(self):
+        opportunities = self.worker.top.top()
+        self.table.setRowCount(len(opportunities))
+        for row, opp in enumerate(opportunities):
+            event = opp.event or {}
+            title = f"{event.get('away_team', '')} @ {event.get('home_team', '')}".strip(" @") or str(opp.event_id)
+            outcome = str(opp.outcome)
+            if opp.point is not None:
+                outcome += f" {opp.point:g}" if opp.market == "totals" else f" {opp.point:+g}"
+            values = (
+                self._sport_title(opp.sport),
+                title,
+                opp.market,
+                outcome,
+                self._book_title(opp.book),
+                self._format_price(opp.price),
+                f"{opp.consensus:.1%}",
+                f"{opp.edge:.2%}",
+                f"${opp.kelly_dollars:,.2f}",
+            )
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+
+    def closeEvent(self, event):
+        try:
+            self.worker.stop()
+            self.worker.wait(5000)
+        except Exception:
+            pass
+        super().closeEvent(event)
+
+
 class ItemBackgroundDelegate(QStyledItemDelegate):
     """Custom background painting to preserve alternation + allow per-cell overrides."""
     def paint(self, painter: Optional[QPainter], option: QStyleOptionViewItem, index: QModelIndex):
@@ -483,7 +651,6 @@ class SportSelectionWindow(QMainWindow):
         self.current_odds_window = None
         self.futures_odds_window = None
         self.startup_window = None
-        self._event_ids_worker = None
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -562,13 +729,7 @@ class SportSelectionWindow(QMainWindow):
             except Exception:
                 pass
 
-            # start background fetch of event ids for the selected sports
-            try:
-                self._event_ids_worker = EventIdsWorker(_require_odds_api(), non_futures_sports)
-                self._event_ids_worker.finished.connect(self._on_event_ids_fetched)
-                self._event_ids_worker.start()
-            except Exception as e:
-                print(f"Failed to start event id worker: {e}")
+            # CurrentOddsWindow starts its own event id worker and feeds its registry.
 
         self.close()
 
@@ -577,13 +738,6 @@ class SportSelectionWindow(QMainWindow):
         self.startup_window.show()
         self.close()
 
-    def _on_event_ids_fetched(self, mapping):
-        try:
-            if hasattr(self, 'current_odds_window') and self.current_odds_window:
-                self.current_odds_window.set_event_ids_map(mapping)
-        except Exception as e:
-            print(f"Error applying fetched event ids: {e}")
-
 
 class EventIdsWorker(QThread):
     """Background worker to fetch event id mappings for sports."""
@@ -615,6 +769,185 @@ class EventIdsWorker(QThread):
             self.finished.emit({})
 
 
+class CLVResolveWorker(QThread):
+    """Background worker resolving kicked-off bets' closing lines.
+
+    Runs `CLVTracker.resolve`, whose historical-odds calls would otherwise
+    block the board. Emits the number of API calls made.
+    """
+    finished = pyqtSignal(int)
+
+    def __init__(self, tracker: CLVTracker, fetch, sportsbook_weights=None, books=None):
+        super().__init__()
+        self.tracker = tracker
+        self.fetch = fetch
+        self.sportsbook_weights = sportsbook_weights
+        self.books = list(books or [])
+
+    def run(self):
+        calls = 0
+        try:
+            calls = self.tracker.resolve(self.fetch, sportsbook_weights=self.sportsbook_weights, books=self.books)
+        except Exception as e:
+            print(f"Error resolving closing lines: {e}")
+        self.finished.emit(calls)
+
+
+class SweepWorker(QThread):
+    """Background +EV sweep over every selected sport and market.
+
+    Fetches boards concurrently (see `sweep.run_sweep`) and repeats every
+    `interval` seconds until stopped. Only emits signals; never touches widgets.
+    """
+    board_swept = pyqtSignal(str, str, int)
+    sweep_finished = pyqtSignal(int, float)
+
+    def __init__(self, fetch, evaluate, sports, top: TopK, interval=SWEEP_INTERVAL, max_workers=SWEEP_MAX_WORKERS):
+        super().__init__()
+        self.fetch = fetch
+        self.evaluate = evaluate
+        self.sports = list(sports)
+        self.top = top
+        self.interval = interval
+        self.max_workers = max_workers
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _on_board(self, board_key, opportunities):
+        self.board_swept.emit(board_key[0], board_key[1], len(opportunities))
+
+    def run(self):
+        while not self._stop.is_set():
+            start = time.time()
+            try:
+                results = run_sweep(
+                    self.fetch,
+                    self.evaluate,
+                    self.sports,
+                    top=self.top,
+                    max_workers=self.max_workers,
+                    on_board=self._on_board,
+                    should_stop=self._stop.is_set,
+                )
+                self.sweep_finished.emit(len(results), time.time() - start)
+            except Exception as e:
+                print(f"Error sweeping boards: {e}")
+            if self._stop.wait(max(float(self.interval or 0), 1.0)):
+                break
+
+
+def joint_kelly_wagers(wagers: List[dict], bankrolls: Optional[Dict[str, float]] = None) -> List[dict]:
+    """Copies of `wagers` restaked by the simultaneous Kelly optimizer.
+
+    Wagers on the same event and market are mutually exclusive (events are
+    keyed like `simulation.wager_intervals`: `event_id`, else the label);
+    stakes at each book are capped by its bankroll.
+    """
+    if not wagers:
+        return []
+    try:
+        result = simultaneous_kelly(
+            [float(w.get("consensus_probability", 0) or 0) for w in wagers],
+            [float(w.get("odds_decimal", 0) or 0) for w in wagers],
+            groups=[(w.get("event_id") or w.get("event"), w.get("market")) for w in wagers],
+            books=[w.get("sportsbook") for w in wagers],
+            bankrolls=bankrolls or None,
+        )
+    except Exception as e:
+        print(f"Joint Kelly failed: {e}")
+        return list(wagers)
+    joint = []
+    for wager, fraction, stake in zip(wagers, result.fractions.tolist(), result.stakes.tolist()):
+        if stake <= 0:
+            continue
+        restaked = dict(wager)
+        restaked["kelly_fraction"] = fraction
+        restaked["stake"] = stake
+        joint.append(restaked)
+    return joint
+
+
+class SimulationWorker(QThread):
+    """Runs `simulation.pl_stages` for the analytics window off the GUI thread.
+
+    With `joint_kelly` the wagers are first restaked by `joint_kelly_wagers`
+    and emitted through `wagers_ready`. Emits each stage tagged with its
+    `generation` so stale runs can be ignored, then None if nothing could be
+    simulated. `cancel` stops the run at its next chunk boundary.
+    """
+    wagers_ready = pyqtSignal(int, object)
+    stage_ready = pyqtSignal(int, object)
+
+    def __init__(self, generation: int, wagers: List[dict], trials: int, seed: Optional[int] = None,
+                 workers: Optional[int] = None, dtype=np.float64,
+                 bankrolls: Optional[Dict[str, float]] = None, joint_kelly: bool = False):
+        super().__init__()
+        self.generation = generation
+        self.wagers = wagers
+        self.trials = trials
+        self.seed = seed
+        self.workers = workers
+        self.dtype = dtype
+        self.bankrolls = bankrolls
+        self.joint_kelly = joint_kelly
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _stages(self):
+        return pl_stages(
+            self.wagers, self.trials, seed=self.seed, workers=self.workers,
+            dtype=self.dtype, should_stop=self._cancel.is_set,
+        )
+
+    def run(self):
+        emitted = False
+        try:
+            if self.joint_kelly:
+                self.wagers = joint_kelly_wagers(self.wagers, self.bankrolls)
+                if self._cancel.is_set():
+                    return
+                self.wagers_ready.emit(self.generation, self.wagers)
+            for summary in self._stages():
+                if self._cancel.is_set():
+                    return
+                self.stage_ready.emit(self.generation, summary)
+                emitted = True
+        except Exception as e:
+            print(f"Error simulating wagers: {e}")
+        if not emitted and not self._cancel.is_set():
+            self.stage_ready.emit(self.generation, None)
+
+
+class PathSimulationWorker(SimulationWorker):
+    """Bankroll path simulation for the analytics window.
+
+    Emits one ``(kelly, half_kelly)`` pair of `simulation.PathResult`, both
+    drawn from the same seed so the two staking plans see the same outcomes.
+    """
+
+    def __init__(self, generation: int, wagers: List[dict], bankrolls: Dict[str, float], slates: int, paths: int,
+                 seed: Optional[int] = None, ruin_fraction: float = PATH_RUIN_FRACTION, joint_kelly: bool = False):
+        super().__init__(generation, wagers, paths, seed=seed, bankrolls=bankrolls, joint_kelly=joint_kelly)
+        self.slates = slates
+        self.ruin_fraction = ruin_fraction
+
+    def _stages(self):
+        results = []
+        for stake_scale in (1.0, 0.5):
+            result = simulate_paths(
+                self.wagers, self.bankrolls, self.slates, self.trials, stake_scale=stake_scale,
+                seed=self.seed, ruin_fraction=self.ruin_fraction, should_stop=self._cancel.is_set,
+            )
+            if result is None:
+                return
+            results.append(result)
+        yield tuple(results)
+
+
 class OddsWindowMixin:
     selected_sports: List[str]
     current_sport: str
@@ -625,12 +958,16 @@ class OddsWindowMixin:
     _odds_format_map: Dict[str, str]
     odds_format_dropdown: QComboBox
     _display_odds_format: str
-    _api_odds_format: str
+    _format_cache: FormatCache
     _sportsbook_weights: Dict[str, float]
+    _sport_weights: Dict[str, Dict[str, float]]
     table: QTableWidget
     def update_table(self) -> None:
         raise NotImplementedError
 
+    def render_table(self) -> None:
+        raise NotImplementedError
+
     def _build_sport_title_map(self):
         try:
             api = _require_odds_api()
@@ -717,7 +1054,7 @@ class OddsWindowMixin:
             pref_fmt = ODDS_FORMAT if ODDS_FORMAT in ('american', 'decimal', 'probability') else 'american'
 
         self._display_odds_format = pref_fmt
-        self._api_odds_format = pref_fmt if pref_fmt in ('american', 'decimal') else 'decimal'
+        self._format_cache.clear()
 
         if hasattr(self, 'odds_format_dropdown') and hasattr(self, '_odds_format_map'):
             try:
@@ -742,11 +1079,27 @@ class OddsWindowMixin:
         except Exception:
             pass
         self._sportsbook_weights = weights
+        # per-sport weights fitted offline (weight_fit.py) override the global ones
+        self._sport_weights = {}
+        try:
+            by_sport = prefs.get(FITTED_WEIGHTS_KEY) if isinstance(prefs, dict) else None
+            if isinstance(by_sport, dict):
+                for sport, fitted in by_sport.items():
+                    if isinstance(fitted, dict):
+                        self._sport_weights[sport] = {k: float(v) for k, v in fitted.items()}
+        except Exception:
+            pass
+
+    def _weights_for(self, sport: str) -> Dict[str, float]:
+        fitted = self._sport_weights.get(sport)
+        if not fitted:
+            return self._sportsbook_weights
+        return {**self._sportsbook_weights, **fitted}
 
     def _on_odds_format_changed(self, label: str):
         fmt = self._odds_format_map.get(label, 'american')
         self._display_odds_format = fmt
-        self._api_odds_format = fmt if fmt in ('american', 'decimal') else 'decimal'
+        self._format_cache.clear()
         try:
             prefs = load_user_prefs()
             if not isinstance(prefs, dict):
@@ -755,50 +1108,75 @@ class OddsWindowMixin:
             save_user_prefs(prefs)
         except Exception:
             pass
-        self.update_table()
+        # Display format is a pure view transform over canonical prices, so
+        # redraw the cached snapshot instead of refetching from the API.
+        self.render_table()
 
     def _format_odds_value(self, price):
+        """Format a canonical decimal price in the current display format."""
         if price is None:
             return "N/A"
-        api_fmt = self._api_odds_format
-        disp_fmt = self._display_odds_format
-        try:
-            if disp_fmt == api_fmt:
-                if disp_fmt == 'american':
-                    ival = int(round(float(price)))
-                    return f"{ival:+d}" if ival > 0 else f"{ival}"
-                if disp_fmt == 'decimal':
-                    return f"{float(price):.2f}"
-            prob = odds_converter(api_fmt, 'probability', price)
-            if disp_fmt == 'probability':
-                return f"{prob:.1%}"
-            converted = odds_converter('probability', disp_fmt, prob)
-            if disp_fmt == 'american':
-                ival = int(round(float(converted)))
-                return f"{ival:+d}" if ival > 0 else f"{ival}"
-            if disp_fmt == 'decimal':
-                return f"{float(converted):.2f}"
-            return str(converted)
+        try:
+            return self._format_cache.format(float(price), API_ODDS_FORMAT, self._display_odds_format)
         except Exception:
             return str(price)
 
     def _format_probability(self, prob):
         if prob is None:
             return "N/A"
-        disp_fmt = self._display_odds_format
-        try:
-            if disp_fmt == 'probability':
-                return f"{prob:.1%}"
-            converted = odds_converter('probability', disp_fmt, prob)
-            if disp_fmt == 'american':
-                ival = int(round(float(converted)))
-                return f"{ival:+d}" if ival > 0 else f"{ival}"
-            if disp_fmt == 'decimal':
-                return f"{float(converted):.2f}"
-            return str(converted)
+        try:
+            return self._format_cache.format(prob, 'probability', self._display_odds_format)
         except Exception:
             return "N/A"
 
+    def process_odds_data(self, odds_data):
+        """Devig the whole board in one vectorized pass.
+
+        Prices are stored in decimal (``API_ODDS_FORMAT``) and the derived
+        values are format independent, so display toggles never recompute
+        them. Nothing is written onto the events: they may be shared with the
+        odds cache. Returns the columnar view and the derived values (fair
+        probabilities, per-market holds) so the published snapshot reuses them.
+        """
+        return devig_stage(odds_data or [], DEVIG_METHOD, DEVIG_MARKET_METHODS)
+
+    def _published_snapshot(self, odds_data):
+        """The published snapshot if it holds exactly `odds_data`, else None."""
+        snapshot = getattr(self, "_snapshot", None)
+        odds_data = odds_data or []
+        if (
+            snapshot is not None
+            and len(snapshot.events) == len(odds_data)
+            and all(a is b for a, b in zip(snapshot.events, odds_data))
+        ):
+            return snapshot
+        return None
+
+    def _compute_board(self, market_key, fallback_implied=True):
+        """Consensus, edges, best account, Kelly and hold for the whole board."""
+        event_holds = columns = fair = None
+        odds_data = self._last_odds_data or []
+        snapshot = self._published_snapshot(odds_data)
+        if snapshot is not None:
+            # the published snapshot's columns and fair probabilities
+            columns = snapshot.columns
+            fair = devig_snapshot(snapshot, DEVIG_METHOD, DEVIG_MARKET_METHODS)
+            event_holds = market_holds(snapshot).event_hold(market_key)
+        return compute_board(
+            odds_data,
+            market_key,
+            self.display_sportsbooks,
+            list(self.selected_accounts),
+            self._weights_for(self.current_sport),
+            fallback_implied=fallback_implied,
+            kelly_multiplier=KELLY_MULTIPLIER,
+            kelly_max_fraction=KELLY_MAX_BET_FRACTION,
+            kelly_book_cap=KELLY_MAX_BOOK_FRACTION,
+            event_holds=event_holds,
+            columns=columns,
+            fair=fair,
+        )
+
     def _set_last_refresh_label(self):
         try:
             refresh_str = datetime.now().strftime('%I:%M:%S %p')
@@ -813,76 +1191,6 @@ class OddsWindowMixin:
         except Exception:
             pass
 
-    def _select_consensus_outcome(self, market, outcome_name, market_key, consensus_point, favorite=None):
-        if not market or consensus_point is None:
-            return None
-        outcomes = market.get('outcomes', [])
-        if not outcomes:
-            return None
-        try:
-            cp = float(consensus_point)
-        except Exception:
-            return None
-
-        def normalize_name(value):
-            return re.sub(r'[^a-z0-9]+', '', str(value or '').lower())
-
-        tol = 1e-6
-        if market_key == 'totals':
-            target_point = abs(cp)
-            name_lower = (outcome_name or '').lower()
-            target_side = None
-            if 'over' in name_lower:
-                target_side = 'over'
-            elif 'under' in name_lower:
-                target_side = 'under'
-
-            def matches_total(outcome):
-                try:
-                    pval = abs(float(outcome.get('point')))
-                except Exception:
-                    return False
-                return abs(pval - target_point) < tol
-
-            if target_side:
-                for outcome in outcomes:
-                    if target_side in str(outcome.get('name', '')).lower() and matches_total(outcome):
-                        return outcome
-            for outcome in outcomes:
-                if matches_total(outcome):
-                    return outcome
-            return None
-
-        if market_key == 'spreads':
-            target_abs = abs(cp)
-            expected_point = None
-            if favorite and outcome_name:
-                if outcome_name == favorite:
-                    expected_point = -target_abs
-                else:
-                    expected_point = target_abs
-            target_norm = normalize_name(outcome_name)
-
-            def matches_spread(outcome):
-                try:
-                    pval = float(outcome.get('point'))
-                except Exception:
-                    return False
-                if expected_point is not None:
-                    return abs(pval - expected_point) < tol
-                return abs(abs(pval) - target_abs) < tol
-
-            for outcome in outcomes:
-                name_norm = normalize_name(outcome.get('name', ''))
-                if target_norm and name_norm and (target_norm in name_norm or name_norm in target_norm) and matches_spread(outcome):
-                    return outcome
-            for outcome in outcomes:
-                if matches_spread(outcome):
-                    return outcome
-            return None
-
-        return None
-
 
 class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
     def __init__(self, selected_sports, selected_accounts, sportsbook_mapping, display_sportsbooks):
@@ -900,19 +1208,20 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
         self.sportsbook_mapping = sportsbook_mapping
         self.display_sportsbooks = display_sportsbooks
         self._display_odds_format = ODDS_FORMAT
-        self._api_odds_format = ODDS_FORMAT if ODDS_FORMAT in ("american", "decimal") else "decimal"
+        self._format_cache = FormatCache()
         self._sport_title_map = self._build_sport_title_map()
         self._load_sportsbook_weights()
-        self._event_ids_map = {}
-        self._event_row_groups = []
-        self._row_event_map = []
         self._last_odds_data = None
-        self._odds_cache = {}
-        self._odds_cache_ttl = 12
-        self._event_odds_cache = {}
-        self._event_odds_cache_ttl = 12
+        self._snapshot_store = SNAPSHOT_STORE
+        self._snapshot: Optional[OddsSnapshot] = None
+        self._odds_cache = self._snapshot_store.odds_cache
+        self._event_odds_cache = self._snapshot_store.event_odds_cache
+        self._event_registry = EventRegistry(self._event_odds_cache)
         self.sport_selection_window = None
         self.analytics_window = None
+        self.sweep_panel = None
+        self._clv_tracker = CLVTracker()
+        self._clv_worker: Optional[CLVResolveWorker] = None
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -1033,6 +1342,22 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
         self.analytics_button.setToolTip("Open Monte Carlo analytics for current Kelly wagers")
         self.analytics_button.clicked.connect(self.open_analytics)
         quick_actions.addWidget(self.analytics_button)
+        self.arbitrage_button = QPushButton("Arbitrage", self)
+        self.arbitrage_button.setToolTip("Scan every loaded sport for cross-book arbitrage")
+        self.arbitrage_button.clicked.connect(self.open_arbitrage)
+        quick_actions.addWidget(self.arbitrage_button)
+        self.middles_button = QPushButton("Middles", self)
+        self.middles_button.setToolTip("Scan spread/total ladders for middles weighted by key numbers")
+        self.middles_button.clicked.connect(self.open_middles)
+        quick_actions.addWidget(self.middles_button)
+        self.sweep_button = QPushButton("Sweep", self)
+        self.sweep_button.setToolTip("Sweep every selected sport and market in the background for the best +EV bets")
+        self.sweep_button.clicked.connect(self.open_sweep)
+        quick_actions.addWidget(self.sweep_button)
+        self.clv_button = QPushButton("CLV", self)
+        self.clv_button.setToolTip("Closing line value of tracked wagers")
+        self.clv_button.clicked.connect(self.open_clv)
+        quick_actions.addWidget(self.clv_button)
         quick_actions.addStretch(1)
         main_layout.addLayout(quick_actions)
 
@@ -1160,10 +1485,9 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
         self.update_table()
 
     def set_event_ids_map(self, mapping: dict):
-        """Store event id mapping and update UI label."""
+        """Register the per-sport event ids and update UI label."""
         try:
-            self._event_ids_map = mapping or {}
-            total = sum(len(v) for v in self._event_ids_map.values()) if isinstance(self._event_ids_map, dict) else 0
+            total = self._event_registry.set_sport_ids(mapping if isinstance(mapping, dict) else {})
             self.event_ids_status_label.setText(f"Event IDs: {total} loaded")
         except Exception:
             self.event_ids_status_label.setText("Event IDs: Error")
@@ -1182,49 +1506,324 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
         except Exception:
             current_theme = 'dark'
             palette = PALETTE
-        self.analytics_window = AnalyticsWindow(wagers=wagers, theme=current_theme, palette=palette)
+        self.analytics_window = AnalyticsWindow(
+            wagers=wagers,
+            theme=current_theme,
+            palette=palette,
+            store=self._snapshot_store,
+            bankrolls=self.selected_accounts,
+            source=id(self),
+        )
         self.analytics_window.show()
 
-    def _collect_kelly_wagers(self) -> List[dict]:
+    def _scanner_inputs(self):
+        """Published snapshots of every selected sport plus cached alternate ladders (no API calls).
+
+        Only snapshots fetched within `ODDS_CACHE_STALE_TTL` for the current
+        bookmakers are scanned, so old boards cannot pair stale prices with
+        fresh ones into phantom arbs or middles.
+        """
+        bookmakers = ','.join(self.display_sportsbooks)
+        now = time.time()
+        snapshots = [
+            snap for snap in self._snapshot_store.snapshots()
+            if isinstance(snap.key, tuple) and len(snap.key) >= 3
+            and snap.key[0] in self.selected_sports
+            and snap.key[2] == bookmakers
+            and now - snap.fetched_at < ODDS_CACHE_STALE_TTL
+        ]
+        alternate_events = []
+        seen = set()
+        for snap in snapshots:
+            for event in snap.events:
+                event_id = event.get('id')
+                if not event_id or event_id in seen:
+                    continue
+                seen.add(event_id)
+                for alt_key in ('alternate_spreads', 'alternate_totals'):
+                    cached = self._event_odds_cache.get_entry((event_id, alt_key, bookmakers), now=now, count=False)
+                    alt_event = cached[0] if cached else None
+                    if isinstance(alt_event, list):
+                        alt_event = alt_event[0] if alt_event else None
+                    if isinstance(alt_event, dict):
+                        alternate_events.append(alt_event)
+        return snapshots, alternate_events
+
+    def _scan_event_title(self, event, event_id):
+        event = event or {}
+        return f"{event.get('away_team', '')} @ {event.get('home_team', '')}".strip(" @") or str(event_id)
+
+    def _scan_legs_text(self, legs, stakes):
+        parts = []
+        for leg, amount in zip(legs, stakes):
+            book = self.sportsbook_mapping.get(leg["book"], leg["book"])
+            point = leg.get("point")
+            if point is None:
+                line = ""
+            elif leg["outcome"].lower() in ("over", "under"):
+                line = f" {point:g}"
+            else:
+                line = f" {point:+g}"
+            parts.append(f"{leg['outcome']}{line} {self._format_odds_value(leg['price'])} @ {book}: ${amount:,.2f}")
+        return " | ".join(parts)
+
+    def open_arbitrage(self):
+        stake = 100.0
         try:
-            return list(getattr(self, "_latest_wagers", []) or [])
-        except Exception:
-            return []
+            snapshots, alternate_events = self._scanner_inputs()
+            opportunities = scan_snapshots(snapshots, alternate_events)
+        except Exception as e:
+            print(f"Error scanning for arbitrage: {e}")
+            opportunities = []
+        rows = [
+            (
+                self._scan_event_title(opp.event, opp.event_id),
+                opp.market,
+                "" if opp.point is None else f"{opp.point:g}",
+                f"{opp.margin:.2%}",
+                self._scan_legs_text(opp.legs, opp.stakes(stake)),
+            )
+            for opp in opportunities
+        ]
+        ScanResultsDialog(
+            self, "Arbitrage Scanner", f"{len(rows)} opportunities | stakes for ${stake:,.0f} total",
+            ["Event", "Market", "Line", "Margin", "Legs"], rows,
+        ).exec()
+
+    def open_middles(self):
+        stake = 100.0
+        try:
+            snapshots, alternate_events = self._scanner_inputs()
+            middles = scan_middles(snapshots, alternate_events)
+        except Exception as e:
+            print(f"Error scanning for middles: {e}")
+            middles = []
+        rows = [
+            (
+                self._scan_event_title(middle.event, middle.event_id),
+                middle.market,
+                f"{middle.low:g} - {middle.high:g}",
+                f"{middle.hit_probability:.1%}",
+                f"{middle.ev:.2%}",
+                self._scan_legs_text(middle.legs, middle.stakes(stake)),
+            )
+            for middle in middles
+        ]
+        ScanResultsDialog(
+            self, "Middle Scanner", f"{len(rows)} +EV middles | stakes for ${stake:,.0f} total",
+            ["Event", "Market", "Window", "Hit", "EV", "Legs"], rows,
+        ).exec()
+
+    def _sweep_fetch(self, sport, market, bookmakers):
+        """Odds for one swept board through the shared cache (called off the GUI thread)."""
+        return _cached_get_odds(self._odds_cache, sport, market, bookmakers)[0]
+
+    def open_sweep(self):
+        panel = getattr(self, "sweep_panel", None)
+        if panel is not None and panel.isVisible():
+            panel.raise_()
+            return
+        bookmakers = ','.join(self.display_sportsbooks)
+        books = list(self.display_sportsbooks)
+        bankrolls = dict(self.selected_accounts)
+        weights = {sport: dict(self._weights_for(sport)) for sport in self.selected_sports}
+
+        def evaluate(sport, market, payload):
+            # board_opportunities never writes to the shared payload
+            events = payload if isinstance(payload, list) else []
+            return board_opportunities(
+                sport, market, events, books, bankrolls, weights.get(sport),
+                devig_method=DEVIG_METHOD,
+                devig_market_methods=DEVIG_MARKET_METHODS,
+                kelly_multiplier=KELLY_MULTIPLIER,
+                kelly_max_fraction=KELLY_MAX_BET_FRACTION,
+                kelly_book_cap=KELLY_MAX_BOOK_FRACTION,
+            )
+
+        worker = SweepWorker(
+            lambda sport, market: self._sweep_fetch(sport, market, bookmakers),
+            evaluate,
+            self.selected_sports,
+            TopK(SWEEP_TOP_K),
+        )
+        self.sweep_panel = SweepPanel(
+            self,
+            worker,
+            sport_title=self._display_sport_title,
+            book_title=lambda key: self.sportsbook_mapping.get(key, key),
+            format_price=self._format_odds_value,
+        )
+        self.sweep_panel.show()
+        worker.start()
+
+    def closeEvent(self, event):
+        panel = getattr(self, "sweep_panel", None)
+        if panel is not None:
+            panel.close()
+        self._snapshot_store.drop_wagers(id(self))
+        if self._clv_worker is not None:
+            self._clv_worker.wait()
+        super().closeEvent(event)
+
+    def _closing_odds_fetch(self):
+        """Historical-snapshot fetcher bound to the current bookmakers (safe to call off the GUI thread)."""
+        bookmakers = ','.join(self.display_sportsbooks)
+
+        def fetch(sport, date, markets, event_ids):
+            response = _require_odds_api().get_historical_odds(
+                sport=sport,
+                date=date,
+                markets=markets,
+                odds_format=API_ODDS_FORMAT,
+                bookmakers=bookmakers,
+                event_ids=event_ids,
+            )
+            if isinstance(response, dict):
+                return response.get('data') or []
+            return response or []
+
+        return fetch
+
+    def _track_clv(self, odds_data):
+        """Record the board's wagers and take closes near kickoff; resolve kicked-off bets in the background."""
+        try:
+            tracker = self._clv_tracker
+            tracker.record(self._latest_wagers)
+            snapshot = self._published_snapshot(odds_data)
+            fair = devig_snapshot(snapshot, DEVIG_METHOD, DEVIG_MARKET_METHODS) if snapshot is not None else None
+            tracker.close_from_board(
+                odds_data or [],
+                sportsbook_weights=self._weights_for(self.current_sport),
+                books=self.display_sportsbooks,
+                fair=fair,
+            )
+            self._start_clv_resolve()
+        except Exception as e:
+            print(f"Error tracking CLV: {e}")
+
+    def _start_clv_resolve(self) -> bool:
+        """Start a `CLVResolveWorker` if bets are due and none is running."""
+        worker = self._clv_worker
+        if worker is not None and worker.isRunning():
+            return True
+        if not self._clv_tracker.due_batches():
+            return False
+        self._clv_worker = CLVResolveWorker(
+            self._clv_tracker,
+            self._closing_odds_fetch(),
+            sportsbook_weights=self._weights_for(self.current_sport),
+            books=self.display_sportsbooks,
+        )
+        self._clv_worker.start()
+        return True
+
+    def open_clv(self):
+        now = time.time()
+        tracker = self._clv_tracker
+        resolving = self._start_clv_resolve()
+        bets = sorted(tracker.bets.values(), key=lambda b: b.kickoff or 0, reverse=True)
+        rows = []
+        for bet in bets:
+            outcome = str(bet.outcome)
+            if bet.point is not None:
+                outcome += f" {bet.point:g}" if bet.market == "totals" else f" {bet.point:+g}"
+            clv = bet.clv
+            if clv is None:
+                status = "missing" if bet.close_source == "missing" else "pending"
+            else:
+                status = f"{clv:+.2%}" + ("" if bet.is_final(now) else " (live)")
+            rows.append((
+                bet.event or str(bet.event_id),
+                convert_to_eastern(bet.commence_time),
+                outcome,
+                self.sportsbook_mapping.get(bet.book, bet.book),
+                self._format_odds_value(bet.price),
+                self._format_odds_value(bet.closing_price),
+                self._format_probability(bet.consensus),
+                self._format_probability(bet.closing_consensus),
+                status,
+            ))
+        stats = tracker.summary(now)
+        summary = (
+            f"Tracked: {stats['tracked']} | Closed: {stats['closed']} | Mean CLV: {stats['mean_clv']:+.2%} | "
+            f"Stake-weighted CLV: {stats['stake_weighted_clv']:+.2%} | Beat close: {stats['beat_close_rate']:.0%}"
+            + (" | Resolving closes in the background..." if resolving else "")
+        )
+        ScanResultsDialog(
+            self, "Closing Line Value", summary,
+            ["Event", "Start", "Outcome", "Book", "Bet Price", "Close Price", "Bet Consensus", "Close Consensus", "CLV"],
+            rows,
+        ).exec()
+
+    def _collect_kelly_wagers(self) -> Sequence[dict]:
+        """Current wagers by reference from the shared store (no copy)."""
+        wager_set = self._snapshot_store.latest_wagers(id(self))
+        return wager_set.wagers if wager_set is not None else ()
 
     def update_table(self):
         if not hasattr(self, "table"):
             return
-        self.table.clear()
-        self.table.setRowCount(0)
-        # clear cached row->event mapping
-        self._row_event_map = []
-        self._latest_wagers = []
 
         try:
             odds_data = self.fetch_odds_data()
             self._update_live_counts(odds_data)
             odds_data = self._filter_by_live_toggle(odds_data)
-            # cache fetched data for detail views
+            self._event_registry.index_snapshot(odds_data, self.current_sport)
+            # For spreads/totals, compute the mode point and hydrate with alternate
+            # markets on copies: the fetched payload is shared with the odds cache.
+            odds_data = self._prepare_consensus_markets(odds_data)
+            # cache the board for detail views and format-only redraws
             self._last_odds_data = odds_data
-            # For spreads/totals, compute the mode point and hydrate with alternate markets.
-            self._prepare_consensus_markets(odds_data)
 
-            self.process_odds_data(odds_data)
+            columns, derived = self.process_odds_data(odds_data)
+            self._snapshot = self._snapshot_store.publish(
+                (self.current_sport, self._current_market_key(), ','.join(self.display_sportsbooks)),
+                odds_data or [],
+                fetched_at=getattr(self, "_last_odds_snapshot_ts", None),
+                columns=columns,
+                derived=derived,
+            )
+            self.render_table()
+            self._track_clv(odds_data)
+            self.update_requests_remaining()
+            try:
+                self._set_last_refresh_label()
+            except Exception:
+                pass
+
+        except Exception as e:
+            print(f"Error updating table: {e}")
+            try:
+                self.last_refresh_label.setText("Last refresh: error")
+            except Exception:
+                pass
+
+    def render_table(self):
+        """Redraw the board from the last processed snapshot without any API calls."""
+        if not hasattr(self, "table"):
+            return
+        self.table.clear()
+        self.table.setRowCount(0)
+        # clear cached row->event mapping
+        self._event_registry.clear_rows()
+        self._latest_wagers = []
+        odds_data = self._last_odds_data
+
+        try:
             self.add_headers()
-            self._event_row_groups = []
-            for event in odds_data or []:
-                self.populate_table_rows(event)
+            board = self._compute_board(self._current_market_key())
+            for event_index, event in enumerate(odds_data or []):
+                self.populate_table_rows(event, board, event_index)
             try:
                 self._filter_events_list(self.search_input.text())
             except Exception:
                 pass
             try:
                 events_count = len(odds_data or [])
-                outcomes_count = sum(len(rows) for _, rows, _ in getattr(self, "_event_row_groups", []))
+                outcomes_count = self._event_registry.row_count()
                 self.summary_label.setText(f"Events: {events_count} | Outcomes: {outcomes_count}")
             except Exception:
                 pass
-            self.update_requests_remaining()
             try:
                 sportsbook_start = 7
                 for offset, _ in enumerate(self.display_sportsbooks):
@@ -1234,69 +1833,43 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
                 pass
 
             self._apply_row_heights()
-            try:
-                self._set_last_refresh_label()
-            except Exception:
-                pass
-
         except Exception as e:
-            print(f"Error updating table: {e}")
-            try:
-                self.last_refresh_label.setText("Last refresh: error")
-            except Exception:
-                pass
+            print(f"Error rendering table: {e}")
+        self._snapshot_store.publish_wagers(id(self), self._latest_wagers)
 
     def _prepare_consensus_markets(self, odds_data):
+        """The board's events on their consensus lines, hydrated with alternates.
+
+        Events, bookmakers and markets that change are copied (copy-on-write);
+        everything else is shared with `odds_data`, which is left untouched.
+        """
         market_type = self._current_market_key()
         if market_type not in ('spreads', 'totals') or not isinstance(odds_data, list):
-            return
+            return odds_data
 
-        for event in odds_data:
-            if market_type == 'totals':
-                cp, _ = compute_consensus_point(event, 'totals')
-                if cp is not None:
-                    event['_consensus_point'] = cp
-                    event['_spread_method'] = 'consensus'
-            else:
-                cp, fav = compute_consensus_point(event, 'spreads')
-                if cp is not None:
-                    event['_consensus_point'] = cp
-                    event['_consensus_favorite'] = fav
-                    event['_spread_method'] = 'consensus'
+        # one grouped pass over the whole board instead of walking each event
+        events = with_consensus_points(odds_data, market_type)
+        for event, original in zip(events, odds_data):
+            if event is not original:
+                event['_spread_method'] = 'consensus'
 
-        self._apply_consensus_alternates(odds_data, market_type)
+        self._apply_consensus_alternates(events, market_type)
+        return events
 
-    def _filter_alternate_outcomes(self, outcomes, market_key, consensus_point):
+    def _filter_alternate_outcomes(self, alt_market, consensus_point):
+        """Outcomes of an alternate market on the consensus line (binary search)."""
         try:
             target = abs(float(consensus_point))
         except Exception:
             return []
-        tol = 1e-6
-        filtered = []
-        for outcome in outcomes or []:
-            try:
-                pval = float(outcome.get('point'))
-            except Exception:
-                continue
-            if abs(abs(pval) - target) < tol:
-                filtered.append(outcome)
-        return filtered
+        return ladder_for(alt_market).at(target)
 
     def _market_has_consensus_point(self, market, consensus_point):
         try:
             target = abs(float(consensus_point))
         except Exception:
             return False
-        tol = 1e-6
-        matches = 0
-        for outcome in market.get('outcomes', []) if isinstance(market, dict) else []:
-            try:
-                pval = float(outcome.get('point'))
-            except Exception:
-                continue
-            if abs(abs(pval) - target) < tol:
-                matches += 1
-        return matches >= 2
+        return ladder_for(market).count_at(target) >= 2
 
     def _apply_consensus_alternates(self, odds_data, market_key):
         if market_key not in ('spreads', 'totals'):
@@ -1308,29 +1881,30 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
 
         replaced_any = False
         for event in odds_data or []:
+            # only events copied by `with_consensus_points` carry a point
             cp = event.get('_consensus_point')
             if cp is None:
                 continue
             event_id = event.get('id')
             if not event_id:
                 continue
-            cache_key = (event_id, alt_key, self._api_odds_format, bookmakers)
+            cache_key = (event_id, alt_key, bookmakers)
             alt_event = None
-            cached = self._event_odds_cache.get(cache_key)
-            if cached and now - cached.get('ts', 0) < self._event_odds_cache_ttl:
-                alt_event = cached.get('data')
+            cached = self._event_odds_cache.get_entry(cache_key, now=now)
+            if cached:
+                alt_event = cached[0]
             else:
                 try:
                     alt_event = api.get_event_odds(
                         sport=self.current_sport,
                         event_id=event_id,
                         markets=alt_key,
-                        odds_format=self._api_odds_format,
+                        odds_format=API_ODDS_FORMAT,
                         bookmakers=bookmakers,
                     )
                 except Exception:
                     continue
-                self._event_odds_cache[cache_key] = {"ts": now, "data": alt_event}
+                self._event_odds_cache.put(cache_key, alt_event, ts=now)
 
             if isinstance(alt_event, list):
                 alt_event = alt_event[0] if alt_event else None
@@ -1342,7 +1916,8 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
             if not alt_by_key:
                 continue
 
-            for bookmaker in event.get('bookmakers', []):
+            bookmakers = list(event.get('bookmakers', []))
+            for b_idx, bookmaker in enumerate(bookmakers):
                 book_key = bookmaker.get('key')
                 alt_bm = alt_by_key.get(book_key)
                 if not alt_bm:
@@ -1353,27 +1928,28 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
                 alt_market = next((m for m in alt_bm.get('markets', []) if m.get('key') == alt_key), None)
                 if not alt_market:
                     continue
-                filtered_outcomes = self._filter_alternate_outcomes(
-                    alt_market.get('outcomes', []),
-                    market_key,
-                    cp,
-                )
+                filtered_outcomes = self._filter_alternate_outcomes(alt_market, cp)
                 if not filtered_outcomes:
                     continue
 
+                # copy the bookmaker and the market being replaced; the rest is shared
+                markets = list(bookmaker.get('markets', []))
                 replaced = False
-                for market in bookmaker.get('markets', []):
+                for m_idx, market in enumerate(markets):
                     if market.get('key') == market_key:
-                        market['outcomes'] = filtered_outcomes
+                        market = dict(market, outcomes=filtered_outcomes)
                         if alt_market.get('last_update'):
                             market['last_update'] = alt_market.get('last_update')
+                        markets[m_idx] = market
                         replaced = True
                         break
                 if not replaced:
                     new_market = dict(alt_market)
                     new_market['key'] = market_key
                     new_market['outcomes'] = filtered_outcomes
-                    bookmaker.setdefault('markets', []).append(new_market)
+                    markets.append(new_market)
+                bookmakers[b_idx] = dict(bookmaker, markets=markets)
+                event['bookmakers'] = bookmakers
                 replaced_any = True
 
             if replaced_any:
@@ -1382,76 +1958,46 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
     def fetch_odds_data(self):
         market_key = self._current_market_key()
         bookmakers = ','.join(self.display_sportsbooks)
-        cache_key = (self.current_sport, market_key, self._api_odds_format, bookmakers)
         now = time.time()
 
-        cached = self._odds_cache.get(cache_key)
-        if cached and now - cached.get('ts', 0) < self._odds_cache_ttl:
-            self._last_odds_snapshot_ts = cached.get('ts')
-            self._last_odds_snapshot_cached = True
-            return cached.get('data')
-
-        try:
-            if market_key == "h2h_3_way":
+        fetch = None
+        if market_key == "h2h_3_way":
+            def fetch():
                 response = _require_odds_api().get_odds(
                     sport=self.current_sport,
                     markets="h2h",
-                    odds_format=self._api_odds_format,
-                    bookmakers=bookmakers
-                )
-                response = self._hydrate_three_way_markets(response, bookmakers)
-            else:
-                response = _require_odds_api().get_odds(
-                    sport=self.current_sport,
-                    markets=market_key,
-                    odds_format=self._api_odds_format,
+                    odds_format=API_ODDS_FORMAT,
                     bookmakers=bookmakers
                 )
+                return self._hydrate_three_way_markets(response, bookmakers)
+
+        try:
+            response, fetched_at, cached = _cached_get_odds(
+                self._odds_cache, self.current_sport, market_key, bookmakers, now=now, fetch=fetch
+            )
         except Exception as e:
-            msg = str(e)
-            if "429" in msg and cached:
-                self._last_odds_snapshot_ts = cached.get('ts')
-                self._last_odds_snapshot_cached = True
-                return cached.get('data')
-            if "429" in msg and self._last_odds_data is not None:
+            if "429" in str(e) and self._last_odds_data is not None:
                 self._last_odds_snapshot_ts = getattr(self, "_last_odds_snapshot_ts", None)
                 self._last_odds_snapshot_cached = True
                 return self._last_odds_data
             raise
 
         if market_key == "h2h_3_way" and not response:
-            fallback_key = "h2h"
-            fallback_cache_key = (self.current_sport, fallback_key, self._api_odds_format, bookmakers)
-            cached_fallback = self._odds_cache.get(fallback_cache_key)
-            if cached_fallback and now - cached_fallback.get('ts', 0) < self._odds_cache_ttl:
-                try:
-                    self.period_dropdown.setCurrentIndex(0)
-                except Exception:
-                    pass
-                self._last_odds_snapshot_ts = cached_fallback.get('ts')
-                self._last_odds_snapshot_cached = True
-                return cached_fallback.get('data')
-
             try:
-                response = _require_odds_api().get_odds(
-                    sport=self.current_sport,
-                    markets=fallback_key,
-                    odds_format=self._api_odds_format,
-                    bookmakers=bookmakers
+                response, fetched_at, cached = _cached_get_odds(
+                    self._odds_cache, self.current_sport, "h2h", bookmakers, now=now
                 )
                 try:
                     self.period_dropdown.setCurrentIndex(0)
                 except Exception:
                     pass
-                market_key = fallback_key
-                cache_key = fallback_cache_key
             except Exception:
                 pass
 
-        self._odds_cache[cache_key] = {"ts": now, "data": response}
-        self._last_odds_snapshot_ts = now
-        self._last_odds_snapshot_cached = False
-        print(response)
+        self._last_odds_snapshot_ts = fetched_at
+        self._last_odds_snapshot_cached = cached
+        if not cached:
+            print(response)
         return response
 
     def _hydrate_three_way_markets(self, odds_data, bookmakers):
@@ -1466,23 +2012,23 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
             event_id = event.get('id')
             if not event_id:
                 continue
-            cache_key = (event_id, "h2h_3_way", self._api_odds_format, bookmakers)
+            cache_key = (event_id, "h2h_3_way", bookmakers)
             event_odds = None
-            cached = self._event_odds_cache.get(cache_key)
-            if cached and now - cached.get('ts', 0) < self._event_odds_cache_ttl:
-                event_odds = cached.get('data')
+            cached = self._event_odds_cache.get_entry(cache_key, now=now)
+            if cached:
+                event_odds = cached[0]
             else:
                 try:
                     event_odds = api.get_event_odds(
                         sport=self.current_sport,
                         event_id=event_id,
                         markets="h2h_3_way",
-                        odds_format=self._api_odds_format,
+                        odds_format=API_ODDS_FORMAT,
                         bookmakers=bookmakers,
                     )
                 except Exception:
                     continue
-                self._event_odds_cache[cache_key] = {"ts": now, "data": event_odds}
+                self._event_odds_cache.put(cache_key, event_odds, ts=now)
 
             if isinstance(event_odds, list):
                 event_odds = event_odds[0] if event_odds else None
@@ -1502,7 +2048,7 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
                         sport=self.current_sport,
                         event_id=event_id,
                         markets="h2h_3_way",
-                        odds_format=self._api_odds_format,
+                        odds_format=API_ODDS_FORMAT,
                         bookmakers=None,
                     )
                 except Exception:
@@ -1557,19 +2103,6 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
             pass
         self.update_table()
 
-    def process_odds_data(self, odds_data):
-        for event in odds_data:
-            for bookmaker in event['bookmakers']:
-                for market in bookmaker['markets']:
-                    total_prob = sum(
-                        odds_converter(self._api_odds_format, "probability", outcome["price"])
-                        for outcome in market["outcomes"]
-                    )
-                    for outcome in market["outcomes"]:
-                        prob = odds_converter(self._api_odds_format, "probability", outcome["price"])
-                        no_vig_prob = prob / total_prob if total_prob > 0 else 0
-                        outcome["no_vig_price"] = odds_converter("probability", self._api_odds_format, no_vig_prob)
-
     def add_headers(self):
         # Dynamic label: show 'Point' for totals market, 'Spread' for spreads
         point_label = "Point" if self._current_market_key() == 'totals' else "Spread"
@@ -1653,8 +2186,7 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
         """Filter grouped event sections by event header text."""
         try:
             query = (text or "").strip().lower()
-            groups = getattr(self, "_event_row_groups", [])
-            for header_row, rows, label in groups:
+            for header_row, rows, label in self._event_registry.row_groups():
                 hide = bool(query) and query not in label
                 self.table.setRowHidden(header_row, hide)
                 for r in rows:
@@ -1695,8 +2227,9 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
         except Exception:
             pass
 
-    def populate_table_rows(self, event):
-        market_key = self._current_market_key()
+    def populate_table_rows(self, event, board, event_index):
+        """Render one event's rows from precomputed `BoardMatrices` (no math here)."""
+        market_key = board.market_key
 
         home = event.get('home_team') or ''
         away = event.get('away_team') or ''
@@ -1709,18 +2242,10 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
         cp_text = f" • Consensus {cp:+.1f}" if isinstance(cp, (int, float)) else ""
         requery_mark = ""
 
-        # For spreads, iterate by team names to avoid mismatch due to point formatting differences
-        if market_key == 'spreads':
-            outcome_names = [event.get('home_team'), event.get('away_team')]
-        else:
-            # default behavior: use outcomes from first bookmaker/market
-            first_bm = event['bookmakers'][0]
-            first_market = first_bm['markets'][0]
-            outcome_names = [o['name'] for o in first_market.get('outcomes', [])]
-
         outcome_rows = []
         start_row = self.table.rowCount()
-        for idx, outcome_name in enumerate(outcome_names):
+        for idx, board_row in enumerate(board.rows_for(event_index)):
+            outcome_name = board.outcome_names[board_row]
             row = self.table.rowCount()
             self.table.insertRow(row)
             outcome_rows.append(row)
@@ -1729,14 +2254,6 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
             except Exception:
                 pass
 
-
-            try:
-                # map this table row back to the source event id for detail views
-                if not hasattr(self, '_row_event_map') or self._row_event_map is None:
-                    self._row_event_map = []
-                self._row_event_map.append(event.get('id'))
-            except Exception:
-                pass
             # Event column (merged across outcomes)
             if row == start_row:
                 event_item = QTableWidgetItem(f"{event_label} - {event_time}{cp_text}{requery_mark}")
@@ -1786,106 +2303,42 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
                     except Exception:
                         spread_display = str(cp)
 
-            probabilities = []
-            weights = []
-            method_used = event.get('_spread_method', 'native')
-
-            # Compute average market hold across available books for this event/market
-            hold_values = []
-            for bm in event.get('bookmakers', []):
-                market = next((m for m in bm.get('markets', []) if m.get('key') == market_key), None)
-                if not market:
+            for offset, outcome_data in enumerate(board.cells[board_row]):
+                if not outcome_data:
                     continue
-                try:
-                    total_prob = sum(
-                        odds_converter(self._api_odds_format, 'probability', o.get('price'))
-                        for o in market.get('outcomes', [])
-                        if o.get('price') is not None
-                    )
-                    hold_values.append(max(total_prob - 1, 0))
-                except Exception:
-                    continue
-            avg_hold = sum(hold_values) / len(hold_values) if hold_values else None
-
-            for col, bookmaker_key in enumerate(self.display_sportsbooks, start=7):
-                bookmaker = next((b for b in event.get('bookmakers', []) if b.get('key') == bookmaker_key), None)
-                if bookmaker:
-                    market = next((m for m in bookmaker.get('markets', []) if m.get('key') == market_key), None)
-                    if market:
-                        outcome_data = None
-                        consensus_point = event.get('_consensus_point') if market_key in ('spreads', 'totals') else None
-                        consensus_favorite = event.get('_consensus_favorite')
-                        if market_key in ('spreads', 'totals') and consensus_point is not None:
-                            outcome_data = self._select_consensus_outcome(
-                                market,
-                                outcome_name,
-                                market_key,
-                                consensus_point,
-                                consensus_favorite
-                            )
-                        else:
-                            # Try to match by exact name first
-                            outcome_data = next((o for o in market.get('outcomes', []) if o.get('name') == outcome_name), None)
-
-                            # If not found and this is spreads, try to match by team substring
-                            if outcome_data is None and market_key == 'spreads':
-                                outcome_data = next((o for o in market.get('outcomes', []) if outcome_name in o.get('name', '')), None)
-
-                            # If still not found, as a fallback normalize points to nearest 0.5 and pick closest
-                            if outcome_data is None and market_key == 'spreads':
-                                pts = [o for o in market.get('outcomes', []) if 'point' in o and o.get('point') is not None]
-                                if pts:
-                                    outcome_data = pts[0]
-                                    method_used = 'normalized'
-
-                        if outcome_data:
-                            price_display = outcome_data.get('price')
-                            price_text = self._format_odds_value(price_display)
-                            cell_text = str(price_text)
-                            if market_key in ('spreads', 'totals'):
-                                point = outcome_data.get('point')
-                                if point is not None:
-                                    try:
-                                        pval = float(point)
-                                        if market_key == 'spreads':
-                                            point_text = f"{pval:+.1f}" if not pval.is_integer() else f"{pval:+.0f}"
-                                        else:
-                                            pval = abs(pval)
-                                            point_text = f"{pval:.1f}" if not pval.is_integer() else f"{pval:.0f}"
-                                    except Exception:
-                                        point_text = str(point)
-                                    cell_text = f"{point_text}\n{price_text}"
-                            cell_item = QTableWidgetItem(cell_text)
-                            cell_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                            if "\n" in cell_text:
-                                try:
-                                    cell_item.setSizeHint(QSize(0, self._desired_row_height()))
-                                except Exception:
-                                    pass
-                            self.table.setItem(row, col, cell_item)
-
-                            # populate spread_display from the first matching bookmaker outcome that has a 'point'
-                            if spread_display == "" and market_key == 'spreads' and outcome_data.get('point') is not None:
-                                pt = outcome_data.get('point')
-                                # keep sign if present, else show absolute with + for positive
-                                try:
-                                    spread_display = ("+" + str(pt)) if float(pt) > 0 else str(pt)
-                                except Exception:
-                                    spread_display = str(pt)
-
-                            # Use no_vig_price if precomputed, else compute probability directly
-                            no_vig = outcome_data.get('no_vig_price') if 'no_vig_price' in outcome_data else None
-                            if no_vig is not None:
-                                probabilities.append(odds_converter(self._api_odds_format, 'probability', no_vig))
+                col = 7 + offset
+                price_text = self._format_odds_value(outcome_data.get('price'))
+                cell_text = str(price_text)
+                if market_key in ('spreads', 'totals'):
+                    point = outcome_data.get('point')
+                    if point is not None:
+                        try:
+                            pval = float(point)
+                            if market_key == 'spreads':
+                                point_text = f"{pval:+.1f}" if not pval.is_integer() else f"{pval:+.0f}"
                             else:
-                                try:
-                                    prob = odds_converter(self._api_odds_format, 'probability', outcome_data.get('price'))
-                                    probabilities.append(prob)
-                                except Exception:
-                                    pass
+                                pval = abs(pval)
+                                point_text = f"{pval:.1f}" if not pval.is_integer() else f"{pval:.0f}"
+                        except Exception:
+                            point_text = str(point)
+                        cell_text = f"{point_text}\n{price_text}"
+                cell_item = QTableWidgetItem(cell_text)
+                cell_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                if "\n" in cell_text:
+                    try:
+                        cell_item.setSizeHint(QSize(0, self._desired_row_height()))
+                    except Exception:
+                        pass
+                self.table.setItem(row, col, cell_item)
 
-                            weight = self._sportsbook_weights.get(bookmaker_key, 1.0)
-                            weights.append(weight)
+                # populate spread_display from the first matching bookmaker outcome that has a 'point'
+                if spread_display == "" and market_key == 'spreads' and outcome_data.get('point') is not None:
+                    pt = outcome_data.get('point')
+                    # keep sign if present, else show absolute with + for positive
+                    try:
+                        spread_display = ("+" + str(pt)) if float(pt) > 0 else str(pt)
+                    except Exception:
+                        spread_display = str(pt)
 
             # set Spread cell (compact) in column index 2 (Event, Outcome, Spread)
             self.table.setItem(row, 2, QTableWidgetItem(spread_display))
@@ -1897,65 +2350,21 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
             kelly_col = 6
             consensus_col = len(self.display_sportsbooks) + 7
 
-            consensus_probability = None
-            if probabilities and sum(weights) > 0:
-                consensus_probability = sum(p * w for p, w in zip(probabilities, weights)) / sum(weights)
+            consensus_probability = float(board.consensus[board_row])
+            if consensus_probability == consensus_probability:
                 consensus_display = self._format_probability(consensus_probability)
                 self.table.setItem(row, consensus_col, QTableWidgetItem(consensus_display))
             else:
+                consensus_probability = None
                 self.table.setItem(row, consensus_col, QTableWidgetItem("N/A"))
 
-            # Calculate Positive Edge and Kelly Bet based on user-selected sportsbooks
-            best_sportsbook = None
-            best_edge = -float('inf')
-            best_kelly = 0
-            best_price = None
-            best_user_prob = None
-
-            if consensus_probability is not None:
-                for account_key in self.selected_accounts:
-                    user_market = next(
-                        (m for b in event.get('bookmakers', []) if b.get('key') == account_key for m in b.get('markets', []) if m.get('key') == market_key),
-                        None
-                    )
-                    if user_market:
-                        consensus_point = event.get('_consensus_point') if market_key in ('spreads', 'totals') else None
-                        consensus_favorite = event.get('_consensus_favorite')
-                        if market_key in ('spreads', 'totals') and consensus_point is not None:
-                            user_outcome = self._select_consensus_outcome(
-                                user_market,
-                                outcome_name,
-                                market_key,
-                                consensus_point,
-                                consensus_favorite
-                            )
-                        else:
-                            # match user outcome similarly by team
-                            user_outcome = next((o for o in user_market.get('outcomes', []) if o.get('name') == outcome_name), None)
-                            if user_outcome is None and market_key == 'spreads':
-                                user_outcome = next((o for o in user_market.get('outcomes', []) if outcome_name in o.get('name', '')), None)
-                        if user_outcome:
-                            try:
-                                user_probability = odds_converter(self._api_odds_format, 'probability', user_outcome.get('price'))
-                                edge = consensus_probability - user_probability
-                                kelly = kelly_criterion(
-                                    consensus_probability, odds_converter(self._api_odds_format, 'decimal', user_outcome.get('price'))
-                                )
-
-                                if edge > best_edge:
-                                    best_edge = edge
-                                    best_kelly = kelly
-                                    best_sportsbook = account_key
-                                    best_price = user_outcome.get('price')
-                                    best_user_prob = user_probability
-                            except Exception:
-                                continue
-            else:
-                best_edge = 0
-                best_kelly = 0
-                best_sportsbook = None
+            best_sportsbook = board.best_account_key(board_row)
+            best_edge = float(board.best_edge[board_row])
+            best_kelly = float(board.kelly[board_row])
+            best_price = float(board.best_price[board_row]) if best_sportsbook else None
 
-            if avg_hold is not None:
+            avg_hold = float(board.hold[event_index])
+            if avg_hold == avg_hold:
                 self.table.setItem(row, hold_col, QTableWidgetItem(f"{avg_hold:.2%}"))
             else:
                 self.table.setItem(row, hold_col, QTableWidgetItem("N/A"))
@@ -1980,22 +2389,28 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
                     and best_kelly > 0
                     and kelly_amount > 0
                 ):
-                    best_decimal = odds_converter(self._api_odds_format, "decimal", best_price)
-                    best_american = odds_converter(self._api_odds_format, "american", best_price)
+                    best_outcome = board.user_outcomes[board_row][int(board.best_account[board_row])] or {}
                     self._latest_wagers.append({
                         "event": event_label,
+                        "event_id": event.get('id'),
+                        "sport": self.current_sport,
+                        "home_team": home,
+                        "away_team": away,
+                        "commence_time": event.get('commence_time'),
                         "outcome": outcome_name,
                         "market": market_key,
+                        "point": best_outcome.get('point'),
                         "sportsbook": best_sportsbook,
                         "sportsbook_label": self.sportsbook_mapping.get(best_sportsbook, best_sportsbook),
                         "price_raw": best_price,
-                        "odds_decimal": best_decimal,
-                        "odds_american": best_american,
+                        "odds_decimal": best_price,
+                        "odds_american": odds_converter(API_ODDS_FORMAT, "american", best_price),
                         "consensus_probability": consensus_probability,
-                        "user_probability": best_user_prob,
+                        "user_probability": float(board.best_user_probability[board_row]),
                         "edge": best_edge,
                         "kelly_fraction": best_kelly,
                         "stake": kelly_amount,
+                        "hold": avg_hold if avg_hold == avg_hold else None,
                     })
             except Exception:
                 pass
@@ -2027,14 +2442,26 @@ class CurrentOddsWindow(OddsWindowMixin, QMainWindow):
             pass
 
         try:
-            if hasattr(self, "_event_row_groups"):
-                self._event_row_groups.append((start_row, outcome_rows, event_label.lower()))
+            self._event_registry.assign_rows(
+                EventRegistry.event_key(event, event_index),
+                start_row,
+                outcome_rows,
+                event_label.lower(),
+            )
         except Exception:
             pass
 
 
 class AnalyticsWindow(QMainWindow):
-    def __init__(self, wagers: Optional[List[dict]] = None, theme: str = 'dark', palette: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        wagers: Optional[Sequence[dict]] = None,
+        theme: str = 'dark',
+        palette: Optional[Dict[str, str]] = None,
+        store: Optional[SnapshotStore] = None,
+        bankrolls: Optional[Dict[str, float]] = None,
+        source: Optional[int] = None,
+    ):
         super().__init__()
         self.setWindowTitle("Analytics")
         self.setGeometry(120, 120, 1100, 700)
@@ -2043,7 +2470,10 @@ class AnalyticsWindow(QMainWindow):
         except Exception:
             pass
 
-        self.wagers = wagers or []
+        self.wagers: Sequence[dict] = wagers or ()
+        self._store = store
+        self._source = source
+        self.bankrolls = dict(bankrolls or {})
         self.current_theme = theme
         self.palette_colors = palette or PALETTES.get(theme, PALETTE)
 
@@ -2071,11 +2501,18 @@ class AnalyticsWindow(QMainWindow):
 
         trials_label = QLabel("Trials", self)
         self.trials_input = QSpinBox(self)
-        self.trials_input.setRange(100, 200000)
+        self.trials_input.setRange(100, 10000000)
         self.trials_input.setSingleStep(1000)
         self.trials_input.setValue(10000)
         self.trials_input.setMinimumWidth(110)
 
+        seed_label = QLabel("Seed", self)
+        self.seed_input = QLineEdit(self)
+        self.seed_input.setPlaceholderText("random")
+        self.seed_input.setValidator(QIntValidator(0, 2**31 - 1, self))
+        self.seed_input.setMaximumWidth(110)
+        self.seed_input.setToolTip("Fix the Monte Carlo seed to reproduce a run; leave blank for a new one each time.")
+
         min_kelly_label = QLabel("Min Kelly ($)", self)
         self.min_kelly_slider = QSlider(Qt.Orientation.Horizontal, self)
         self.min_kelly_slider.setRange(0, 500)
@@ -2100,10 +2537,33 @@ class AnalyticsWindow(QMainWindow):
         self.max_odds_value = QLabel("+1000", self)
         self.max_odds_value.setMinimumWidth(44)
 
+        self.joint_kelly_checkbox = QCheckBox("Joint Kelly", self)
+        self.joint_kelly_checkbox.setToolTip(
+            "Size all wagers together (max expected log growth), respecting "
+            "same-event exclusivity and each book's bankroll."
+        )
+
+        self.view_combo = QComboBox(self)
+        self.view_combo.addItems(["Single slate", "Bankroll paths"])
+        self.view_combo.setToolTip(
+            "Bankroll paths replays the slate repeatedly with compounding stakes; "
+            "Trials is then the number of paths."
+        )
+        slates_label = QLabel("Slates", self)
+        self.slates_input = QSpinBox(self)
+        self.slates_input.setRange(1, 1000)
+        self.slates_input.setValue(PATH_SLATES)
+        self.slates_input.setEnabled(False)
+
         self.recompute_button = QPushButton("Recompute", self)
 
         filters_layout.addWidget(trials_label)
         filters_layout.addWidget(self.trials_input)
+        filters_layout.addWidget(seed_label)
+        filters_layout.addWidget(self.seed_input)
+        filters_layout.addWidget(self.view_combo)
+        filters_layout.addWidget(slates_label)
+        filters_layout.addWidget(self.slates_input)
         filters_layout.addWidget(min_kelly_label)
         filters_layout.addWidget(self.min_kelly_slider)
         filters_layout.addWidget(self.min_kelly_value)
@@ -2114,6 +2574,7 @@ class AnalyticsWindow(QMainWindow):
         filters_layout.addWidget(self.max_odds_slider)
         filters_layout.addWidget(self.max_odds_value)
         filters_layout.addStretch(1)
+        filters_layout.addWidget(self.joint_kelly_checkbox)
         filters_layout.addWidget(self.recompute_button)
         main_layout.addWidget(filters_box)
 
@@ -2131,6 +2592,10 @@ class AnalyticsWindow(QMainWindow):
         self.plot_widget.setLabel('left', 'Frequency')
         left_layout.addWidget(self.plot_widget, 3)
 
+        self.path_stats_label = QLabel("", self)
+        self.path_stats_label.setVisible(False)
+        left_layout.addWidget(self.path_stats_label)
+
         wagers_label = QLabel("Wagers Included", self)
         wagers_label.setStyleSheet("font-weight:700;")
         left_layout.addWidget(wagers_label)
@@ -2249,6 +2714,17 @@ class AnalyticsWindow(QMainWindow):
         stats_layout.addStretch(1)
         content_layout.addWidget(stats_panel, 1)
 
+        # Filter changes restart the debounce timer; the simulation itself runs
+        # on a SimulationWorker so dragging a slider never blocks the GUI thread.
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(ANALYTICS_DEBOUNCE_MS)
+        self._refresh_timer.timeout.connect(self._refresh_stats)
+        self._sim_generation = 0
+        self._sim_seed: Optional[int] = None
+        self._sim_worker: Optional[SimulationWorker] = None
+        self._sim_workers: set = set()
+
         self._wire_filter_labels()
         self._wire_filter_updates()
         self._sync_slider_ranges()
@@ -2261,6 +2737,26 @@ class AnalyticsWindow(QMainWindow):
         button_layout.addWidget(self.close_button)
         main_layout.addLayout(button_layout)
 
+        if self._store is not None:
+            self._store.subscribe(self._on_wagers_published, wagers=True)
+
+    def _on_wagers_published(self, wager_set: WagerSet) -> None:
+        """Follow the board: re-run analytics when it publishes new wagers."""
+        if wager_set.source != self._source or wager_set.wagers is self.wagers:
+            return
+        self.wagers = wager_set.wagers
+        self._sync_slider_ranges()
+        self._refresh_stats()
+
+    def closeEvent(self, event):
+        if self._store is not None:
+            self._store.unsubscribe(self._on_wagers_published)
+        self._refresh_timer.stop()
+        for worker in list(self._sim_workers):
+            worker.cancel()
+            worker.wait()
+        super().closeEvent(event)
+
     def _apply_stats_panel_style(self, stats_panel: QFrame) -> None:
         """Apply theme-aware styling to the statistics summary panel."""
         if self.current_theme == 'light':
@@ -2419,12 +2915,24 @@ class AnalyticsWindow(QMainWindow):
         self.max_odds_slider.valueChanged.connect(_set_max_odds)
 
     def _wire_filter_updates(self):
-        self.min_kelly_slider.valueChanged.connect(lambda _: self._refresh_stats())
-        self.min_odds_slider.valueChanged.connect(lambda _: self._refresh_stats())
-        self.max_odds_slider.valueChanged.connect(lambda _: self._refresh_stats())
-        self.trials_input.valueChanged.connect(lambda _: self._refresh_stats())
+        self.min_kelly_slider.valueChanged.connect(lambda _: self._refresh_timer.start())
+        self.min_odds_slider.valueChanged.connect(lambda _: self._refresh_timer.start())
+        self.max_odds_slider.valueChanged.connect(lambda _: self._refresh_timer.start())
+        self.trials_input.valueChanged.connect(lambda _: self._refresh_timer.start())
+        self.seed_input.editingFinished.connect(self._refresh_timer.start)
+        self.view_combo.currentIndexChanged.connect(self._on_view_changed)
+        self.slates_input.valueChanged.connect(lambda _: self._refresh_timer.start())
+        self.joint_kelly_checkbox.toggled.connect(lambda _: self._refresh_timer.start())
         self.recompute_button.clicked.connect(self._refresh_stats)
 
+    def _paths_view(self) -> bool:
+        return self.view_combo.currentIndex() == 1
+
+    def _on_view_changed(self, _index: int):
+        self.slates_input.setEnabled(self._paths_view())
+        self.path_stats_label.setVisible(self._paths_view())
+        self._refresh_timer.start()
+
     def _sync_slider_ranges(self):
         max_kelly = 0
         min_odds = None
@@ -2499,9 +3007,24 @@ class AnalyticsWindow(QMainWindow):
             return "N/A"
 
     def _refresh_stats(self):
+        self._refresh_timer.stop()
         wagers = self._filtered_wagers()
+        # Joint Kelly restakes on the simulation worker, which hands the
+        # restaked wagers back through `_on_wagers_restaked`.
+        joint_kelly = self.joint_kelly_checkbox.isChecked()
+        if not joint_kelly or not wagers:
+            self._show_wagers(wagers)
+        self._run_simulation(wagers, joint_kelly=joint_kelly)
+
+    def _on_wagers_restaked(self, generation: int, wagers: List[dict]):
+        if generation == self._sim_generation:
+            self._show_wagers(wagers)
+
+    def _show_wagers(self, wagers: List[dict]):
+        """Wager count, total stake, market/book breakdowns and the wagers table."""
         total_stake = 0.0
         market_counts: Dict[str, int] = {}
+        holds_by_market: Dict[str, List[float]] = {}
         book_counts: Dict[str, int] = {}
         for wager in wagers:
             try:
@@ -2511,6 +3034,8 @@ class AnalyticsWindow(QMainWindow):
             try:
                 market = str(wager.get("market", "Unknown"))
                 market_counts[market] = market_counts.get(market, 0) + 1
+                if wager.get("hold") is not None:
+                    holds_by_market.setdefault(market, []).append(float(wager["hold"]))
             except Exception:
                 pass
             try:
@@ -2525,20 +3050,17 @@ class AnalyticsWindow(QMainWindow):
         total_label, total_half_label = self.stats_labels["Total Stake"]
         total_label.setText(self._format_money(total_stake))
         total_half_label.setText(self._format_money(total_stake * 0.5))
-        for stat_key in ("Mean P/L", "Median P/L", "5th %ile", "95th %ile", "Prob. Loss", "Prob. Total Ruin"):
-            k_label, h_label = self.stats_labels[stat_key]
-            k_label.setText("N/A")
-            h_label.setText("N/A")
-        self.market_breakdown.setPlainText(
-            "\n".join([f"{k}: {v}" for k, v in sorted(market_counts.items(), key=lambda x: (-x[1], x[0]))])
-            or "No wagers yet."
-        )
+        market_lines = []
+        for k, v in sorted(market_counts.items(), key=lambda x: (-x[1], x[0])):
+            holds = holds_by_market.get(k)
+            hold_text = f" (avg hold {sum(holds) / len(holds):.2%})" if holds else ""
+            market_lines.append(f"{k}: {v}{hold_text}")
+        self.market_breakdown.setPlainText("\n".join(market_lines) or "No wagers yet.")
         self.book_breakdown.setPlainText(
             "\n".join([f"{k}: {v}" for k, v in sorted(book_counts.items(), key=lambda x: (-x[1], x[0]))])
             or "No wagers yet."
         )
         self._refresh_wagers_table(wagers)
-        self._run_simulation(wagers)
 
     def _refresh_wagers_table(self, wagers: List[dict]):
         self.wagers_table.setRowCount(0)
@@ -2569,60 +3091,100 @@ class AnalyticsWindow(QMainWindow):
             self.wagers_table.setSpan(row, 0, 1, 5)
             self.wagers_table.setItem(row, 0, note)
 
-    def _run_simulation(self, wagers: List[dict]):
+    def _run_simulation(self, wagers: List[dict], joint_kelly: bool = False):
+        """Simulate `wagers` on a worker, cancelling any run still in flight.
+
+        The previous results stay on screen until the new run's coarse stage
+        arrives, so the panel does not flicker while a slider is dragged.
+        """
+        if self._sim_worker is not None:
+            self._sim_worker.cancel()
+            self._sim_worker = None
+        self._sim_generation += 1
         trials = int(self.trials_input.value())
         if not wagers or trials <= 0:
-            self.plot_widget.clear()
-            self.plot_widget.setTitle("Simulated P/L Distribution")
-            self._set_outlook_badge(None)
+            self._clear_simulation()
             return
+        # A blank seed still gets a concrete one, shown with the results so the
+        # run can be reproduced.
+        seed_text = self.seed_input.text().strip()
+        self._sim_seed = int(seed_text) if seed_text else secrets.randbits(31)
+        if self._paths_view():
+            worker = PathSimulationWorker(
+                self._sim_generation,
+                [dict(w) for w in wagers],
+                dict(self.bankrolls),
+                int(self.slates_input.value()),
+                trials,
+                seed=self._sim_seed,
+                joint_kelly=joint_kelly,
+            )
+        else:
+            worker = SimulationWorker(
+                self._sim_generation,
+                [dict(w) for w in wagers],
+                trials,
+                seed=self._sim_seed,
+                workers=MONTE_CARLO_WORKERS or None,
+                dtype=np.float32 if MONTE_CARLO_FLOAT32 else np.float64,
+                bankrolls=dict(self.bankrolls),
+                joint_kelly=joint_kelly,
+            )
+        worker.wagers_ready.connect(self._on_wagers_restaked)
+        worker.stage_ready.connect(self._on_simulation_stage)
+        worker.finished.connect(lambda w=worker: self._sim_workers.discard(w))
+        self._sim_workers.add(worker)
+        self._sim_worker = worker
+        worker.start()
+
+    def _clear_simulation(self):
+        for stat_key in ("Mean P/L", "Median P/L", "5th %ile", "95th %ile", "Prob. Loss", "Prob. Total Ruin"):
+            k_label, h_label = self.stats_labels[stat_key]
+            k_label.setText("N/A")
+            h_label.setText("N/A")
+        self.path_stats_label.setText("")
+        self.plot_widget.clear()
+        self.plot_widget.setTitle("Simulated P/L Distribution")
+        self._set_outlook_badge(None)
 
-        totals_kelly = np.zeros(trials, dtype=float)
-        all_lose_mask = np.ones(trials, dtype=bool)
-        rng = np.random.default_rng()
-        valid_wagers = 0
-        total_valid_stake = 0.0
-
-        for wager in wagers:
-            try:
-                prob = float(wager.get("consensus_probability", 0))
-                stake = float(wager.get("stake", 0))
-                dec = float(wager.get("odds_decimal", 0))
-            except Exception:
-                continue
-            if stake <= 0 or dec <= 1 or prob <= 0:
-                continue
-            if prob > 1:
-                prob = 1.0
-            valid_wagers += 1
-            total_valid_stake += stake
-            win_profit = stake * (dec - 1.0)
-            wins = rng.random(trials) < prob
-            totals_kelly += np.where(wins, win_profit, -stake)
-            all_lose_mask &= ~wins
-
-        if valid_wagers == 0:
-            self.plot_widget.clear()
-            self.plot_widget.setTitle("Simulated P/L Distribution")
-            self._set_outlook_badge(None)
+    def _on_simulation_stage(self, generation: int, summary):
+        if generation != self._sim_generation:
             return
+        if summary is None:
+            self._clear_simulation()
+        elif isinstance(summary, tuple):
+            self._show_paths(*summary)
+        else:
+            self._show_simulation(summary)
 
-        totals_half = totals_kelly * 0.5
-
-        mean_val = float(np.mean(totals_kelly))
-        median_val = float(np.median(totals_kelly))
-        p5 = float(np.percentile(totals_kelly, 5))
-        p95 = float(np.percentile(totals_kelly, 95))
-        prob_loss = float(np.mean(totals_kelly < 0))
+    def _show_simulation(self, summary):
+        self._show_stats(summary.stats, summary.stats_half)
+        self._render_histogram(
+            summary.values, summary.values_half, summary.weights, summary.mode, refining=not summary.final
+        )
+        self._set_outlook_badge(summary.stats["mean"], summary.stats["median"], summary.stats["prob_loss"])
+
+    def _show_paths(self, kelly, half):
+        """Final-bankroll P/L in the stats panel, drawdown/ruin below the fan chart."""
+        stats_kelly, stats_half = kelly.stats(), half.stats()
+        self._show_stats(stats_kelly, stats_half)
+        lines = []
+        for label, stats in (("Kelly", stats_kelly), ("1/2 Kelly", stats_half)):
+            ruin_slate = stats["ruin_median_slate"]
+            ruin_text = f"median ruin at slate {ruin_slate:.0f}" if ruin_slate is not None else "no ruined paths"
+            lines.append(
+                f"{label}: max drawdown median {stats['drawdown_median']:.1%}, 95th %ile {stats['drawdown_p95']:.1%}; "
+                f"P(ruin) {stats['prob_ruin']:.2%}, {ruin_text}"
+            )
+        self.path_stats_label.setText("\n".join(lines))
+        self._render_fan_chart(kelly, half)
+        self._set_outlook_badge(stats_kelly["mean"], stats_kelly["median"], stats_kelly["prob_loss"])
 
-        mean_half = float(np.mean(totals_half))
-        median_half = float(np.median(totals_half))
-        p5_half = float(np.percentile(totals_half, 5))
-        p95_half = float(np.percentile(totals_half, 95))
-        prob_loss_half = float(np.mean(totals_half < 0))
-        ruin_kelly = float(np.mean(all_lose_mask))
-        # All bets losing implies the floor P/L outcome in each staking scheme.
-        ruin_half = float(np.mean(np.isclose(totals_half, -0.5 * total_valid_stake, rtol=0.0, atol=1e-9)))
+    def _show_stats(self, stats_kelly: Dict[str, float], stats_half: Dict[str, float]):
+        mean_val, median_val, p5, p95 = (stats_kelly[k] for k in ("mean", "median", "p5", "p95"))
+        prob_loss, ruin_kelly = stats_kelly["prob_loss"], stats_kelly["prob_ruin"]
+        mean_half, median_half, p5_half, p95_half = (stats_half[k] for k in ("mean", "median", "p5", "p95"))
+        prob_loss_half, ruin_half = stats_half["prob_loss"], stats_half["prob_ruin"]
 
         self.stats_labels["Mean P/L"][0].setText(self._format_money(mean_val))
         self.stats_labels["Median P/L"][0].setText(self._format_money(median_val))
@@ -2653,14 +3215,21 @@ class AnalyticsWindow(QMainWindow):
             ruin_half,
         )
 
-        self._render_histogram(totals_kelly, totals_half)
-        self._set_outlook_badge(mean_val, median_val, prob_loss)
-
-    def _render_histogram(self, totals_kelly: np.ndarray, totals_half: np.ndarray):
+    def _render_histogram(
+        self,
+        totals_kelly: np.ndarray,
+        totals_half: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        mode: Optional[str] = None,
+        refining: bool = False,
+    ):
+        """Histogram + smoothed curve of simulated totals, or of a weighted exact distribution."""
         self.plot_widget.clear()
+        self.plot_widget.setLabel('bottom', 'Total Profit / Loss')
+        self.plot_widget.setLabel('left', 'Frequency' if weights is None else 'Probability')
         bins = 60
-        hist_kelly, edges = np.histogram(totals_kelly, bins=bins)
-        hist_half, _ = np.histogram(totals_half, bins=edges) if totals_half.size else (np.zeros_like(hist_kelly), edges)
+        hist_kelly, edges = np.histogram(totals_kelly, bins=bins, weights=weights)
+        hist_half, _ = np.histogram(totals_half, bins=edges, weights=weights) if totals_half.size else (np.zeros_like(hist_kelly), edges)
         if hist_kelly.size == 0 and hist_half.size == 0:
             return
 
@@ -2697,7 +3266,12 @@ class AnalyticsWindow(QMainWindow):
 
         def _plot_kde(hist: np.ndarray, totals: np.ndarray, color: QColor) -> None:
             try:
-                sigma = max(np.std(totals) * 0.25, 1e-6)
+                if weights is None:
+                    spread = np.std(totals)
+                else:
+                    mu = np.average(totals, weights=weights)
+                    spread = np.sqrt(np.average((totals - mu) ** 2, weights=weights))
+                sigma = max(spread * 0.25, 1e-6)
                 kde = np.zeros_like(grid)
                 for c, h in zip(centers, hist):
                     if h <= 0:
@@ -2722,7 +3296,40 @@ class AnalyticsWindow(QMainWindow):
         if totals_half.size:
             _plot_kde(hist_half, totals_half, half_color.lighter(130))
 
-        self.plot_widget.setTitle(f"Simulated P/L Distribution (Kelly vs 1/2 Kelly, n={len(totals_kelly):,})")
+        suffix = " - refining..." if refining else ""
+        if mode is not None:
+            self.plot_widget.setTitle(f"P/L Distribution (Kelly vs 1/2 Kelly, {mode}){suffix}")
+        else:
+            self.plot_widget.setTitle(
+                f"Simulated P/L Distribution (Kelly vs 1/2 Kelly, n={len(totals_kelly):,}, seed={self._sim_seed}){suffix}"
+            )
+
+    def _render_fan_chart(self, kelly, half):
+        """Total bankroll by slate: 5-95 and 25-75 percentile bands plus the median."""
+        self.plot_widget.clear()
+        self.plot_widget.setLabel('bottom', 'Slate')
+        self.plot_widget.setLabel('left', 'Total Bankroll ($)')
+        kelly_color = self.palette().color(QPalette.ColorRole.Highlight)
+        half_color = self.palette().color(QPalette.ColorRole.Link)
+        if half_color == kelly_color:
+            half_color = kelly_color.lighter(140)
+
+        x = np.arange(kelly.slates + 1)
+        for result, color in ((half, half_color), (kelly, kelly_color)):
+            for lo_q, hi_q, alpha in ((5, 95, 50), (25, 75, 90)):
+                fill = pg.FillBetweenItem(
+                    pg.PlotDataItem(x, result.band(lo_q)),
+                    pg.PlotDataItem(x, result.band(hi_q)),
+                    brush=pg.mkBrush(QColor(color.red(), color.green(), color.blue(), alpha)),
+                )
+                self.plot_widget.addItem(fill)
+            self.plot_widget.plot(x, result.band(50), pen=pg.mkPen(color.lighter(130), width=2))
+        self.plot_widget.addItem(
+            pg.InfiniteLine(pos=kelly.start, angle=0, pen=pg.mkPen(self.palette().color(QPalette.ColorRole.Text), width=1))
+        )
+        self.plot_widget.setTitle(
+            f"Bankroll Paths (Kelly vs 1/2 Kelly, {kelly.paths:,} paths x {kelly.slates} slates, seed={self._sim_seed})"
+        )
 
     def _set_outlook_badge(self, mean_val: Optional[float], median_val: Optional[float] = None, prob_loss: Optional[float] = None):
         if mean_val is None or median_val is None or prob_loss is None:
@@ -2837,12 +3444,14 @@ class FuturesOddsWindow(OddsWindowMixin, QMainWindow):
         self.sportsbook_mapping = sportsbook_mapping
         self.display_sportsbooks = display_sportsbooks
         self._display_odds_format = ODDS_FORMAT
-        self._api_odds_format = ODDS_FORMAT if ODDS_FORMAT in ("american", "decimal") else "decimal"
+        self._format_cache = FormatCache()
         self._load_odds_format_pref()
         self._sport_title_map = self._build_sport_title_map()
         self._load_sportsbook_weights()
-        self._odds_cache = {}
-        self._odds_cache_ttl = 12
+        self._last_odds_data = None
+        self._snapshot_store = SNAPSHOT_STORE
+        self._snapshot: Optional[OddsSnapshot] = None
+        self._odds_cache = self._snapshot_store.odds_cache
         self.sport_selection_window = None
 
         # Filters bar
@@ -2965,19 +3574,21 @@ class FuturesOddsWindow(OddsWindowMixin, QMainWindow):
         self.update_table()
 
     def update_table(self):
-        self.table.clear()
-        self.table.setRowCount(0)
-
         try:
             odds_data = self.fetch_odds_data()
             self._update_live_counts(odds_data)
             odds_data = self._filter_by_live_toggle(odds_data)
-            self.process_odds_data(odds_data)
-            self.add_headers()
-            for event in odds_data:
-                self.populate_table_rows(event)
+            self._last_odds_data = odds_data
+            columns, derived = self.process_odds_data(odds_data)
+            self._snapshot = self._snapshot_store.publish(
+                (self.current_sport, "outrights", ','.join(self.display_sportsbooks)),
+                odds_data or [],
+                fetched_at=getattr(self, "_last_odds_snapshot_ts", None),
+                columns=columns,
+                derived=derived,
+            )
+            self.render_table()
             self.update_requests_remaining()
-            self.table.resizeColumnsToContents()
             try:
                 self._set_last_refresh_label()
             except Exception:
@@ -2989,37 +3600,29 @@ class FuturesOddsWindow(OddsWindowMixin, QMainWindow):
             except Exception:
                 pass
 
-    def fetch_odds_data(self):
-        market_key = "outrights"
-        bookmakers = ','.join(self.display_sportsbooks)
-        cache_key = (self.current_sport, market_key, self._api_odds_format, bookmakers)
-        now = time.time()
-
-        cached = self._odds_cache.get(cache_key)
-        if cached and now - cached.get('ts', 0) < self._odds_cache_ttl:
-            self._last_odds_snapshot_ts = cached.get('ts')
-            self._last_odds_snapshot_cached = True
-            return cached.get('data')
-
+    def render_table(self):
+        """Redraw the board from the last processed snapshot without any API calls."""
+        self.table.clear()
+        self.table.setRowCount(0)
         try:
-            response = _require_odds_api().get_odds(
-                sport=self.current_sport,
-                markets=market_key,
-                odds_format=self._api_odds_format,
-                bookmakers=bookmakers
-            )
+            self.add_headers()
+            # futures consensus uses no-vig probabilities only
+            board = self._compute_board("outrights", fallback_implied=False)
+            for event_index, event in enumerate(self._last_odds_data or []):
+                self.populate_table_rows(event, board, event_index)
+            self.table.resizeColumnsToContents()
         except Exception as e:
-            msg = str(e)
-            if "429" in msg and cached:
-                self._last_odds_snapshot_ts = cached.get('ts')
-                self._last_odds_snapshot_cached = True
-                return cached.get('data')
-            raise
+            print(f"Error rendering table: {e}")
 
-        self._odds_cache[cache_key] = {"ts": now, "data": response}
-        self._last_odds_snapshot_ts = now
-        self._last_odds_snapshot_cached = False
-        print(response)
+    def fetch_odds_data(self):
+        bookmakers = ','.join(self.display_sportsbooks)
+        response, fetched_at, cached = _cached_get_odds(
+            self._odds_cache, self.current_sport, "outrights", bookmakers
+        )
+        self._last_odds_snapshot_ts = fetched_at
+        self._last_odds_snapshot_cached = cached
+        if not cached:
+            print(response)
         return response
 
     def _export_csv(self):
@@ -3041,19 +3644,6 @@ class FuturesOddsWindow(OddsWindowMixin, QMainWindow):
             pass
         self.update_table()
 
-    def process_odds_data(self, odds_data):
-        for event in odds_data:
-            for bookmaker in event['bookmakers']:
-                for market in bookmaker['markets']:
-                    total_prob = sum(
-                        odds_converter(self._api_odds_format, "probability", outcome["price"])
-                        for outcome in market["outcomes"]
-                    )
-                    for outcome in market["outcomes"]:
-                        prob = odds_converter(self._api_odds_format, "probability", outcome["price"])
-                        no_vig_prob = prob / total_prob if total_prob > 0 else 0
-                        outcome["no_vig_price"] = odds_converter("probability", self._api_odds_format, no_vig_prob)
-
     def add_headers(self):
         headers = ["Team", "Best\nBook", "Positive\nEdge", "Kelly\nBet"] + [
             self.sportsbook_mapping[bookmaker]
@@ -3091,74 +3681,36 @@ class FuturesOddsWindow(OddsWindowMixin, QMainWindow):
         except Exception:
             pass
 
-    def populate_table_rows(self, event):
-        for outcome in event['bookmakers'][0]['markets'][0]['outcomes']:
+    def populate_table_rows(self, event, board, event_index):
+        """Render one event's rows from precomputed `BoardMatrices`."""
+        best_sportsbook_col = 1
+        edge_col = 2
+        kelly_col = 3
+        consensus_col = len(self.display_sportsbooks) + 4
+        for board_row in board.rows_for(event_index):
             row = self.table.rowCount()
             self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(outcome['name']))
-
-            probabilities = []
-            weights = []
-            for col, bookmaker_key in enumerate(self.display_sportsbooks, start=4):
-                bookmaker = next((b for b in event['bookmakers'] if b['key'] == bookmaker_key), None)
-                if bookmaker:
-                    market = next((m for m in bookmaker['markets'] if m['key'] == "outrights"), None)
-                    if market:
-                        outcome_data = next((o for o in market['outcomes'] if o['name'] == outcome['name']), None)
-                        if outcome_data:
-                            price_text = self._format_odds_value(outcome_data["price"])
-                            self.table.setItem(row, col, QTableWidgetItem(str(price_text)))
-                            try:
-                                probabilities.append(
-                                    odds_converter(self._api_odds_format, "probability", outcome_data["no_vig_price"])
-                                )
-                            except Exception:
-                                pass
-
-                            weight = self._sportsbook_weights.get(bookmaker_key, 1.0)
-                            weights.append(weight)
-
-            if probabilities:
-                consensus_probability = sum(p * w for p, w in zip(probabilities, weights)) / sum(weights)
-                consensus_display = self._format_probability(consensus_probability)
+            self.table.setItem(row, 0, QTableWidgetItem(board.outcome_names[board_row]))
 
-                best_sportsbook_col = 1
-                edge_col = 2
-                kelly_col = 3
-                consensus_col = len(self.display_sportsbooks) + 4
+            for offset, outcome_data in enumerate(board.cells[board_row]):
+                if outcome_data:
+                    price_text = self._format_odds_value(outcome_data["price"])
+                    self.table.setItem(row, 4 + offset, QTableWidgetItem(str(price_text)))
 
+            consensus_probability = float(board.consensus[board_row])
+            if consensus_probability == consensus_probability:
+                consensus_display = self._format_probability(consensus_probability)
                 self.table.setItem(row, consensus_col, QTableWidgetItem(consensus_display))
 
-                best_sportsbook = None
-                best_edge = -float('inf')
-                best_kelly = 0
-
-                for account_key in self.selected_accounts:
-                    user_market = next(
-                        (m for b in event['bookmakers'] if b['key'] == account_key for m in b['markets'] if m['key'] == "outrights"),
-                        None
-                    )
-                    if user_market:
-                        user_outcome = next((o for o in user_market["outcomes"] if o["name"] == outcome['name']), None)
-                        if user_outcome:
-                            user_probability = odds_converter(self._api_odds_format, "probability", user_outcome["price"])
-                            edge = consensus_probability - user_probability
-                            kelly = kelly_criterion(
-                                consensus_probability, odds_converter(self._api_odds_format, "decimal", user_outcome["price"])
-                            )
-
-                            if edge > best_edge:
-                                best_edge = edge
-                                best_kelly = kelly
-                                best_sportsbook = account_key
-
+                best_sportsbook = board.best_account_key(board_row)
+                best_edge = float(board.best_edge[board_row])
                 self.table.setItem(row, best_sportsbook_col, QTableWidgetItem(self.sportsbook_mapping[best_sportsbook] if best_sportsbook else "N/A"))
                 self.table.setItem(row, edge_col, QTableWidgetItem(f"{best_edge:.2%}"))
                 kelly_amount_text = "N/A"
                 if best_sportsbook:
                     try:
                         bankroll = float(self.selected_accounts.get(best_sportsbook, 0))
-                        kelly_amount_text = f"${bankroll * best_kelly:,.2f}"
+                        kelly_amount_text = f"${bankroll * float(board.kelly[board_row]):,.2f}"
                     except Exception:
                         kelly_amount_text = "N/A"
                 self.table.setItem(row, kelly_col, QTableWidgetItem(kelly_amount_text))
@@ -3183,10 +3735,6 @@ class FuturesOddsWindow(OddsWindowMixin, QMainWindow):
                 except Exception:
                     pass
             else:
-                best_sportsbook_col = 1
-                edge_col = 2
-                kelly_col = 3
-                consensus_col = len(self.display_sportsbooks) + 4
                 self.table.setItem(row, consensus_col, QTableWidgetItem("N/A"))
                 self.table.setItem(row, edge_col, QTableWidgetItem("N/A"))
                 self.table.setItem(row, kelly_col, QTableWidgetItem("N/A"))
@@ -3227,6 +3775,8 @@ if __name__ == "__main__":
 
     # Initialize the App
     app = QApplication(sys.argv)
+    # The simulation process pool is shared by every analytics window
+    app.aboutToQuit.connect(shutdown_pool)
 
     # Initialize GUI formatting
     # Load user theme preference
@@ -0,0 +1,198 @@
+"""Background +EV sweep over every selected sport and market.
+
+`run_sweep` fetches each (sport, market) board concurrently and evaluates
+each one as soon as it arrives with `board_opportunities`: the devig,
+consensus and Kelly math the board window runs, without touching Qt. The
+results go into a `TopK`, the global ranking across boards. Each board's
+entries are replaced when it is re-swept, so the list updates incrementally.
+"""
+
+import heapq
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .consensus import compute_board, with_consensus_points
+    from .devig import devig_columns
+    from .snapshots import ColumnarOdds
+except ImportError:
+    from consensus import compute_board, with_consensus_points
+    from devig import devig_columns
+    from snapshots import ColumnarOdds
+
+SWEEP_MARKETS = ("h2h", "spreads", "totals")
+RANK_KEYS = ("edge", "kelly_dollars")
+
+BoardKey = Tuple[str, str]
+
+
+class SweepOpportunity:
+    """One +EV row of a swept board: the best account's price for an outcome."""
+
+    __slots__ = (
+        "sport", "market", "event_id", "event", "outcome", "point", "book",
+        "price", "consensus", "edge", "kelly_fraction", "kelly_dollars",
+    )
+
+    def __init__(self, sport: str, market: str, event: dict, outcome: Any, point: Optional[float], book: str,
+                 price: float, consensus: float, edge: float, kelly_fraction: float, kelly_dollars: float):
+        self.sport = sport
+        self.market = market
+        self.event_id = event.get('id')
+        self.event = event
+        self.outcome = outcome
+        self.point = point
+        self.book = book
+        self.price = price
+        self.consensus = consensus
+        self.edge = edge
+        self.kelly_fraction = kelly_fraction
+        self.kelly_dollars = kelly_dollars
+
+    def __repr__(self) -> str:
+        return f"SweepOpportunity({self.sport!r}, {self.market!r}, {self.outcome!r}, {self.book!r}, edge={self.edge:.4f})"
+
+
+def board_opportunities(
+    sport: str,
+    market: str,
+    events: Sequence[dict],
+    books: Sequence[str],
+    bankrolls: Mapping[str, float],
+    sportsbook_weights: Optional[Mapping[str, float]] = None,
+    devig_method: str = "multiplicative",
+    devig_market_methods: Optional[Mapping[str, str]] = None,
+    kelly_multiplier: float = 1.0,
+    kelly_max_fraction: Optional[float] = None,
+    kelly_book_cap: Any = None,
+) -> List[SweepOpportunity]:
+    """Devig `events`, compute the board and return its +EV rows.
+
+    Spread/total boards are put on their consensus line first (main lines
+    only; alternates are not fetched by the sweep). `events` is never
+    written to, so the payload shared with the GUI and the odds cache can
+    be passed as is.
+    """
+    columns = ColumnarOdds(events)
+    fair = devig_columns(columns, devig_method, devig_market_methods)
+    events = with_consensus_points(events, market, columns=columns)
+    accounts = list(bankrolls)
+    board = compute_board(
+        events, market, books, accounts, sportsbook_weights,
+        kelly_multiplier=kelly_multiplier,
+        kelly_max_fraction=kelly_max_fraction,
+        kelly_book_cap=kelly_book_cap,
+        columns=columns,
+        fair=fair,
+    )
+    out: List[SweepOpportunity] = []
+    for r in np.nonzero(np.isfinite(board.best_edge) & (board.best_edge > 0))[0].tolist():
+        account = board.best_account_key(r)
+        outcome = board.user_outcomes[r][int(board.best_account[r])] or {}
+        point = outcome.get('point')
+        fraction = float(board.kelly[r])
+        try:
+            bankroll = float(bankrolls.get(account, 0) or 0)
+        except Exception:
+            bankroll = 0.0
+        out.append(SweepOpportunity(
+            sport, market, events[int(board.row_event[r])], board.outcome_names[r],
+            float(point) if point is not None else None, account,
+            float(board.best_price[r]), float(board.consensus[r]), float(board.best_edge[r]),
+            fraction, fraction * bankroll,
+        ))
+    return out
+
+
+class TopK:
+    """Global top-K opportunities across boards, ranked by `edge` or `kelly_dollars`.
+
+    `update` replaces one board's entries, so re-sweeping a board never leaves
+    its stale rows behind. Boards keep every row, so `set_rank` re-ranks the
+    full set rather than each board's old top `k`.
+
+    Thread-safe: the sweep updates it from a worker while the panel reads it.
+    """
+
+    def __init__(self, k: int = 50, rank_by: str = "edge"):
+        if rank_by not in RANK_KEYS:
+            raise ValueError(f"rank_by must be one of {RANK_KEYS}.")
+        self.k = int(k)
+        self.rank_by = rank_by
+        self._lock = threading.Lock()
+        self._boards: Dict[Hashable, List[SweepOpportunity]] = {}
+        self._version = itertools.count(1)
+        self.version = 0
+
+    def update(self, board_key: Hashable, opportunities: Iterable[SweepOpportunity]) -> None:
+        rows = list(opportunities)
+        with self._lock:
+            self._boards[board_key] = rows
+            self.version = next(self._version)
+
+    def drop(self, board_key: Hashable) -> None:
+        with self._lock:
+            if self._boards.pop(board_key, None) is not None:
+                self.version = next(self._version)
+
+    def set_rank(self, rank_by: str) -> None:
+        """Change the ranking; the next `top()` re-ranks every stored row."""
+        if rank_by not in RANK_KEYS:
+            raise ValueError(f"rank_by must be one of {RANK_KEYS}.")
+        with self._lock:
+            self.rank_by = rank_by
+
+    def top(self) -> List[SweepOpportunity]:
+        with self._lock:
+            rows = list(itertools.chain.from_iterable(self._boards.values()))
+            rank_by = self.rank_by
+        return heapq.nlargest(self.k, rows, key=lambda o: getattr(o, rank_by))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(v) for v in self._boards.values())
+
+
+def run_sweep(
+    fetch: Callable[[str, str], Sequence[dict]],
+    evaluate: Callable[[str, str, Sequence[dict]], List[SweepOpportunity]],
+    sports: Sequence[str],
+    markets: Sequence[str] = SWEEP_MARKETS,
+    top: Optional[TopK] = None,
+    max_workers: int = 4,
+    on_board: Optional[Callable[[BoardKey, List[SweepOpportunity]], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Dict[BoardKey, List[SweepOpportunity]]:
+    """Fetch every (sport, market) concurrently and evaluate each as it lands.
+
+    A board whose fetch or evaluation fails is skipped for this sweep (its
+    previous entries in `top` are kept). `should_stop` is checked between
+    boards so a sweep can be abandoned quickly.
+    """
+    boards = [(sport, market) for sport in sports for market in markets]
+    results: Dict[BoardKey, List[SweepOpportunity]] = {}
+    if not boards:
+        return results
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(boards)))) as pool:
+        futures = {pool.submit(fetch, sport, market): (sport, market) for sport, market in boards}
+        for future in as_completed(futures):
+            if should_stop is not None and should_stop():
+                for pending in futures:
+                    pending.cancel()
+                break
+            board_key = futures[future]
+            try:
+                opportunities = evaluate(board_key[0], board_key[1], future.result() or [])
+            except Exception as e:
+                print(f"Sweep failed for {board_key}: {e}")
+                continue
+            results[board_key] = opportunities
+            if top is not None:
+                top.update(board_key, opportunities)
+            if on_board is not None:
+                on_board(board_key, opportunities)
+    return results
@@ -0,0 +1,245 @@
+"""Memory-bounded TTL + LRU caches for API payloads.
+
+`TTLCache` combines a freshness TTL, a longer stale window (so a rate-limited
+request can still fall back to the last good payload), LRU ordering, a
+per-cache byte limit and an optional `MemoryBudget` shared by several caches.
+Every entry carries an estimated byte size so the total footprint of cached
+odds stays bounded no matter how many sports, markets and per-event calls a
+session cycles through.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Best-effort deep size of `obj` in bytes (JSON-like payloads and arrays)."""
+    if _seen is None:
+        _seen = set()
+    obj_id = id(obj)
+    if obj_id in _seen:
+        return 0
+    _seen.add(obj_id)
+
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int):
+        # numpy arrays: the data buffer dominates
+        return nbytes
+
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += estimate_size(k, _seen) + estimate_size(v, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, _seen)
+    return size
+
+
+class MemoryBudget:
+    """A byte cap shared by several caches.
+
+    When an insert pushes total usage over `max_bytes`, least-recently-used
+    entries are evicted from the largest attached caches first. Caches attached
+    to the same budget share its lock, so cross-cache eviction is thread-safe.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self.lock = threading.RLock()
+        self._caches: List["TTLCache"] = []
+
+    def attach(self, cache: "TTLCache") -> None:
+        with self.lock:
+            if cache not in self._caches:
+                self._caches.append(cache)
+
+    def detach(self, cache: "TTLCache") -> None:
+        with self.lock:
+            if cache in self._caches:
+                self._caches.remove(cache)
+
+    @property
+    def used_bytes(self) -> int:
+        with self.lock:
+            return sum(c._bytes for c in self._caches)
+
+    def reclaim(self, protect: Optional[Tuple["TTLCache", Hashable]] = None) -> None:
+        """Evict LRU entries until usage fits under `max_bytes`.
+
+        `protect` is a `(cache, key)` pair that is never evicted here (the
+        entry being inserted).
+        """
+        with self.lock:
+            while self.used_bytes > self.max_bytes:
+                candidates = sorted(self._caches, key=lambda c: c._bytes, reverse=True)
+                if not any(c._evict_lru(protect) for c in candidates):
+                    break
+
+
+class TTLCache:
+    """Thread-safe TTL + LRU cache with byte-size accounting.
+
+    - `get` returns entries younger than `ttl`.
+    - `get_entry(..., allow_stale=True)` also returns entries younger than
+      `stale_ttl`; anything older is purged.
+    - `max_entries` / `max_bytes` evict least-recently-used entries, as does an
+      optional shared `MemoryBudget`.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        budget: Optional[MemoryBudget] = None,
+        name: str = "",
+    ):
+        self.ttl = float(ttl)
+        self.stale_ttl = max(float(stale_ttl if stale_ttl is not None else ttl), self.ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name
+        self._budget = budget
+        self._lock = budget.lock if budget is not None else threading.RLock()
+        # key -> (value, timestamp, size)
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._last_purge = 0.0
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "evicted_bytes": 0,
+        }
+        if budget is not None:
+            budget.attach(self)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get_entry(key, count=False) is not None
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def _drop(self, key: Hashable) -> int:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+        return size
+
+    def _evict_lru(self, protect: Optional[Tuple["TTLCache", Hashable]] = None) -> bool:
+        with self._lock:
+            for key in self._data:
+                if protect is not None and protect[0] is self and protect[1] == key:
+                    continue
+                size = self._drop(key)
+                self._stats["evictions"] += 1
+                self._stats["evicted_bytes"] += size
+                return True
+            return False
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Drop entries past the stale window. Returns the number removed."""
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [k for k, (_, ts, _) in self._data.items() if now - ts >= self.stale_ttl]
+            for key in expired:
+                self._drop(key)
+            self._stats["expirations"] += len(expired)
+            self._last_purge = now
+            return len(expired)
+
+    def get_entry(
+        self,
+        key: Hashable,
+        allow_stale: bool = False,
+        now: Optional[float] = None,
+        count: bool = True,
+    ) -> Optional[Tuple[Any, float]]:
+        """Return `(value, timestamp)` for `key`, or None if missing/expired."""
+        now = time.time() if now is None else now
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                if count:
+                    self._stats["misses"] += 1
+                return None
+            value, ts, _ = item
+            age = now - ts
+            if age >= self.stale_ttl:
+                self._drop(key)
+                self._stats["expirations"] += 1
+                if count:
+                    self._stats["misses"] += 1
+                return None
+            if age >= self.ttl and not allow_stale:
+                if count:
+                    self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            if count:
+                self._stats["stale_hits" if age >= self.ttl else "hits"] += 1
+            return value, ts
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: Any, ts: Optional[float] = None) -> None:
+        now = time.time() if ts is None else ts
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, now, size)
+            self._bytes += size
+            if now - self._last_purge >= self.ttl:
+                self.purge_expired(now)
+            while self.max_entries is not None and len(self._data) > self.max_entries:
+                if not self._evict_lru((self, key)):
+                    break
+            while self.max_bytes is not None and self._bytes > self.max_bytes:
+                if not self._evict_lru((self, key)):
+                    break
+            if self._budget is not None:
+                self._budget.reclaim((self, key))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            value = self._data[key][0]
+            self._drop(key)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def close(self) -> None:
+        """Drop all entries and release this cache from its shared budget."""
+        self.clear()
+        if self._budget is not None:
+            self._budget.detach(self)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of hit/miss/eviction counters and current footprint."""
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            lookups = out["hits"] + out["stale_hits"] + out["misses"]
+            out["hit_rate"] = (out["hits"] + out["stale_hits"]) / lookups if lookups else 0.0
+            out["entries"] = len(self._data)
+            out["bytes"] = self._bytes
+            out["name"] = self.name
+            return out
@@ -8,6 +8,11 @@ from datetime import datetime, timedelta, timezone
 import tempfile
 import time
 
+try:
+    from .pricing import convert_odds
+except ImportError:
+    from pricing import convert_odds
+
 def save_to_json(json_response, directory, file_name) -> None:
     if not os.path.exists(directory):
         os.makedirs(directory)
@@ -136,66 +141,13 @@ def odds_converter(odds_from: str, odds_to: str, odds_value: float) -> float:
     Args:
         odds_from (str): The format of the input odds ("probability", "american", "decimal", "fractional").
         odds_to (str): The format of the output odds ("probability", "american", "decimal", "fractional").
-        odds_value (float): The value of the odds in the input format.
+        odds_value (float): The value of the odds in the input format. NumPy arrays
+            are converted element-wise (see `pricing.convert_odds`).
 
     Returns:
         float: The value of the odds in the output format.
     """
-    def no_conversion(odds_value):
-        return odds_value
-
-    def probability_to_decimal(prob):
-        return 1 / prob
-
-    def decimal_to_probability(dec):
-        return 1 / dec
-
-    def decimal_to_american(dec):
-        return (dec - 1) * 100 if dec >= 2 else -100 / (dec - 1)
-
-    def american_to_decimal(amer):
-        return (amer / 100) + 1 if amer > 0 else (100 / -amer) + 1
-
-    def decimal_to_fractional(dec):
-        return dec - 1
-
-    def fractional_to_decimal(frac):
-        return frac + 1
-
-    def probability_to_american(prob):
-        return decimal_to_american(probability_to_decimal(prob))
-
-    def american_to_probability(amer):
-        return decimal_to_probability(american_to_decimal(amer))
-
-    def fractional_to_probability(frac):
-        return decimal_to_probability(fractional_to_decimal(frac))
-
-    def probability_to_fractional(prob):
-        return decimal_to_fractional(probability_to_decimal(prob))
-
-    # Conversion map
-    conversions = {
-        ("probability", "probability"): no_conversion,
-        ("american", "american"): no_conversion,
-        ("decimal", "decimal"): no_conversion,
-        ("fractional", "fractional"): no_conversion,
-        ("probability", "decimal"): probability_to_decimal,
-        ("decimal", "probability"): decimal_to_probability,
-        ("decimal", "american"): decimal_to_american,
-        ("american", "decimal"): american_to_decimal,
-        ("decimal", "fractional"): decimal_to_fractional,
-        ("fractional", "decimal"): fractional_to_decimal,
-        ("probability", "american"): probability_to_american,
-        ("american", "probability"): american_to_probability,
-        ("fractional", "probability"): fractional_to_probability,
-        ("probability", "fractional"): probability_to_fractional,
-    }
-
-    if (odds_from, odds_to) not in conversions:
-        raise ValueError(f"Conversion from {odds_from} to {odds_to} is not supported.")
-
-    return conversions[(odds_from, odds_to)](odds_value)
+    return convert_odds(odds_from, odds_to, odds_value)
 
 def remove_none_values(d: dict) -> dict:
     return {k: v for k, v in d.items() if v is not None}
@@ -0,0 +1,384 @@
+"""Offline fit of per-book, per-sport consensus weights from settled games.
+
+For every settled market the consensus is the weighted mean of the books'
+no-vig probabilities, ``q = sum(w_b * p_b) / sum(w_b)``. The weights minimise
+the log-loss of ``q`` on the winning outcomes. Each book's fair
+probabilities sum to one, so only the winning outcome's row matters. A
+training set is three flat columns (market instance, book, fair probability
+of the winner), and one full-batch gradient step is three `np.bincount`
+passes, so millions of rows fit without a solver dependency.
+
+Weights are fit in log space (``w = exp(theta)``) with a small L2 penalty
+on ``theta``. Books with little data stay near the prior, and the scale,
+which the log-loss cannot see, is pinned. Fitted weights are rescaled so the
+best book is 1.0, matching the 0-1 weight sliders.
+
+Samples come from `get_scores` (completed games) and one historical odds
+snapshot per sport and kickoff cluster, taken `lead` seconds before
+kickoff. `get_scores` only reaches back three days, so `collect` appends to
+``data/weight_fit/<sport>.json``. Running the job regularly builds up
+history. Run from the repository root:
+
+    python src/weight_fit.py [sport ...] [--no-collect] [--markets h2h,spreads,totals]
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .clv import BATCH_WINDOW, format_time, parse_time
+    from .devig import DEFAULT_METHOD, devig_columns
+    from .snapshots import ColumnarOdds
+except ImportError:
+    from clv import BATCH_WINDOW, format_time, parse_time
+    from devig import DEFAULT_METHOD, devig_columns
+    from snapshots import ColumnarOdds
+
+FIT_MARKETS = ("h2h", "spreads", "totals")
+# Snapshot taken this long before kickoff stands in for the closing line.
+SNAPSHOT_LEAD = 10 * 60
+PREFS_KEY = "sportsbook_weights_by_sport"
+
+
+class TrainingRows:
+    """Winning-outcome rows: `instance` (settled market), `book` index, fair `prob`."""
+
+    __slots__ = ("instance", "book", "prob", "book_keys", "n_instances")
+
+    def __init__(self, instance: np.ndarray, book: np.ndarray, prob: np.ndarray, book_keys: Sequence[str]):
+        self.instance = np.asarray(instance, dtype=np.int64)
+        self.book = np.asarray(book, dtype=np.int64)
+        self.prob = np.asarray(prob, dtype=np.float64)
+        self.book_keys = list(book_keys)
+        self.n_instances = int(self.instance.max()) + 1 if self.instance.size else 0
+
+    def __len__(self) -> int:
+        return int(self.prob.size)
+
+    @classmethod
+    def concat(cls, parts: Iterable["TrainingRows"]) -> "TrainingRows":
+        """Stack row sets, remapping books onto one key list and offsetting instances."""
+        book_index: Dict[str, int] = {}
+        instances, books, probs = [], [], []
+        offset = 0
+        for part in parts:
+            remap = np.array([book_index.setdefault(k, len(book_index)) for k in part.book_keys], dtype=np.int64)
+            instances.append(part.instance + offset)
+            books.append(remap[part.book] if part.book.size else part.book)
+            probs.append(part.prob)
+            offset += part.n_instances
+        if not instances:
+            return cls(np.empty(0), np.empty(0), np.empty(0), [])
+        return cls(np.concatenate(instances), np.concatenate(books), np.concatenate(probs), list(book_index))
+
+
+def settle_results(scores: Iterable[dict]) -> Dict[str, Tuple[str, str, float, float]]:
+    """``{event_id: (home, away, home_score, away_score)}`` for completed games."""
+    out: Dict[str, Tuple[str, str, float, float]] = {}
+    for game in scores or []:
+        if not game.get('completed') or not game.get('id'):
+            continue
+        home, away = game.get('home_team'), game.get('away_team')
+        by_name = {}
+        for entry in game.get('scores') or []:
+            try:
+                by_name[entry.get('name')] = float(entry.get('score'))
+            except Exception:
+                continue
+        if home in by_name and away in by_name:
+            out[str(game['id'])] = (home, away, by_name[home], by_name[away])
+    return out
+
+
+def training_rows(
+    events: Sequence[dict],
+    results: Mapping[str, Tuple[str, str, float, float]],
+    markets: Sequence[str] = FIT_MARKETS,
+    method: str = DEFAULT_METHOD,
+) -> TrainingRows:
+    """Settle one odds snapshot against `results` and keep the winning rows.
+
+    A market instance is (event, market, point) on the winning side, so
+    books are only compared at the same line. Pushes, unsettled events and
+    instances quoted by a single book (which carry no information about
+    the weights) are dropped.
+    """
+    columns = ColumnarOdds(events)
+    if not len(columns):
+        return TrainingRows(np.empty(0), np.empty(0), np.empty(0), [])
+    fair = devig_columns(columns, method)
+
+    n_events = columns.n_events
+    home_id = np.full(n_events, -1, dtype=np.int64)
+    away_id = np.full(n_events, -1, dtype=np.int64)
+    home_score = np.full(n_events, np.nan)
+    away_score = np.full(n_events, np.nan)
+    name_index = {name: i for i, name in enumerate(columns.names)}
+    for e, event_id in enumerate(columns.event_ids):
+        result = results.get(event_id)
+        if result is None:
+            continue
+        home, away, hs, as_ = result
+        home_id[e] = name_index.get(home, -1)
+        away_id[e] = name_index.get(away, -1)
+        home_score[e], away_score[e] = hs, as_
+
+    ev = columns.event
+    name = columns.name
+    point = columns.point
+    hs, as_ = home_score[ev], away_score[ev]
+    is_home = name == home_id[ev]
+    is_away = name == away_id[ev]
+    won = np.zeros(len(columns), dtype=bool)
+
+    market_ids = {key: columns.market_id(key) for key in markets}
+    if market_ids.get('h2h', -1) >= 0:
+        rows = columns.market == market_ids['h2h']
+        draw_id = name_index.get('Draw', -2)
+        won |= rows & (
+            (is_home & (hs > as_)) | (is_away & (as_ > hs)) | ((name == draw_id) & (hs == as_))
+        )
+    if market_ids.get('spreads', -1) >= 0:
+        rows = columns.market == market_ids['spreads']
+        team = np.where(is_home, hs, np.where(is_away, as_, np.nan))
+        other = np.where(is_home, as_, hs)
+        won |= rows & (team + point > other)
+    if market_ids.get('totals', -1) >= 0:
+        rows = columns.market == market_ids['totals']
+        total = hs + as_
+        over = name == name_index.get('Over', -2)
+        under = name == name_index.get('Under', -2)
+        won |= rows & ((over & (total > point)) | (under & (total < point)))
+    won &= np.isfinite(fair) & (fair > 0)
+
+    idx = np.nonzero(won)[0]
+    if not idx.size:
+        return TrainingRows(np.empty(0), np.empty(0), np.empty(0), columns.book_keys)
+    line = np.where(np.isnan(point[idx]), 0.0, point[idx])
+    _, line_id = np.unique(np.round(line * 100), return_inverse=True)
+    n_lines = int(line_id.max()) + 1
+    key = (ev[idx].astype(np.int64) * len(columns.market_keys) + columns.market[idx]) * len(columns.names)
+    key = (key + name[idx]) * n_lines + line_id.reshape(-1)
+    _, instance = np.unique(key, return_inverse=True)
+    counts = np.bincount(instance)
+    keep = counts[instance] > 1
+    _, instance = np.unique(instance[keep], return_inverse=True)
+    return TrainingRows(instance.reshape(-1), columns.book[idx][keep], fair[idx][keep], columns.book_keys)
+
+
+def consensus_log_loss(rows: TrainingRows, weights: np.ndarray) -> float:
+    """Mean negative log of the weighted consensus on the winning outcomes."""
+    w = np.asarray(weights, dtype=np.float64)[rows.book]
+    s = np.bincount(rows.instance, w * rows.prob, rows.n_instances)
+    total = np.bincount(rows.instance, w, rows.n_instances)
+    return float(-np.mean(np.log(s / total)))
+
+
+def fit_weights(
+    rows: TrainingRows,
+    l2: float = 1e-3,
+    iterations: int = 500,
+    learning_rate: float = 0.05,
+    tol: float = 1e-7,
+) -> np.ndarray:
+    """Log-loss-minimising weight per book of `rows` (best book = 1.0).
+
+    Full-batch Adam on ``theta = log(w)``. The gradient of the mean
+    ``-log q`` with respect to ``theta_b`` is
+    ``-mean_m w_b (p_mb - q_m) / (q_m * W_m)`` over the instances book `b`
+    quotes.
+    """
+    n_books = len(rows.book_keys)
+    theta = np.zeros(n_books)
+    if not len(rows) or not n_books:
+        return np.ones(n_books)
+    m = np.zeros(n_books)
+    v = np.zeros(n_books)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    n = float(rows.n_instances)
+    for step in range(1, iterations + 1):
+        w = np.exp(theta)
+        w_rows = w[rows.book]
+        s = np.bincount(rows.instance, w_rows * rows.prob, rows.n_instances)
+        total = np.bincount(rows.instance, w_rows, rows.n_instances)
+        q = s / total
+        # q * total == s
+        contrib = w_rows * (rows.prob - q[rows.instance]) / s[rows.instance]
+        grad = -np.bincount(rows.book, contrib, n_books) / n + l2 * theta
+        if float(np.max(np.abs(grad))) < tol:
+            break
+        m = beta1 * m + (1 - beta1) * grad
+        v = beta2 * v + (1 - beta2) * grad * grad
+        m_hat = m / (1 - beta1 ** step)
+        v_hat = v / (1 - beta2 ** step)
+        theta -= learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+    return np.exp(theta - theta.max())
+
+
+def fit_sport_weights(
+    samples: Iterable[Tuple[Sequence[dict], Mapping[str, Tuple[str, str, float, float]]]],
+    markets: Sequence[str] = FIT_MARKETS,
+    min_rows: int = 50,
+    **fit_kwargs,
+) -> Dict[str, float]:
+    """Fit one sport's ``{book: weight}`` from (snapshot events, results) samples.
+
+    Books with fewer than `min_rows` winning rows are left out, so the
+    app keeps their manual or default weight.
+    """
+    rows = TrainingRows.concat(training_rows(events, results, markets) for events, results in samples)
+    if not len(rows):
+        return {}
+    weights = fit_weights(rows, **fit_kwargs)
+    counts = np.bincount(rows.book, minlength=len(rows.book_keys))
+    return {
+        book: round(float(w), 3)
+        for book, w, count in zip(rows.book_keys, weights.tolist(), counts.tolist())
+        if count >= min_rows
+    }
+
+
+def _sample_path(sport: str, directory: Optional[str] = None) -> str:
+    base = directory or os.path.join(os.getcwd(), 'data', 'weight_fit')
+    try:
+        os.makedirs(base, exist_ok=True)
+    except Exception:
+        pass
+    return os.path.join(base, f"{sport}.json")
+
+
+def load_samples(sport: str, directory: Optional[str] = None) -> Dict[str, dict]:
+    """Stored ``{event_id: {"result": [...], "event": {...}}}`` for `sport`."""
+    path = _sample_path(sport, directory)
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f) or {}
+    except Exception as e:
+        print(f"Error loading weight-fit samples for {sport}: {e}")
+    return {}
+
+
+def collect(
+    sport: str,
+    get_scores: Callable[[str], Sequence[dict]],
+    get_snapshot: Callable[[str, str, str, str], Sequence[dict]],
+    markets: Sequence[str] = FIT_MARKETS,
+    lead: float = SNAPSHOT_LEAD,
+    directory: Optional[str] = None,
+) -> int:
+    """Store pre-kickoff odds of newly completed games; returns the events added.
+
+    `get_snapshot(sport, date, markets, event_ids)` is called once per
+    cluster of kickoffs (see `clv.BATCH_WINDOW`), not once per game.
+    """
+    stored = load_samples(sport, directory)
+    games = [g for g in (get_scores(sport) or []) if g.get('completed') and str(g.get('id')) not in stored]
+    results = settle_results(games)
+    kickoffs = sorted(
+        (parse_time(g.get('commence_time')), str(g['id'])) for g in games
+        if str(g.get('id')) in results and parse_time(g.get('commence_time')) is not None
+    )
+    clusters: List[List[Tuple[float, str]]] = []
+    for kickoff, event_id in kickoffs:
+        if clusters and kickoff - clusters[-1][0][0] <= BATCH_WINDOW:
+            clusters[-1].append((kickoff, event_id))
+        else:
+            clusters.append([(kickoff, event_id)])
+    added = 0
+    for cluster in clusters:
+        event_ids = ','.join(event_id for _, event_id in cluster)
+        try:
+            events = get_snapshot(sport, format_time(cluster[0][0] - lead), ','.join(markets), event_ids) or []
+        except Exception as e:
+            print(f"Error fetching snapshot for {sport}: {e}")
+            continue
+        for event in events:
+            event_id = str(event.get('id'))
+            if event_id in results:
+                stored[event_id] = {"result": list(results[event_id]), "event": event}
+                added += 1
+    if added:
+        try:
+            with open(_sample_path(sport, directory), 'w') as f:
+                json.dump(stored, f)
+        except Exception as e:
+            print(f"Error saving weight-fit samples for {sport}: {e}")
+    return added
+
+
+def stored_training_samples(sport: str, directory: Optional[str] = None):
+    """All stored samples of `sport` as one (events, results) pair."""
+    stored = load_samples(sport, directory)
+    events = [entry["event"] for entry in stored.values()]
+    results = {event_id: tuple(entry["result"]) for event_id, entry in stored.items()}
+    return [(events, results)] if events else []
+
+
+def save_fitted_weights(fitted: Mapping[str, Mapping[str, float]], prefs_path: Optional[str] = None) -> bool:
+    """Merge ``{sport: {book: weight}}`` into ``user_prefs.json`` under `PREFS_KEY`."""
+    try:
+        from .utils import load_user_prefs, save_user_prefs
+    except ImportError:
+        from utils import load_user_prefs, save_user_prefs
+    prefs = load_user_prefs(prefs_path)
+    if not isinstance(prefs, dict):
+        prefs = {}
+    by_sport = prefs.get(PREFS_KEY)
+    if not isinstance(by_sport, dict):
+        by_sport = {}
+    for sport, weights in fitted.items():
+        if weights:
+            by_sport[sport] = dict(weights)
+    prefs[PREFS_KEY] = by_sport
+    return save_user_prefs(prefs, prefs_path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fit per-book consensus weights from settled games.")
+    parser.add_argument("sports", nargs="*", help="Sport keys (default: the last viewed sport)")
+    parser.add_argument("--markets", default=",".join(FIT_MARKETS))
+    parser.add_argument("--no-collect", action="store_true", help="Fit on stored samples only (no API calls)")
+    parser.add_argument("--l2", type=float, default=1e-3)
+    parser.add_argument("--min-rows", type=int, default=50)
+    parser.add_argument("--dry-run", action="store_true", help="Print the weights without saving them")
+    args = parser.parse_args(argv)
+    markets = [m for m in args.markets.split(",") if m]
+
+    from config import API_ODDS_FORMAT, THEODDSAPI_KEY_PROD
+    from the_odds_api import OddsAPI
+    from utils import load_user_prefs
+
+    prefs = load_user_prefs()
+    sports = args.sports or ([prefs['last_sport']] if prefs.get('last_sport') else [])
+    if not sports:
+        parser.error("no sport given and no saved sport in user_prefs.json")
+    bookmakers = ','.join(prefs.get('display_sportsbooks') or []) or None
+    api = OddsAPI(THEODDSAPI_KEY_PROD)
+
+    def get_snapshot(sport, date, snapshot_markets, event_ids):
+        response = api.get_historical_odds(
+            sport=sport, date=date, markets=snapshot_markets, odds_format=API_ODDS_FORMAT,
+            bookmakers=bookmakers, event_ids=event_ids,
+        )
+        return response.get('data') or [] if isinstance(response, dict) else response or []
+
+    fitted = {}
+    for sport in sports:
+        if not args.no_collect:
+            added = collect(sport, lambda s: api.get_scores(s, days_from=3), get_snapshot, markets)
+            print(f"{sport}: stored {added} new settled games")
+        weights = fit_sport_weights(stored_training_samples(sport), markets, min_rows=args.min_rows, l2=args.l2)
+        fitted[sport] = weights
+        print(f"{sport}: {weights}")
+    if not args.dry_run and save_fitted_weights(fitted):
+        print(f"Saved weights for {sum(1 for w in fitted.values() if w)} sports to user_prefs.json")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+
+from src.clv import CLVTracker, closing_lines, format_time, parse_time
+from src.devig import devig_columns, devig_events
+from src.snapshots import ColumnarOdds
+
+KICKOFF = parse_time('2026-10-18T17:00:00Z')
+
+
+def wager(event_id='e1', outcome='Home', price=2.10, consensus=0.50, kickoff=KICKOFF, **extra):
+    data = {
+        'event': 'Away @ Home', 'event_id': event_id, 'sport': 'americanfootball_nfl',
+        'commence_time': format_time(kickoff), 'outcome': outcome, 'market': 'h2h', 'point': None,
+        'sportsbook': 'dk', 'odds_decimal': price, 'consensus_probability': consensus, 'stake': 100.0,
+    }
+    data.update(extra)
+    return data
+
+
+def board(event_id, home_prob, books=('pinnacle', 'dk')):
+    return {'id': event_id, 'bookmakers': [
+        {'key': key, 'markets': [{'key': 'h2h', 'outcomes': [
+            {'name': 'Home', 'price': 1 / home_prob, 'no_vig_probability': home_prob},
+            {'name': 'Away', 'price': 1 / (1 - home_prob), 'no_vig_probability': 1 - home_prob},
+        ]}]}
+        for key in books
+    ]}
+
+
+def test_record_keeps_bet_time_price_and_persists(tmp_path):
+    path = str(tmp_path / 'clv.json')
+    tracker = CLVTracker(path)
+    assert tracker.record([wager()], now=KICKOFF - 7200) == 1
+    # the same wager re-rendered later does not overwrite the bet-time price
+    assert tracker.record([wager(price=1.95)], now=KICKOFF - 3600) == 0
+    # started events, unsupported markets and incomplete wagers are ignored
+    assert tracker.record([
+        wager('late', kickoff=KICKOFF - 4000),
+        wager('three', market='h2h_3_way'),
+        wager(event_id=None),
+    ], now=KICKOFF - 3600) == 0
+
+    reloaded = CLVTracker(path)
+    (bet,) = reloaded.bets.values()
+    assert bet.price == 2.10 and bet.placed_at == KICKOFF - 7200
+    assert len(json.load(open(path))) == 1
+
+
+def test_board_close_then_summary(tmp_path):
+    tracker = CLVTracker(str(tmp_path / 'clv.json'))
+    tracker.record([wager(), wager(outcome='Away', price=1.80, consensus=0.50, stake=50.0)], now=KICKOFF - 7200)
+
+    # too early: not the closing line yet
+    assert tracker.close_from_board([board('e1', 0.52)], now=KICKOFF - 7000) == 0
+    assert tracker.close_from_board([board('e1', 0.52)], now=KICKOFF - 600) == 2
+    # a later pre-game snapshot replaces the close
+    assert tracker.close_from_board([board('e1', 0.55)], now=KICKOFF - 60,
+                                    sportsbook_weights={'pinnacle': 3.0}) == 2
+
+    home = tracker.bets['e1|h2h|Home||dk']
+    assert home.closing_consensus == pytest.approx(0.55)
+    assert home.clv == pytest.approx(2.10 * 0.55 - 1)
+    assert home.consensus_move == pytest.approx(0.05)
+    assert home.closing_price == pytest.approx(1 / 0.55)
+
+    assert tracker.summary(now=KICKOFF - 1)['closed'] == 0
+    stats = tracker.summary(now=KICKOFF + 1)
+    clvs = (2.10 * 0.55 - 1, 1.80 * 0.45 - 1)
+    assert stats['closed'] == 2
+    assert stats['mean_clv'] == pytest.approx(sum(clvs) / 2)
+    assert stats['stake_weighted_clv'] == pytest.approx((100 * clvs[0] + 50 * clvs[1]) / 150)
+    assert stats['beat_close_rate'] == 0.5
+
+
+def test_board_close_saves_only_when_a_close_changes(tmp_path, monkeypatch):
+    tracker = CLVTracker(str(tmp_path / 'clv.json'))
+    tracker.record([wager()], now=KICKOFF - 7200)
+    saves = []
+    monkeypatch.setattr(tracker, 'save', lambda: saves.append(1) or True)
+
+    assert tracker.close_from_board([board('other', 0.52)], now=KICKOFF - 600) == 0
+    assert tracker.close_from_board([board('e1', 0.52)], now=KICKOFF - 600) == 1
+    assert tracker.close_from_board([board('e1', 0.52)], now=KICKOFF - 300) == 1
+    assert len(saves) == 1
+    assert tracker.close_from_board([board('e1', 0.55)], now=KICKOFF - 60) == 1
+    assert len(saves) == 2
+
+
+def test_closing_lines_read_fair_columns_without_annotations(tmp_path):
+    def raw(event_id, home, away):
+        return {'id': event_id, 'bookmakers': [
+            {'key': 'dk', 'markets': [
+                {'key': 'spreads', 'outcomes': [{'name': 'Home', 'point': -3, 'price': 1.9}]},
+                {'key': 'h2h', 'outcomes': [{'name': 'Home', 'price': home}, {'name': 'Away', 'price': away}]},
+            ]},
+            {'key': 'pinnacle', 'markets': [
+                {'key': 'h2h', 'outcomes': [{'name': 'Home', 'price': home + 0.1}, {'name': 'Away', 'price': away}]},
+            ]},
+        ]}
+
+    tracker = CLVTracker(str(tmp_path / 'clv.json'))
+    tracker.record([wager('e2'), wager('e2', outcome='Away', price=1.9)], now=KICKOFF - 7200)
+    bets = list(tracker.bets.values())
+    events = [raw('e1', 2.5, 1.6), raw('e2', 1.8, 2.1)]
+    fair = devig_columns(ColumnarOdds(events))
+    closes = closing_lines(events, bets, {'pinnacle': 2.0}, fair=fair)
+    assert 'no_vig_probability' not in events[1]['bookmakers'][0]['markets'][1]['outcomes'][0]
+
+    devig_events(events)
+    assert closes == pytest.approx(closing_lines(events, bets, {'pinnacle': 2.0}))
+    assert len(closes) == 2
+
+
+def test_historical_closes_are_batched_per_sport_and_kickoff(tmp_path):
+    tracker = CLVTracker(str(tmp_path / 'clv.json'), batch_window=900)
+    wagers = [wager(f'e{i}', kickoff=KICKOFF + i * 300) for i in range(3)]  # one 10 minute window
+    wagers += [wager('late1', kickoff=KICKOFF + 3 * 3600), wager('late2', kickoff=KICKOFF + 3 * 3600)]
+    wagers.append(wager('nba', sport='basketball_nba'))
+    tracker.record(wagers, now=KICKOFF - 86400)
+
+    calls = []
+
+    def fetch(sport, date, markets, event_ids):
+        calls.append((sport, date, markets, event_ids))
+        ids = event_ids.split(',')
+        return [{'id': eid, 'bookmakers': [{'key': 'pinnacle', 'markets': [{'key': 'h2h', 'outcomes': [
+            {'name': 'Home', 'price': 1.80}, {'name': 'Away', 'price': 2.10}]}]}]}
+            for eid in ids if eid != 'late2']
+
+    assert tracker.resolve(fetch, now=KICKOFF + 4 * 3600) == 3
+    assert sorted(calls) == sorted([
+        ('americanfootball_nfl', format_time(KICKOFF), 'h2h', 'e0,e1,e2'),
+        ('americanfootball_nfl', format_time(KICKOFF + 3 * 3600), 'h2h', 'late1,late2'),
+        ('basketball_nba', format_time(KICKOFF), 'h2h', 'nba'),
+    ])
+    fair_home = (1 / 1.80) / (1 / 1.80 + 1 / 2.10)
+    assert tracker.bets['e2|h2h|Home||dk'].closing_consensus == pytest.approx(fair_home)
+    assert tracker.bets['late2|h2h|Home||dk'].close_source == 'missing'
+
+    # everything is resolved (or known missing): no further API calls
+    assert tracker.resolve(fetch, now=KICKOFF + 5 * 3600) == 0
+
+
+def test_failed_batches_retry_after_backoff(tmp_path):
+    tracker = CLVTracker(str(tmp_path / 'clv.json'), retry_after=600)
+    tracker.record([wager()], now=KICKOFF - 3600)
+
+    def fail(*args):
+        raise RuntimeError('429')
+
+    assert tracker.resolve(fail, now=KICKOFF + 10) == 1
+    assert tracker.resolve(fail, now=KICKOFF + 100) == 0
+    assert tracker.resolve(fail, now=KICKOFF + 700) == 1
+    assert tracker.bets['e1|h2h|Home||dk'].close_source is None
@@ -0,0 +1,154 @@
+import math
+import random
+
+import pytest
+
+from src.consensus import compute_board, consensus_points, match_outcome, outcome_names_for, with_consensus_points
+from src.devig import devig_events
+from src.utils import compute_consensus_point, kelly_criterion
+
+
+def make_events():
+    def book(key, home, away):
+        return {'key': key, 'markets': [{'key': 'h2h', 'outcomes': [
+            {'name': 'Home', 'price': home}, {'name': 'Away', 'price': away}]}]}
+
+    events = [
+        {'id': 'e1', 'home_team': 'Home', 'away_team': 'Away', 'bookmakers': [
+            book('pinnacle', 1.80, 2.10),
+            book('dk', 1.95, 1.90),
+            book('fd', 1.95, 1.85),
+        ]},
+        {'id': 'e2', 'home_team': 'Home', 'away_team': 'Away', 'bookmakers': [
+            book('pinnacle', 2.50, 1.55),
+        ]},
+        {'id': 'empty', 'bookmakers': []},
+    ]
+    devig_events(events)
+    return events
+
+
+def test_board_matrices_match_row_rules():
+    events = make_events()
+    board = compute_board(
+        events, 'h2h', ['pinnacle', 'dk', 'fd'], ['dk', 'fd'],
+        sportsbook_weights={'pinnacle': 3.0},
+    )
+    assert len(board) == 4
+    assert list(board.rows_for(0)) == [0, 1]
+    assert list(board.rows_for(2)) == []
+    assert board.outcome_names[:2] == ['Home', 'Away']
+
+    outcomes = [[o for b in events[0]['bookmakers'] for o in b['markets'][0]['outcomes'] if o['name'] == n]
+                for n in ('Home', 'Away')]
+    home_probs = [o['no_vig_probability'] for o in outcomes[0]]
+    expected = (3 * home_probs[0] + home_probs[1] + home_probs[2]) / 5
+    assert board.consensus[0] == pytest.approx(expected)
+
+    # dk and fd quote the same home price: the first account wins the tie
+    assert board.best_account_key(0) == 'dk'
+    assert board.best_edge[0] == pytest.approx(expected - 1 / 1.95)
+    assert board.kelly[0] == pytest.approx(kelly_criterion(expected, 1.95))
+
+    # e2 has a consensus but no account quotes it
+    assert board.best_account_key(2) is None
+    assert board.best_edge[2] == -math.inf and board.kelly[2] == 0.0
+
+    holds = [max(1 / h + 1 / a - 1, 0) for h, a in ((1.80, 2.10), (1.95, 1.90), (1.95, 1.85))]
+    assert board.hold[0] == pytest.approx(sum(holds) / 3)
+    assert math.isnan(board.hold[2])
+
+
+def test_board_kelly_caps_apply_across_the_whole_board():
+    board = compute_board(make_events(), 'h2h', ['pinnacle'], ['dk', 'fd'], kelly_book_cap=0.01)
+    picked = [board.best_account_key(r) for r in range(len(board))]
+    for book in ('dk', 'fd'):
+        total = sum(board.kelly[r] for r, b in enumerate(picked) if b == book)
+        assert total <= 0.01 + 1e-12
+
+
+def random_line_events(seed, n_events=60):
+    rng = random.Random(seed)
+    teams = ['Kansas City Chiefs', 'Buffalo Bills', 'L.A. Rams', 'New York Jets', '']
+    events = []
+    for _ in range(n_events):
+        home, away = rng.sample(teams, 2)
+        bookmakers = []
+        for b in range(rng.randint(0, 6)):
+            line = rng.choice([0.0, 1.0, 1.25, 2.5, 2.75, 3.0, 3.5, -0.25])
+            fav_home = rng.random() < 0.5
+            outcomes = [
+                {'name': rng.choice([home, home.upper(), 'Chiefs']), 'point': -line if fav_home else line, 'price': 1.9},
+                {'name': rng.choice([away, None]), 'point': line if fav_home else -line, 'price': 1.9},
+            ]
+            if rng.random() < 0.2:
+                outcomes[0]['point'] = None
+            bookmakers.append({'key': f'b{b}', 'markets': [
+                {'key': 'spreads', 'outcomes': outcomes},
+                {'key': 'totals', 'outcomes': [
+                    {'name': 'Over', 'point': 40 + rng.choice([0, 0.5, 1.25, 2]), 'price': 1.9},
+                    {'name': 'Under', 'point': 40 + rng.choice([0, 0.5, 1.25]), 'price': 1.9},
+                ]},
+            ]})
+        events.append({'home_team': home, 'away_team': away, 'bookmakers': bookmakers})
+    return events
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('market_type', ['spreads', 'totals'])
+def test_batched_consensus_points_match_per_event(seed, market_type):
+    events = random_line_events(seed)
+    points, favorites = consensus_points(events, market_type)
+    for event, point, favorite in zip(events, points, favorites):
+        assert (point, favorite) == compute_consensus_point(event, market_type)
+
+
+def _market_for(event, book, market_key):
+    for bookmaker in event['bookmakers']:
+        if bookmaker['key'] == book:
+            return next((m for m in bookmaker['markets'] if m['key'] == market_key), None)
+    return None
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('market_type', ['spreads', 'totals'])
+@pytest.mark.parametrize('on_line', [False, True])
+def test_columnar_board_matches_per_cell_matching(seed, market_type, on_line):
+    events = random_line_events(seed)
+    if on_line:
+        points, favorites = consensus_points(events, market_type)
+        for event, cp, fav in zip(events, points, favorites):
+            if cp is not None:
+                event['_consensus_point'] = cp
+                event['_consensus_favorite'] = fav
+    devig_events(events)
+    books = [f'b{i}' for i in range(6)]
+    board = compute_board(events, market_type, books, ['b1', 'b4'])
+
+    r = 0
+    for event in events:
+        for name in outcome_names_for(event, market_type):
+            for b, book in enumerate(books):
+                expected = match_outcome(event, _market_for(event, book, market_type), name, market_type, point_fallback=True)
+                assert board.cells[r][b] is expected
+                prob = expected and (expected['no_vig_probability'] or expected['implied_probability'])
+                assert (math.isnan(board.probability[r, b]) if prob is None else board.probability[r, b] == pytest.approx(prob))
+            for a, account in enumerate(['b1', 'b4']):
+                expected = match_outcome(event, _market_for(event, account, market_type), name, market_type)
+                assert board.user_outcomes[r][a] is expected
+            r += 1
+    assert r == len(board)
+
+
+def test_with_consensus_points_copies_only_events_on_a_line():
+    events = random_line_events(0)
+    points, favorites = consensus_points(events, 'spreads')
+    lined = with_consensus_points(events, 'spreads')
+    for original, event, cp, fav in zip(events, lined, points, favorites):
+        assert '_consensus_point' not in original
+        if cp is None:
+            assert event is original
+        else:
+            assert event is not original and event['bookmakers'] is original['bookmakers']
+            assert (event['_consensus_point'], event['_consensus_favorite']) == (cp, fav)
+    assert with_consensus_points(events, 'h2h') == events
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from src.devig import (
+    METHODS,
+    MarketHolds,
+    devig_columns,
+    devig_events,
+    devig_snapshot,
+    devig_stage,
+    market_holds,
+)
+from src.snapshots import ColumnarOdds, SnapshotStore
+
+
+def make_events():
+    return [
+        {
+            'id': 'nfl1',
+            'bookmakers': [
+                {'key': 'fanduel', 'markets': [
+                    {'key': 'h2h', 'outcomes': [
+                        {'name': 'Home', 'price': 1.5},
+                        {'name': 'Away', 'price': 2.6},
+                    ]},
+                ]},
+            ],
+        },
+        {
+            'id': 'golf1',
+            'bookmakers': [
+                {'key': 'draftkings', 'markets': [
+                    {'key': 'outrights', 'outcomes': [
+                        {'name': 'A', 'price': 1.8},
+                        {'name': 'B', 'price': 3.2},
+                        {'name': 'C', 'price': 5.0},
+                        {'name': 'D', 'price': 15.0},
+                        {'name': 'E', 'price': 1.0},
+                    ]},
+                ]},
+            ],
+        },
+    ]
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_every_method_sums_to_one_per_group(method):
+    cols = ColumnarOdds(make_events())
+    fair = devig_columns(cols, method)
+    for g in range(cols.n_groups):
+        sl = cols.group_slice(g)
+        assert np.nansum(fair[sl]) == pytest.approx(1.0, abs=1e-9)
+    assert np.isnan(fair[-1])
+    # favourites keep a higher fair probability than longshots
+    assert fair[2] > fair[3] > fair[4] > fair[5]
+
+
+def test_methods_differ_on_longshot_bias_and_overrides_apply():
+    cols = ColumnarOdds(make_events())
+    mult = devig_columns(cols, 'multiplicative')
+    power = devig_columns(cols, 'power')
+    shin = devig_columns(cols, 'shin')
+    # power/shin shave more margin from the longshot than proportional
+    assert power[5] < mult[5]
+    assert shin[5] < mult[5]
+
+    mixed = devig_columns(cols, 'multiplicative', {'outrights': 'power'})
+    np.testing.assert_allclose(mixed[:2], mult[:2])
+    np.testing.assert_allclose(mixed[2:6], power[2:6])
+    with pytest.raises(ValueError):
+        devig_columns(cols, 'bogus')
+
+
+def test_devig_events_annotates_outcomes_like_proportional_normalization():
+    events = make_events()
+    devig_events(events)
+    home, away = events[0]['bookmakers'][0]['markets'][0]['outcomes']
+    total = 1 / 1.5 + 1 / 2.6
+    assert home['implied_probability'] == pytest.approx(1 / 1.5)
+    assert home['no_vig_probability'] == pytest.approx((1 / 1.5) / total)
+    assert away['no_vig_price'] == pytest.approx(total / (1 / 2.6))
+    invalid = events[1]['bookmakers'][0]['markets'][0]['outcomes'][-1]
+    assert invalid['implied_probability'] is None and invalid['no_vig_price'] is None
+
+
+def test_devig_snapshot_is_computed_once():
+    snap = SnapshotStore().publish('k', make_events())
+    first = devig_snapshot(snap, 'shin')
+    assert devig_snapshot(snap, 'shin') is first
+    assert devig_snapshot(snap, 'power') is not first
+
+
+def test_market_holds_per_group_and_event():
+    cols = ColumnarOdds(make_events())
+    holds = MarketHolds(cols, devig_columns(cols))
+    assert holds.overround[0] == pytest.approx(1 / 1.5 + 1 / 2.6)
+    assert holds.hold[0] == pytest.approx(1 / 1.5 + 1 / 2.6 - 1)
+    np.testing.assert_allclose(holds.no_vig_sum, [1.0, 1.0])
+    assert holds.group_hold(0, 'fanduel', 'h2h') == pytest.approx(holds.hold[0])
+    assert holds.group_hold(0, 'draftkings', 'h2h') is None
+    assert holds.group_hold(1, 'fanduel', 'h2h') is None
+
+    per_event = holds.event_hold('h2h')
+    assert per_event[0] == pytest.approx(holds.hold[0])
+    assert np.isnan(per_event[1])
+    assert holds.event_hold('h2h') is per_event
+    assert np.isnan(holds.event_hold('spreads')).all()
+
+
+def test_devig_stage_seeds_the_published_snapshot():
+    events = make_events()
+    columns, derived = devig_stage(events, 'power')
+    snap = SnapshotStore().publish('k', events, columns=columns, derived=derived)
+    assert snap.columns is columns
+    assert market_holds(snap) is derived['hold']
+    assert devig_snapshot(snap, 'power') is next(v for k, v in derived.items() if k != 'hold')
+    # an unseeded snapshot builds its holds once on demand
+    plain = SnapshotStore().publish('k', make_events())
+    assert market_holds(plain) is market_holds(plain)
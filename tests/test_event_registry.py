@@ -0,0 +1,58 @@
+from src.event_registry import EventRegistry
+from src.ttl_cache import TTLCache
+
+
+def make_event(event_id, price):
+    return {
+        'id': event_id,
+        'bookmakers': [{'key': 'dk', 'markets': [{'key': 'h2h', 'outcomes': [{'name': 'A', 'price': price}]}]}],
+    }
+
+
+def test_registry_rows_and_snapshot_lookup():
+    reg = EventRegistry()
+    assert reg.set_sport_ids({'sport_a': ['e1', 'e2'], 'sport_b': ['e3']}) == 3
+    events = [make_event('e2', 2.0), make_event('e1', 1.9)]
+    reg.index_snapshot(events, 'sport_a', now=100.0)
+    reg.assign_rows('e2', 0, [0, 1], 'b @ a')
+    reg.assign_rows('e1', 2, [2, 3], 'd @ c')
+
+    assert reg.snapshot_index('e1') == 1
+    assert reg.event_for_row(3) == 'e1'
+    assert reg.rows_for('e2') == (0, 1)
+    assert reg.sport_for('e3') == 'sport_b'
+    assert [g[0] for g in reg.row_groups()] == [0, 2]
+    assert reg.row_count() == 4
+
+    reg.clear_rows()
+    assert reg.event_for_row(0) is None
+    assert reg.rows_for('e2') == ()
+
+
+def test_registry_tracks_last_change():
+    reg = EventRegistry()
+    reg.index_snapshot([make_event('e1', 2.0)], now=10.0)
+    reg.index_snapshot([make_event('e1', 2.0)], now=20.0)
+    assert reg.entry('e1').last_change == 10.0
+    reg.index_snapshot([make_event('e1', 2.1)], now=30.0)
+    assert reg.entry('e1').last_change == 30.0
+
+
+def test_registry_reads_odds_through_the_cache_and_prunes():
+    cache = TTLCache(ttl=60)
+    reg = EventRegistry(cache)
+    cache.put(('e1', 'alternate_spreads', 'dk'), {'id': 'e1'})
+    assert reg.cached_odds('e1', 'alternate_spreads', 'dk') == {'id': 'e1'}
+    assert reg.cached_odds('e1', 'alternate_spreads', 'fd') is None
+
+    reg.set_sport_ids({'sport_a': ['e1']})
+    reg.index_snapshot([make_event('e1', 2.0), make_event('e2', 2.0), {'bookmakers': []}], 'sport_a')
+    assert 'e2' in reg and '#2' in reg
+    reg.assign_rows(EventRegistry.event_key({'bookmakers': []}, 2), 0, [0], 'x @ y')
+    assert reg.event_for_row(0) == '#2'
+    reg.clear_rows()
+    reg.index_snapshot([make_event('e3', 2.0)], 'sport_a')
+    # dropped from the snapshot: pruned unless the events endpoint still lists it
+    assert 'e1' in reg and 'e3' in reg
+    assert 'e2' not in reg and '#2' not in reg
+    assert len(reg) == 2
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from src.kelly import kelly_fractions, simultaneous_kelly
+from src.utils import kelly_criterion
+
+
+def test_matches_scalar_kelly_and_masks_invalid_inputs():
+    probs = [0.55, 0.4, 0.5, 0.0, 1.0, 0.6, np.nan]
+    odds = [2.0, 3.0, 1.8, 2.0, 2.0, 1.0, 2.0]
+    f = kelly_fractions(probs, odds)
+    for i in range(3):
+        assert f[i] == pytest.approx(kelly_criterion(probs[i], odds[i]))
+    assert f[2] == 0.0
+    assert np.isnan(f[3:]).all()
+
+
+def test_multiplier_and_caps():
+    f = kelly_fractions([0.6, 0.6, 0.6], [2.0, 2.0, 2.0], multiplier=0.5)
+    np.testing.assert_allclose(f, [0.1, 0.1, 0.1])
+
+    capped = kelly_fractions([0.6, 0.7], [2.0, 2.0], max_fraction=0.25)
+    np.testing.assert_allclose(capped, [0.2, 0.25])
+
+    books = ['dk', 'dk', 'fd']
+    per_book = kelly_fractions([0.6, 0.7, 0.7], [2.0, 2.0, 2.0], books=books, book_cap=0.3)
+    assert per_book[:2].sum() == pytest.approx(0.3)
+    assert per_book[0] / per_book[1] == pytest.approx(0.2 / 0.4)
+    assert per_book[2] == pytest.approx(0.3)
+
+    mapped = kelly_fractions([0.6, 0.7, 0.7], [2.0, 2.0, 2.0], books=books, book_cap={'fd': 0.1})
+    np.testing.assert_allclose(mapped, [0.2, 0.4, 0.1])
+
+
+def test_simultaneous_kelly_single_bet_matches_classic_kelly():
+    result = simultaneous_kelly([0.55], [2.0])
+    assert result.exact
+    assert result.fractions[0] == pytest.approx(kelly_criterion(0.55, 2.0), abs=1e-6)
+
+
+def test_simultaneous_kelly_is_optimal_for_exclusive_outcomes():
+    p = np.array([0.55, 0.4])
+    d = np.array([2.0, 2.8])
+    result = simultaneous_kelly(p, d, groups=['e', 'e'])
+
+    def growth(f):
+        none = 1 - p.sum()
+        return (p[0] * np.log(1 + f[0] * (d[0] - 1) - f[1])
+                + p[1] * np.log(1 + f[1] * (d[1] - 1) - f[0])
+                + none * np.log(1 - f.sum()))
+
+    best = growth(result.fractions)
+    assert best == pytest.approx(result.growth)
+    for delta in ([0.01, 0], [-0.01, 0], [0, 0.01], [0, -0.01]):
+        assert growth(result.fractions + np.array(delta)) <= best + 1e-12
+    # hedged exclusive bets grow faster than sizing each one independently
+    assert best > growth(kelly_fractions(p, d))
+
+
+def test_simultaneous_kelly_respects_book_bankrolls_and_invalid_inputs():
+    rng = np.random.default_rng(3)
+    n = 200
+    p = rng.uniform(0.3, 0.6, n)
+    d = (1 / p) * rng.uniform(1.0, 1.08, n)
+    d[0] = 1.0
+    books = ['dk' if i % 3 else 'fd' for i in range(n)]
+    result = simultaneous_kelly(p, d, groups=np.arange(n) // 2, books=books, bankrolls={'dk': 500, 'fd': 50})
+    assert not result.exact
+    assert result.stakes[0] == 0.0
+    assert (result.stakes >= 0).all()
+    stakes_fd = sum(s for s, b in zip(result.stakes, books) if b == 'fd')
+    assert stakes_fd <= 50 + 1e-6
+    assert result.stakes.sum() <= 550 + 1e-6
+
+
+def test_simultaneous_kelly_terminates_on_strong_favourites():
+    with np.errstate(all='raise'):
+        result = simultaneous_kelly([0.9] * 3, [3.0] * 3)
+    assert np.isfinite(result.growth)
+    # exposure stays strictly below the bankroll, so losing every bet is survivable
+    assert 0.99 < result.fractions.sum() < 1.0
+    assert np.allclose(result.fractions, result.fractions[0])
+
+    with np.errstate(all='raise'):
+        books = simultaneous_kelly([0.95, 0.95], [5.0, 5.0], books=['a', 'b'], bankrolls={'a': 100, 'b': 100})
+    assert np.all(books.stakes < 100) and np.isfinite(books.growth)
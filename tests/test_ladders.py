@@ -0,0 +1,54 @@
+from src.ladders import PointLadder, ladder_for
+
+
+def make_spread_ladder():
+    outcomes = []
+    for pt in (1.5, 2.5, 3.0, 3.5, 4.5, 7.0):
+        outcomes.append({'name': 'Home', 'point': -pt, 'price': 1.9})
+        outcomes.append({'name': 'Away', 'point': pt, 'price': 1.95})
+    outcomes.append({'name': 'Home', 'point': None, 'price': 2.0})
+    return outcomes
+
+
+def test_ladder_lookup_and_neighbors():
+    ladder = PointLadder(make_spread_ladder())
+    assert len(ladder) == 12
+    assert [o['point'] for o in ladder.at(-3.5)] == [-3.5, 3.5]
+    assert ladder.count_at(3.0) == 2
+    assert ladder.count_at(5.0) == 0
+    assert ladder.neighbors(3.5) == (3.0, 4.5)
+    assert ladder.neighbors(1.5) == (None, 2.5)
+    assert ladder.nearest_point(6.0) == 7.0
+    assert ladder.distinct_points() == [1.5, 2.5, 3.0, 3.5, 4.5, 7.0]
+
+
+def test_ladder_select_matches_board_rules():
+    ladder = PointLadder(make_spread_ladder())
+    assert ladder.select('Home', 'spreads', 3.5, favorite='Home') == {'name': 'Home', 'point': -3.5, 'price': 1.9}
+    assert ladder.select('Away', 'spreads', -3.5, favorite='Home')['point'] == 3.5
+    assert ladder.select('Home', 'spreads', 5.0) is None
+
+    totals = PointLadder([
+        {'name': 'Over', 'point': 47.5, 'price': 1.9},
+        {'name': 'Under', 'point': 47.5, 'price': 1.95},
+        {'name': 'Over', 'point': 48.5, 'price': 2.0},
+    ])
+    assert totals.select('Under', 'totals', 47.5)['price'] == 1.95
+    assert totals.select('Over', 'totals', 48.5)['price'] == 2.0
+
+
+def test_ladder_for_rebuilds_when_outcomes_replaced():
+    market = {'key': 'spreads', 'outcomes': make_spread_ladder()}
+    first = ladder_for(market)
+    assert ladder_for(market) is first
+    market['outcomes'] = first.at(3.0)
+    assert len(ladder_for(market)) == 2
+    assert set(market) == {'key', 'outcomes'}
+
+
+def test_ladder_for_uses_the_given_memo():
+    market = {'key': 'spreads', 'outcomes': make_spread_ladder()}
+    memo = {}
+    ladder = ladder_for(market, memo)
+    assert memo == {id(market): ladder}
+    assert ladder_for(market, memo) is ladder
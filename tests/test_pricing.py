@@ -0,0 +1,107 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.pricing import (
+    DISPLAY_FORMATS,
+    FormatCache,
+    ODDS_FORMATS,
+    VECTOR_CONVERSIONS,
+    american_table,
+    convert_odds,
+    decimal_index,
+    format_decimal_price,
+    format_odds,
+    format_price,
+    format_prices,
+)
+from src.utils import odds_converter
+
+
+def test_scalar_round_trips_every_pair():
+    values = {'decimal': 2.5, 'american': 150.0, 'probability': 0.4, 'fractional': 1.5}
+    for src in ODDS_FORMATS:
+        for dst in ODDS_FORMATS:
+            assert convert_odds(src, dst, values[src]) == pytest.approx(values[dst])
+
+
+def test_edge_prices():
+    assert convert_odds('american', 'decimal', 100) == 2.0
+    assert convert_odds('american', 'decimal', -100) == 2.0
+    assert convert_odds('decimal', 'american', 2.0) == 100.0
+    assert odds_converter('american', 'probability', -110) == pytest.approx(110 / 210)
+    with pytest.raises(ValueError):
+        convert_odds('decimal', 'moneyline', 2.0)
+
+
+def test_vectorized_matches_scalar_and_masks_invalid():
+    american = np.array([-250.0, -100.0, 100.0, 120.0, 0.0])
+    dec = convert_odds('american', 'decimal', american)
+    assert dec.shape == american.shape
+    for a, d in zip(american[:-1], dec[:-1]):
+        assert d == pytest.approx(convert_odds('american', 'decimal', float(a)))
+    assert math.isnan(dec[-1])
+
+    back = convert_odds('decimal', 'american', np.array([1.4, 2.0, 3.0, 1.0, 0.5]))
+    np.testing.assert_allclose(back[:3], [-250.0, 100.0, 200.0])
+    assert np.isnan(back[3:]).all()
+
+    probs = convert_odds('probability', 'decimal', [0.5, 0.0, 1.2])
+    assert probs[0] == 2.0 and np.isnan(probs[1:]).all()
+
+
+def test_american_table_feeds_vector_conversions():
+    american = np.array([-20000.0, -110.0, -100.0, 100.0, 135.0, 20000.0])
+    for dst in ('decimal', 'probability', 'fractional'):
+        looked_up = convert_odds('american', dst, american)
+        arithmetic = VECTOR_CONVERSIONS[('decimal', dst)](1 + np.where(american > 0, american / 100, 100 / -american))
+        np.testing.assert_array_equal(looked_up, arithmetic)
+    # off-grid values fall back to the arithmetic kernels
+    mixed = convert_odds('american', 'decimal', [-110.5, 25000.0, 0.0])
+    np.testing.assert_allclose(mixed[:2], [1 + 100 / 110.5, 251.0])
+    assert np.isnan(mixed[2])
+    assert len(american_table()) == 40001
+
+
+def test_table_formatting_matches_arithmetic():
+    prices = [1.01, 1.5, 1.91, 2.0, 2.1, 3.75, 12.0, 201.0, 1.005, 250.0, 1.9090909]
+    for fmt in DISPLAY_FORMATS:
+        expected = [format_decimal_price(p, fmt) for p in prices]
+        assert [format_price(p, fmt) for p in prices] == expected
+        assert format_prices(prices + [1.0, float('nan')], fmt) == expected + ['N/A', 'N/A']
+    assert format_price(1.91, 'american') == '-110'
+    assert format_price(2.5, 'american') == '+150'
+
+    index, hit = decimal_index(np.array([1.91, 1.9090909, 201.0, 201.01]))
+    assert hit.tolist() == [True, False, True, False]
+    assert index[0] == 91
+
+
+def test_format_odds_from_probability_and_american():
+    assert format_odds(0.5, 'probability', 'probability') == '50.0%'
+    assert format_odds(0.5, 'probability', 'american') == '+100'
+    assert format_odds(0.4, 'probability', 'american') == '+150'
+    assert format_odds(0.4, 'probability', 'decimal') == '2.50'
+    assert format_odds(-110, 'american', 'decimal') == '1.91'
+    with pytest.raises(ZeroDivisionError):
+        format_odds(0.0, 'probability', 'american')
+
+
+def test_format_cache_is_bounded_and_counts_hits():
+    cache = FormatCache(max_entries=3)
+    board = [1.91, 2.1, 1.91, 1.91, 2.1]
+    assert [cache.format(p, 'decimal', 'american') for p in board] == ['-110', '+110', '-110', '-110', '+110']
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (3, 2, 2)
+    assert stats['hit_rate'] == pytest.approx(0.6)
+
+    for p in (3.0, 4.0):
+        cache.format(p, 'decimal', 'american')
+    assert len(cache) == 3 and cache.stats()['evictions'] == 1
+    with pytest.raises(ZeroDivisionError):
+        cache.format(1.0, 'decimal', 'american')
+    assert len(cache) == 3
+
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()['misses'] == 5
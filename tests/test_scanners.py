@@ -0,0 +1,132 @@
+import pytest
+
+from src.scanners import KEY_NUMBER_MODELS, find_arbitrage, find_middles, scan_middles, scan_snapshots
+from src.snapshots import ColumnarOdds, SnapshotStore
+
+
+def book(key, markets):
+    return {'key': key, 'markets': [{'key': m, 'outcomes': o} for m, o in markets.items()]}
+
+
+def make_events():
+    return [
+        {'id': 'e1', 'home_team': 'Home', 'away_team': 'Away', 'bookmakers': [
+            book('dk', {
+                'h2h': [{'name': 'Home', 'price': 2.10}, {'name': 'Away', 'price': 1.80}],
+                'spreads': [{'name': 'Home', 'point': -3.5, 'price': 2.05},
+                            {'name': 'Away', 'point': 3.5, 'price': 1.80}],
+            }),
+            book('fd', {
+                'h2h': [{'name': 'Home', 'price': 1.80}, {'name': 'Away', 'price': 2.05}],
+                'spreads': [{'name': 'Home', 'point': 3.5, 'price': 1.40},
+                            {'name': 'Away', 'point': -3.5, 'price': 3.00}],
+                'totals': [{'name': 'Over', 'point': 44.5, 'price': 1.90},
+                           {'name': 'Under', 'point': 44.5, 'price': 1.90}],
+            }),
+        ]},
+        {'id': 'soccer', 'bookmakers': [
+            book('dk', {'h2h': [{'name': 'A', 'price': 2.6}, {'name': 'B', 'price': 2.9}, {'name': 'Draw', 'price': 2.9}]}),
+            book('fd', {'h2h': [{'name': 'A', 'price': 3.2}, {'name': 'B', 'price': 2.5}]}),
+        ]},
+    ]
+
+
+def test_finds_cross_book_moneyline_and_ranks_by_margin():
+    opps = find_arbitrage([ColumnarOdds(make_events())])
+    assert [(o.event_id, o.market) for o in opps] == [('e1', 'h2h')]
+    opp = opps[0]
+    implied = 1 / 2.10 + 1 / 2.05
+    assert opp.implied_sum == pytest.approx(implied)
+    assert opp.margin == pytest.approx(1 / implied - 1)
+    assert [(leg['outcome'], leg['book'], leg['price']) for leg in opp.legs] == [
+        ('Home', 'dk', 2.10), ('Away', 'fd', 2.05)]
+    stakes = opp.stakes(100.0)
+    assert sum(stakes) == pytest.approx(100.0)
+    assert stakes[0] * 2.10 == pytest.approx(stakes[1] * 2.05) == pytest.approx(100 / implied)
+    # a spread line needs both sides of the same line; -3.5 / +3.5 across books is not one
+    assert find_arbitrage([ColumnarOdds(make_events())], min_margin=0.5) == []
+
+
+def test_alternate_lines_and_snapshots_are_stacked():
+    events = make_events()
+    alt = [{'id': 'e1', 'bookmakers': [book('mgm', {
+        'alternate_spreads': [{'name': 'Away', 'point': 3.5, 'price': 2.2},
+                              {'name': 'Home', 'point': -3.5, 'price': 1.5}],
+        'alternate_totals': [{'name': 'Under', 'point': 44.5, 'price': 2.2}],
+    })]}]
+    store = SnapshotStore()
+    snaps = [store.publish('a', events[:1]), store.publish('b', events[1:])]
+    opps = scan_snapshots(snaps, alt)
+    found = {(o.market, o.point): o for o in opps}
+    assert set(found) == {('h2h', None), ('spreads', 3.5), ('totals', 44.5)}
+    spread = found[('spreads', 3.5)]
+    assert {(leg['outcome'], leg['book'], leg['point']) for leg in spread.legs} == {
+        ('Home', 'dk', -3.5), ('Away', 'mgm', 3.5)}
+    assert spread.event is events[0]
+    assert opps == sorted(opps, key=lambda o: -o.margin)
+
+
+def test_three_way_lines_need_the_draw_and_matching_names():
+    events = make_events()[1:]
+    assert find_arbitrage([ColumnarOdds(events)]) == []
+    fd_outcomes = events[0]['bookmakers'][1]['markets'][0]['outcomes']
+    fd_outcomes.append({'name': 'Draw', 'price': 9.0})
+    opps = find_arbitrage([ColumnarOdds(events)])
+    assert len(opps) == 1 and len(opps[0].legs) == 3
+    assert sum(leg['stake_fraction'] for leg in opps[0].legs) == pytest.approx(1.0)
+    # a name no other book uses leaves the line with four "outcomes": skipped
+    fd_outcomes[0]['name'] = 'Team A'
+    assert find_arbitrage([ColumnarOdds(events)]) == []
+
+
+def nfl_events():
+    return [{'id': 'nfl1', 'sport_key': 'americanfootball_nfl', 'bookmakers': [
+        book('dk', {'spreads': [{'name': 'Home', 'point': -2.5, 'price': 1.95},
+                                {'name': 'Away', 'point': 2.5, 'price': 1.87}]}),
+        book('fd', {'spreads': [{'name': 'Home', 'point': -3.5, 'price': 2.10},
+                                {'name': 'Away', 'point': 3.5, 'price': 1.87}]}),
+    ]}]
+
+
+def test_middle_window_is_priced_with_key_numbers():
+    middles = find_middles([ColumnarOdds(nfl_events())], {'nfl1': 'americanfootball_nfl'})
+    best = middles[0]
+    assert (best.market, best.low, best.high) == ('spreads', 2.5, 3.5)
+    assert [(leg['outcome'], leg['book'], leg['point']) for leg in best.legs] == [
+        ('Home', 'dk', -2.5), ('Away', 'fd', 3.5)]
+
+    model = KEY_NUMBER_MODELS[('americanfootball_nfl', 'spreads')]
+    pmf = model.pmf([2.5])[0]
+    p3 = pmf[list(model.support).index(3)]
+    assert best.hit_probability == pytest.approx(p3)
+    assert best.push_probability == 0.0
+    s = 1 / 1.95 + 1 / 1.87
+    assert best.ev == pytest.approx(p3 * (2 / s - 1) + (1 - p3) * (1 / s - 1))
+    assert best.ev > 0 and sum(best.stakes(10.0)) == pytest.approx(10.0)
+    # 3 is a key number: it lands far more often than 4 from the same line
+    assert p3 > 2 * pmf[list(model.support).index(4)]
+    assert middles == sorted(middles, key=lambda m: -m.ev)
+    assert find_middles([ColumnarOdds(nfl_events())], {'nfl1': 'soccer_epl'}) == []
+
+
+def test_total_middles_push_on_whole_numbers_and_use_alternate_ladders():
+    events = [{'id': 'nba1', 'bookmakers': [
+        book('dk', {'totals': [{'name': 'Over', 'point': 220.0, 'price': 1.91},
+                               {'name': 'Under', 'point': 220.0, 'price': 1.91}]}),
+    ]}]
+    alt = [{'id': 'nba1', 'bookmakers': [book('fd', {'alternate_totals': [
+        {'name': 'Over', 'point': 224.5, 'price': 2.3},
+        {'name': 'Under', 'point': 222.0, 'price': 1.6},
+        {'name': 'Under', 'point': 226.0, 'price': 1.4},
+    ]})]}]
+    store = SnapshotStore()
+    snap = store.publish(('basketball_nba', 'totals', 'dk,fd'), events)
+    middles = scan_middles([snap], alt, min_ev=-1.0, max_width=5)
+    found = {(m.low, m.high): m for m in middles}
+    assert set(found) == {(220.0, 222.0), (224.5, 226.0)}
+    mid = found[(220.0, 222.0)]
+    assert mid.event is events[0]
+    pmf = KEY_NUMBER_MODELS[('basketball_nba', 'totals')].pmf([220.0])[0]
+    k = lambda total: pmf[total - 120]
+    assert mid.hit_probability == pytest.approx(k(221))
+    assert mid.push_probability == pytest.approx(k(220) + k(222))
@@ -0,0 +1,278 @@
+import numpy as np
+import pytest
+
+import itertools
+
+from src.simulation import (
+    pl_distribution, pl_stages, sample_stats, shard_sizes, shutdown_pool, simulate_paths, simulate_pl,
+    simulate_pl_sharded, wager_intervals,
+)
+
+
+def wager(outcome, prob, dec, market='h2h', event='Away @ Home', stake=10.0, **extra):
+    data = {'event': event, 'outcome': outcome, 'market': market, 'consensus_probability': prob,
+            'odds_decimal': dec, 'stake': stake}
+    data.update(extra)
+    return data
+
+
+def test_intervals_share_axes_per_event():
+    wagers = [
+        wager('Home', 0.60, 1.8),
+        wager('Away', 0.40, 2.6),
+        wager('Home', 0.45, 2.1, market='spreads'),
+        wager('Over', 0.50, 2.0, market='totals'),
+        wager('Under', 0.50, 2.0, market='totals'),
+        wager('Other', 0.30, 3.5, event='B @ A'),
+        wager('Bad', 0.5, 1.0),
+    ]
+    iv = wager_intervals(wagers)
+    assert iv.index == [0, 1, 2, 3, 4, 5]
+    assert iv.n_axes == 3
+    assert iv.axis.tolist() == [0, 0, 0, 1, 1, 2]
+    assert iv.lo.tolist() == pytest.approx([0.0, 0.6, 0.0, 0.0, 0.5, 0.0])
+    assert iv.hi.tolist() == pytest.approx([0.6, 1.0, 0.45, 0.5, 1.0, 0.3])
+
+
+def test_draw_sits_between_home_and_away():
+    wagers = [
+        wager('Home', 0.45, 2.3, market='h2h_3_way'),
+        wager('Draw', 0.27, 3.9, market='h2h_3_way'),
+        wager('Away', 0.28, 3.8, market='h2h_3_way'),
+    ]
+    iv = wager_intervals(wagers)
+    assert iv.lo.tolist() == pytest.approx([0.0, 0.45, 0.72])
+    assert iv.hi.tolist() == pytest.approx([0.45, 0.72, 1.0])
+
+
+def test_same_event_outcomes_are_exclusive_and_nested():
+    wagers = [
+        wager('Home', 0.60, 1.8),
+        wager('Away', 0.40, 2.6),
+        wager('Home', 0.45, 2.1, market='spreads'),
+    ]
+    iv = wager_intervals(wagers)
+    wins = iv.wins(np.random.default_rng(0).random((20000, iv.n_axes)))
+    assert not (wins[:, 0] & wins[:, 1]).any()
+    # covering the spread implies winning outright
+    assert not (wins[:, 2] & ~wins[:, 0]).any()
+    assert wins.mean(axis=0) == pytest.approx([0.60, 0.40, 0.45], abs=0.015)
+
+
+def test_simulated_pl_matches_expected_value_and_ruin():
+    wagers = [
+        wager('Home', 0.55, 2.0, event_id='e1'),
+        wager('Away', 0.45, 2.4, event_id='e1'),
+        wager('Over', 0.5, 2.1, market='totals', event_id='e2', event='C @ D'),
+    ]
+    result = simulate_pl(wagers, 200000, rng=np.random.default_rng(1))
+    expected = sum(w['stake'] * (w['consensus_probability'] * w['odds_decimal'] - 1) for w in wagers)
+    assert result.n_wagers == 3 and result.total_stake == 30.0
+    assert result.totals.mean() == pytest.approx(expected, abs=0.1)
+    # exactly one side of e1 always wins, so the whole set can never lose
+    assert not result.all_lose.any()
+    assert result.totals.min() == pytest.approx(10 * 2.0 - 30)
+
+    independent = [dict(w, event_id=f'x{i}', event=f'A{i} @ B{i}') for i, w in enumerate(wagers)]
+    ruin = simulate_pl(independent, 200000, rng=np.random.default_rng(1)).all_lose.mean()
+    assert ruin == pytest.approx(0.45 * 0.55 * 0.5, abs=0.01)
+
+
+def test_no_valid_wagers():
+    assert simulate_pl([wager('Home', 0.5, 1.0)], 100) is None
+    assert simulate_pl([], 100) is None
+
+
+def test_chunked_float32_kernel_matches_moments():
+    rng = np.random.default_rng(7)
+    wagers = []
+    for e in range(40):
+        p = rng.uniform(0.3, 0.7)
+        wagers.append(wager('Home', p, 1.02 / p, event_id=f'e{e}', stake=float(rng.uniform(5, 50))))
+        wagers.append(wager('Over', 0.5, 2.0, market='totals', event_id=f'e{e}', stake=5.0))
+    expected = sum(w['stake'] * (w['consensus_probability'] * w['odds_decimal'] - 1) for w in wagers)
+    variance = sum(w['stake'] ** 2 * w['odds_decimal'] ** 2 * w['consensus_probability'] * (1 - w['consensus_probability'])
+                   for w in wagers)
+
+    # tiny chunks: many iterations, each a (chunk x wagers) block
+    for dtype in (np.float32, np.float64):
+        result = simulate_pl(wagers, 100000, rng=np.random.default_rng(3), dtype=dtype, chunk_elements=5000)
+        assert result.totals.dtype == dtype and result.totals.shape == (100000,)
+        assert result.totals.mean() == pytest.approx(expected, abs=4 * np.sqrt(variance / 100000))
+        assert result.totals.var() == pytest.approx(variance, rel=0.05)
+        assert np.array_equal(result.all_lose, np.isclose(result.totals, -result.total_stake))
+
+
+def test_thresholds_cover_the_probability():
+    iv = wager_intervals([wager('Home', 0.25, 4.2), wager('Away', 0.75, 1.3), wager('X', 1.0, 1.1, event='Y @ Z')])
+    lo, width = iv.thresholds()
+    assert lo.dtype == np.uint32
+    assert (width / 2.0 ** 32).tolist() == pytest.approx([0.25, 0.75, 1.0])
+    assert lo[1] == lo[0] + width[0]
+
+
+def test_exact_distribution_matches_enumeration():
+    wagers = [
+        wager('A', 0.55, 2.0, event='A @ B', stake=10.0),
+        wager('C', 0.40, 2.7, event='C @ D', stake=5.0),
+        wager('Over', 0.50, 2.1, market='totals', event='E @ F', stake=8.0),
+    ]
+    dist = pl_distribution(wagers)
+    assert dist.mode == "exact"
+    expected = {}
+    for wins in itertools.product([True, False], repeat=3):
+        p, pl = 1.0, 0.0
+        for w, won in zip(wagers, wins):
+            p *= w['consensus_probability'] if won else 1 - w['consensus_probability']
+            pl += w['stake'] * (w['odds_decimal'] - 1) if won else -w['stake']
+        expected[round(pl, 6)] = expected.get(round(pl, 6), 0.0) + p
+    assert dist.values.tolist() == pytest.approx(sorted(expected))
+    assert dist.probs.tolist() == pytest.approx([expected[v] for v in sorted(expected)])
+    assert dist.prob_all_lose == pytest.approx(0.45 * 0.60 * 0.50)
+    assert dist.stats()["prob_ruin"] == pytest.approx(dist.prob_all_lose)
+    assert dist.scaled(0.5).mean() == pytest.approx(dist.mean() * 0.5)
+
+
+def test_exact_distribution_keeps_same_event_correlation():
+    wagers = [wager('Home', 0.60, 1.8), wager('Away', 0.40, 2.6)]
+    dist = pl_distribution(wagers)
+    # exactly one side wins: no joint win, no joint loss
+    assert dist.values.tolist() == pytest.approx([-10.0 + 8.0, -10.0 + 16.0])
+    assert dist.probs.tolist() == pytest.approx([0.6, 0.4])
+    assert dist.prob_all_lose == 0.0
+
+
+def test_binned_distribution_matches_monte_carlo():
+    rng = np.random.default_rng(3)
+    wagers = [
+        wager('A', p, 1.0 / p * 1.04, event=f'A{i} @ B{i}', stake=float(rng.uniform(1, 20)))
+        for i, p in enumerate(rng.uniform(0.2, 0.7, 40))
+    ]
+    dist = pl_distribution(wagers)
+    assert dist.mode == "binned"
+    expected_mean = sum(w['stake'] * (w['consensus_probability'] * w['odds_decimal'] - 1) for w in wagers)
+    assert dist.mean() == pytest.approx(expected_mean, rel=1e-6)
+    stats = dist.stats()
+    sim = simulate_pl(wagers, 100_000, rng=np.random.default_rng(0))
+    sampled = sample_stats(sim.totals, sim.all_lose)
+    spread = float(np.std(sim.totals))
+    for key in ("median", "p5", "p95"):
+        assert abs(stats[key] - sampled[key]) < 0.05 * spread
+    assert stats["prob_loss"] == pytest.approx(sampled["prob_loss"], abs=0.01)
+    again = pl_distribution(wagers)
+    assert np.array_equal(again.values, dist.values) and np.array_equal(again.probs, dist.probs)
+
+
+def test_distribution_falls_back_when_too_costly():
+    wagers = [wager('A', 0.5, 2.1, event=f'A{i} @ B{i}') for i in range(20)]
+    assert pl_distribution(wagers, max_support=4, max_cost=10) is None
+    assert pl_distribution([wager('Bad', 0.5, 1.0)]) is None
+
+
+def test_stages_refine_to_a_final_summary():
+    small = [wager('A', 0.55, 2.0, event='A @ B'), wager('C', 0.40, 2.7, event='C @ D')]
+    stages = list(pl_stages(small, 10_000))
+    assert [(s.mode, s.final) for s in stages] == [("exact", True)]
+
+    rng = np.random.default_rng(5)
+    large = [
+        wager('A', p, 1.0 / p * 1.03, event=f'A{i} @ B{i}', stake=float(rng.uniform(1, 20)))
+        for i, p in enumerate(rng.uniform(0.2, 0.7, 30))
+    ]
+    stages = list(pl_stages(large, 10_000))
+    assert [s.final for s in stages] == [False, True]
+    assert stages[-1].stats["mean"] == pytest.approx(pl_distribution(large).mean())
+    assert stages[-1].stats_half["mean"] == pytest.approx(stages[-1].stats["mean"] * 0.5)
+    assert list(pl_stages([wager('Bad', 0.5, 1.0)], 10_000)) == []
+
+
+def test_cancelled_runs_stop_early():
+    wagers = [wager('A', 0.5, 2.1, event=f'A{i} @ B{i}', stake=1.0 + i * 0.37) for i in range(30)]
+    assert simulate_pl(wagers, 10_000, should_stop=lambda: True) is None
+    assert pl_distribution(wagers, should_stop=lambda: True) is None
+    seen = []
+
+    def stop_after_first():
+        return bool(seen)
+
+    for summary in pl_stages(wagers, 10_000, should_stop=stop_after_first):
+        seen.append(summary)
+    assert [s.final for s in seen] == [False]
+
+
+def test_shard_sizes_cover_every_trial():
+    assert shard_sizes(10, 4) == [4, 4, 2]
+    assert shard_sizes(8, 4) == [4, 4]
+    assert shard_sizes(3, 4) == [3]
+
+
+def test_seeded_shards_are_reproducible_across_workers():
+    wagers = [wager('A', 0.45, 2.3, event=f'A{i} @ B{i}', stake=1.0 + i) for i in range(12)]
+    serial = simulate_pl_sharded(wagers, 25_000, seed=11, workers=1, shard_trials=10_000)
+    again = simulate_pl_sharded(wagers, 25_000, seed=11, workers=1, shard_trials=10_000)
+    other = simulate_pl_sharded(wagers, 25_000, seed=12, workers=1, shard_trials=10_000)
+    assert serial.totals.shape == (25_000,)
+    assert np.array_equal(serial.totals, again.totals)
+    assert not np.array_equal(serial.totals, other.totals)
+    try:
+        pooled = simulate_pl_sharded(wagers, 25_000, seed=11, workers=2, shard_trials=10_000)
+    finally:
+        shutdown_pool()
+    assert np.array_equal(serial.totals, pooled.totals)
+    assert np.array_equal(serial.all_lose, pooled.all_lose)
+    assert simulate_pl_sharded(wagers, 25_000, seed=11, workers=1, should_stop=lambda: True) is None
+
+
+def test_paths_compound_a_single_wager():
+    bet = wager('A', 0.5, 2.5, event='A @ B', stake=200.0, sportsbook='book')
+    result = simulate_paths([bet], {'book': 1000.0, 'idle': 500.0}, slates=3, paths=20_000, seed=4)
+    # win: 1000 * (0.8 + 0.2 * 2.5) = 1300; loss: 800; the idle account stays at 500
+    assert result.start == 1500.0
+    assert sorted(set(np.round(result.final, 6).tolist())) == pytest.approx(
+        [500 + 1000 * 1.3 ** k * 0.8 ** (3 - k) for k in range(4)]
+    )
+    assert result.band(50)[1] in (pytest.approx(1300 + 500), pytest.approx(800 + 500))
+    assert result.quantiles[:, 0].tolist() == [1500.0] * 5
+    # peak-to-trough after one loss from the start is 300 / 1500
+    assert result.max_drawdown.min() >= 0
+    assert np.percentile(result.max_drawdown, 95) == pytest.approx(1 - (500 + 512) / 1500)
+    assert result.prob_ruin() == 0.0
+
+
+def test_paths_record_time_to_ruin():
+    bet = wager('A', 0.5, 2.5, event='A @ B', stake=1000.0, sportsbook='book')
+    result = simulate_paths([bet], {'book': 1000.0}, slates=6, paths=40_000, seed=9)
+    # all-in: ruined at the first loss, so survival halves every slate
+    assert result.survival().tolist() == pytest.approx([0.5 ** t for t in range(7)], abs=0.01)
+    assert result.prob_ruin() == pytest.approx(1 - 0.5 ** 6, abs=0.01)
+    assert result.ruin_slate_percentile(50) == pytest.approx(1.0)
+    assert result.stats()["prob_ruin"] == result.prob_ruin()
+    full = simulate_paths([bet], {'book': 1000.0}, slates=1, paths=1_000, seed=9)
+    half = simulate_paths([bet], {'book': 1000.0}, slates=1, paths=1_000, stake_scale=0.5, seed=9)
+    # same seed, same outcomes: a half-Kelly path wins exactly where the full one did
+    assert np.array_equal(full.final > 1000.0, half.final > 1000.0)
+    assert np.array_equal(full.ruin_slate == 1, half.final == 500.0)
+
+
+def test_paths_are_reproducible_and_cancellable():
+    wagers = [wager('A', 0.45, 2.3, event=f'A{i} @ B{i}', stake=20.0, sportsbook='x') for i in range(8)]
+    a = simulate_paths(wagers, {'x': 1000.0}, slates=20, paths=500, seed=3)
+    b = simulate_paths(wagers, {'x': 1000.0}, slates=20, paths=500, seed=3)
+    assert np.array_equal(a.quantiles, b.quantiles) and np.array_equal(a.final, b.final)
+    assert simulate_paths(wagers, {'x': 1000.0}, slates=20, paths=500, should_stop=lambda: True) is None
+    assert simulate_paths([wager('Bad', 0.5, 1.0)], {'x': 1000.0}, slates=5, paths=10) is None
+
+
+def test_binned_favourite_slate_matches_exact():
+    rng = np.random.default_rng(21)
+    wagers = [
+        wager('A', p, 1.0 / p * 1.02, event=f'A{i} @ B{i}', stake=float(rng.uniform(5, 30)))
+        for i, p in enumerate(rng.uniform(0.7, 0.95, 16))
+    ]
+    exact = pl_distribution(wagers)
+    binned = pl_distribution(wagers, max_support=4)
+    assert exact.mode == "exact" and binned.mode == "binned"
+    assert binned.mean() == pytest.approx(exact.mean(), rel=1e-6)
+    assert binned.prob_below(-1e-9) == pytest.approx(exact.prob_below(-1e-9), abs=2e-3)
+    # nothing wraps from the all-win end onto the all-lose end
+    assert binned.prob_below(-binned.total_stake + 20.0) < 1e-9
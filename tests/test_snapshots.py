@@ -0,0 +1,81 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.snapshots import SnapshotStore
+
+
+def make_events():
+    return [
+        {'id': 'e1', 'bookmakers': [
+            {'key': 'dk', 'markets': [{'key': 'h2h', 'outcomes': [{'name': 'A', 'price': 1.9}, {'name': 'B', 'price': 2.0}]}]},
+            {'key': 'pinnacle', 'markets': [{'key': 'h2h', 'outcomes': [{'name': 'A', 'price': 1.95}, {'name': 'B', 'price': 1.95}]}]},
+        ]},
+        {'id': 'e2', 'bookmakers': [
+            {'key': 'dk', 'markets': [{'key': 'spreads', 'outcomes': [
+                {'name': 'C', 'price': 1.91, 'point': -3.5}, {'name': 'D', 'price': 1.91, 'point': 3.5}]}]},
+        ]},
+    ]
+
+
+def test_publish_is_versioned_and_shared_by_reference():
+    store = SnapshotStore()
+    seen = []
+    store.subscribe(seen.append)
+    events = make_events()
+    now = time.time()
+    snap = store.publish(('sport', 'h2h', 'dk'), events, fetched_at=now + 1.0)
+    assert snap.events[0] is events[0]
+    assert store.publish(('sport', 'h2h', 'dk'), events, fetched_at=now + 1.0) is snap
+    newer = store.publish(('sport', 'h2h', 'dk'), make_events(), fetched_at=now + 2.0)
+    assert newer.version > snap.version
+    assert store.latest(('sport', 'h2h', 'dk')) is newer
+    assert seen == [snap, newer]
+
+
+def test_columnar_view_is_read_only_and_grouped():
+    store = SnapshotStore()
+    cols = store.publish('k', make_events()).columns
+    assert len(cols) == 6
+    assert cols.n_groups == 3
+    assert cols.book_keys == ['dk', 'pinnacle']
+    assert list(cols.group_offsets) == [0, 2, 4, 6]
+    assert cols.event_slice(1) == slice(4, 6)
+    np.testing.assert_allclose(cols.prob[:2], [1 / 1.9, 1 / 2.0])
+    assert np.isnan(cols.point[0]) and cols.point[4] == -3.5
+    with pytest.raises(ValueError):
+        cols.price[0] = 3.0
+
+
+def test_wager_sets_skip_unchanged_publishes():
+    store = SnapshotStore()
+    received = []
+    store.subscribe(received.append, wagers=True)
+    first = store.publish_wagers('board', [{'stake': 1.0}])
+    assert store.publish_wagers('board', [{'stake': 1.0}]) is first
+    store.publish_wagers('board', [{'stake': 2.0}])
+    assert len(received) == 2
+    assert store.latest_wagers().wagers == ({'stake': 2.0},)
+
+
+def test_wager_sets_are_kept_per_source():
+    store = SnapshotStore()
+    a = store.publish_wagers('board-a', [{'stake': 1.0}])
+    b = store.publish_wagers('board-b', [{'stake': 5.0}])
+    assert store.latest_wagers('board-a') is a
+    assert store.latest_wagers('board-b') is b
+    assert store.latest_wagers() is b
+    store.drop_wagers('board-b')
+    assert store.latest_wagers('board-b') is None
+    assert store.latest_wagers('board-a') is a
+
+
+def test_snapshots_age_out_and_are_capped():
+    now = time.time()
+    store = SnapshotStore(stale_ttl=300, max_snapshots=2)
+    store.publish('old', make_events(), fetched_at=now - 600)
+    assert store.latest('old') is None
+    for i in range(3):
+        store.publish(('sport', i), make_events(), fetched_at=now - 10 + i)
+    assert [snap.key for snap in store.snapshots()] == [('sport', 1), ('sport', 2)]
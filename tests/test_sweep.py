@@ -0,0 +1,104 @@
+import copy
+import threading
+
+import pytest
+
+from src.consensus import compute_board
+from src.devig import devig_events
+from src.sweep import SweepOpportunity, TopK, board_opportunities, run_sweep
+
+
+def h2h_board(home_prices, away_prices, event_id='e1'):
+    books = [f'b{i}' for i in range(len(home_prices))]
+    return [{
+        'id': event_id, 'home_team': 'Home', 'away_team': 'Away',
+        'bookmakers': [
+            {'key': key, 'markets': [{'key': 'h2h', 'outcomes': [
+                {'name': 'Home', 'price': home}, {'name': 'Away', 'price': away}]}]}
+            for key, home, away in zip(books, home_prices, away_prices)
+        ],
+    }], books
+
+
+def test_board_opportunities_match_compute_board():
+    events, books = h2h_board([1.80, 1.95, 2.05], [2.10, 1.90, 1.80])
+    expected_events = copy.deepcopy(events)
+    devig_events(expected_events)
+    board = compute_board(expected_events, 'h2h', books, ['b1', 'b2'])
+
+    opps = board_opportunities('nfl', 'h2h', events, books, {'b1': 1000.0, 'b2': 500.0})
+    positive = [r for r in range(len(board)) if board.best_edge[r] > 0]
+    assert [o.outcome for o in opps] == [board.outcome_names[r] for r in positive]
+    for opp, r in zip(opps, positive):
+        assert opp.book == board.best_account_key(r)
+        assert opp.edge == pytest.approx(board.best_edge[r])
+        assert opp.kelly_fraction == pytest.approx(board.kelly[r])
+        assert opp.kelly_dollars == pytest.approx(board.kelly[r] * {'b1': 1000.0, 'b2': 500.0}[opp.book])
+        assert opp.event_id == 'e1' and opp.sport == 'nfl'
+
+
+def test_board_opportunities_use_the_consensus_line():
+    events = [{'id': 't1', 'home_team': 'Home', 'away_team': 'Away', 'bookmakers': [
+        {'key': key, 'markets': [{'key': 'totals', 'outcomes': [
+            {'name': 'Over', 'point': 44.5, 'price': over}, {'name': 'Under', 'point': 44.5, 'price': under}]}]}
+        for key, over, under in (('b0', 1.91, 1.91), ('b1', 1.87, 1.95), ('b2', 2.10, 1.80))
+    ]}]
+    opps = board_opportunities('nfl', 'totals', events, ['b0', 'b1', 'b2'], {'b2': 100.0})
+    assert opps[0].event['_consensus_point'] == 44.5
+    assert [(o.outcome, o.point, o.book) for o in opps] == [('Over', 44.5, 'b2')]
+    # the payload itself is left as fetched
+    assert '_consensus_point' not in events[0]
+    assert 'no_vig_probability' not in events[0]['bookmakers'][0]['markets'][0]['outcomes'][0]
+
+
+def make_opp(edge, dollars, event_id='e'):
+    return SweepOpportunity('nfl', 'h2h', {'id': event_id}, 'Home', None, 'b', 2.0, 0.5, edge, 0.0, dollars)
+
+
+def test_topk_replaces_board_entries_and_reranks():
+    top = TopK(k=2)
+    top.update(('nfl', 'h2h'), [make_opp(0.01, 50), make_opp(0.05, 10)])
+    top.update(('nba', 'h2h'), [make_opp(0.03, 90)])
+    assert [o.edge for o in top.top()] == [0.05, 0.03]
+
+    top.update(('nfl', 'h2h'), [make_opp(0.02, 5)])
+    assert [o.edge for o in top.top()] == [0.03, 0.02]
+
+    top.set_rank('kelly_dollars')
+    assert [o.kelly_dollars for o in top.top()] == [90, 5]
+    with pytest.raises(ValueError):
+        top.set_rank('price')
+
+
+def test_topk_set_rank_sees_rows_below_the_old_cut():
+    top = TopK(k=1)
+    top.update(('nfl', 'h2h'), [make_opp(0.05, 10), make_opp(0.01, 500)])
+    assert [o.edge for o in top.top()] == [0.05]
+    top.set_rank('kelly_dollars')
+    assert [o.kelly_dollars for o in top.top()] == [500]
+
+
+def test_run_sweep_fetches_every_board_and_skips_failures():
+    events, books = h2h_board([1.80, 1.95, 2.05], [2.10, 1.90, 1.80])
+    calls = []
+    lock = threading.Lock()
+
+    def fetch(sport, market):
+        with lock:
+            calls.append((sport, market))
+        if sport == 'bad':
+            raise RuntimeError('boom')
+        return events if market == 'h2h' else []
+
+    def evaluate(sport, market, payload):
+        return board_opportunities(sport, market, payload, books, {'b2': 100.0})
+
+    top = TopK(k=10)
+    seen = []
+    results = run_sweep(fetch, evaluate, ['nfl', 'bad'], top=top, on_board=lambda key, opps: seen.append(key))
+    assert sorted(calls) == sorted((s, m) for s in ('nfl', 'bad') for m in ('h2h', 'spreads', 'totals'))
+    assert set(results) == {('nfl', 'h2h'), ('nfl', 'spreads'), ('nfl', 'totals')}
+    assert sorted(seen) == sorted(results)
+    assert results[('nfl', 'h2h')] and len(top) == len(results[('nfl', 'h2h')])
+    # the shared payload is never annotated
+    assert 'no_vig_probability' not in events[0]['bookmakers'][0]['markets'][0]['outcomes'][0]
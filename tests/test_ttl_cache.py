@@ -0,0 +1,41 @@
+from src.ttl_cache import TTLCache, MemoryBudget, estimate_size
+
+
+def test_ttl_and_stale_window():
+    cache = TTLCache(ttl=10, stale_ttl=60)
+    cache.put('k', {'a': 1}, ts=100.0)
+    assert cache.get_entry('k', now=105.0) == ({'a': 1}, 100.0)
+    assert cache.get_entry('k', now=120.0) is None
+    assert cache.get_entry('k', allow_stale=True, now=120.0) == ({'a': 1}, 100.0)
+    assert cache.get_entry('k', allow_stale=True, now=200.0) is None
+    assert len(cache) == 0
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['stale_hits'] == 1 and stats['expirations'] == 1
+
+
+def test_lru_eviction_by_entries():
+    cache = TTLCache(ttl=100, max_entries=2)
+    cache.put('a', 1, ts=0.0)
+    cache.put('b', 2, ts=0.0)
+    assert cache.get_entry('a', now=1.0) is not None
+    cache.put('c', 3, ts=1.0)
+    assert 'b' not in cache._data
+    assert set(cache._data) == {'a', 'c'}
+    assert cache.stats()['evictions'] == 1
+
+
+def test_shared_budget_evicts_across_caches():
+    payload = ['x' * 1000 for _ in range(10)]
+    size = estimate_size(payload)
+    budget = MemoryBudget(max_bytes=int(size * 2.5))
+    first = TTLCache(ttl=100, budget=budget)
+    second = TTLCache(ttl=100, budget=budget)
+    first.put('a', payload, ts=0.0)
+    first.put('b', list(payload), ts=0.0)
+    second.put('c', list(payload), ts=0.0)
+    assert budget.used_bytes <= budget.max_bytes
+    assert 'c' in second._data
+    assert 'a' not in first._data
+
+    second.close()
+    assert second not in budget._caches
@@ -0,0 +1,128 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.clv import format_time, parse_time
+from src.weight_fit import (
+    PREFS_KEY, TrainingRows, collect, consensus_log_loss, fit_sport_weights, fit_weights,
+    save_fitted_weights, settle_results, stored_training_samples, training_rows,
+)
+
+
+def two_way(key, market, first, second, p_first, point=None, vig=1.04):
+    outcomes = [
+        {'name': first, 'price': 1 / (p_first * vig)},
+        {'name': second, 'price': 1 / ((1 - p_first) * vig)},
+    ]
+    if point is not None:
+        outcomes[0]['point'] = point if market == 'totals' else point
+        outcomes[1]['point'] = point if market == 'totals' else -point
+    return {'key': key, 'markets': [{'key': market, 'outcomes': outcomes}]}
+
+
+def test_training_rows_settle_each_market():
+    events = [{'id': 'g1', 'home_team': 'Home', 'away_team': 'Away', 'bookmakers': [
+        two_way('a', 'h2h', 'Home', 'Away', 0.6),
+        two_way('b', 'h2h', 'Home', 'Away', 0.55),
+        two_way('a', 'spreads', 'Home', 'Away', 0.5, point=-3.5),
+        two_way('b', 'spreads', 'Home', 'Away', 0.5, point=-3.5),
+        two_way('c', 'spreads', 'Home', 'Away', 0.5, point=-2.5),   # alone on its line
+        two_way('a', 'totals', 'Over', 'Under', 0.5, point=44.5),
+        two_way('b', 'totals', 'Over', 'Under', 0.48, point=44.5),
+        two_way('a', 'totals', 'Over', 'Under', 0.5, point=41.0),   # push: dropped
+        two_way('b', 'totals', 'Over', 'Under', 0.5, point=41.0),
+    ]}, {'id': 'unsettled', 'bookmakers': [two_way('a', 'h2h', 'X', 'Y', 0.5), two_way('b', 'h2h', 'X', 'Y', 0.5)]}]
+    results = settle_results([
+        {'id': 'g1', 'completed': True, 'home_team': 'Home', 'away_team': 'Away',
+         'scores': [{'name': 'Home', 'score': '24'}, {'name': 'Away', 'score': '17'}]},
+        {'id': 'live', 'completed': False, 'home_team': 'X', 'away_team': 'Y', 'scores': None},
+    ])
+    assert results == {'g1': ('Home', 'Away', 24.0, 17.0)}
+
+    rows = training_rows(events, results)
+    # h2h Home, spreads Home -3.5 and totals Under 44.5, each quoted by books a and b
+    assert len(rows) == 6 and rows.n_instances == 3
+    by_instance = {}
+    for inst, book, prob in zip(rows.instance, rows.book, rows.prob):
+        by_instance.setdefault(int(inst), {})[rows.book_keys[book]] = prob
+    assert sorted(round(v['a'], 6) for v in by_instance.values()) == [0.5, 0.5, 0.6]
+    assert sorted(round(v['b'], 6) for v in by_instance.values()) == [0.5, 0.52, 0.55]
+
+
+def synthetic_rows(n_games=4000, seed=3):
+    rng = np.random.default_rng(seed)
+    truth = rng.uniform(0.2, 0.8, n_games)
+    won = rng.random(n_games) < truth
+    noise = {'sharp': 0.01, 'soft': 0.08, 'softer': 0.15}
+    instance, book, prob = [], [], []
+    for b, (key, sd) in enumerate(noise.items()):
+        p = np.clip(truth + rng.normal(0, sd, n_games), 0.02, 0.98)
+        instance.append(np.arange(n_games))
+        book.append(np.full(n_games, b))
+        prob.append(np.where(won, p, 1 - p))
+    return TrainingRows(np.concatenate(instance), np.concatenate(book), np.concatenate(prob), list(noise))
+
+
+def test_fit_ranks_books_by_accuracy_and_lowers_log_loss():
+    rows = synthetic_rows()
+    weights = fit_weights(rows, l2=1e-4, iterations=800)
+    sharp, soft, softer = weights
+    assert sharp == pytest.approx(1.0)
+    assert soft < 0.5 and softer < 0.5
+    assert consensus_log_loss(rows, weights) < consensus_log_loss(rows, np.ones(3)) - 1e-3
+
+
+def test_gradient_matches_finite_differences():
+    rows = synthetic_rows(300)
+    theta = np.log(np.array([1.0, 0.5, 0.2]))
+    # one Adam step from theta moves along -sign(grad); compare with the numeric gradient sign
+    eps = 1e-6
+    numeric = []
+    for b in range(3):
+        up, down = theta.copy(), theta.copy()
+        up[b] += eps
+        down[b] -= eps
+        numeric.append((consensus_log_loss(rows, np.exp(up)) - consensus_log_loss(rows, np.exp(down))) / (2 * eps))
+    w = np.exp(theta)
+    w_rows = w[rows.book]
+    s = np.bincount(rows.instance, w_rows * rows.prob)
+    total = np.bincount(rows.instance, w_rows)
+    q = s / total
+    contrib = w_rows * (rows.prob - q[rows.instance]) / (q * total)[rows.instance]
+    analytic = -np.bincount(rows.book, contrib, 3) / rows.n_instances
+    assert analytic == pytest.approx(numeric, rel=1e-4, abs=1e-8)
+
+
+def test_collect_batches_snapshots_and_fit_writes_prefs(tmp_path):
+    kickoff = parse_time('2026-10-18T17:00:00Z')
+    games = [
+        {'id': f'g{i}', 'completed': True, 'home_team': 'Home', 'away_team': 'Away',
+         'commence_time': format_time(kickoff + (0 if i < 3 else 7200)),
+         'scores': [{'name': 'Home', 'score': str(20 + i)}, {'name': 'Away', 'score': '21'}]}
+        for i in range(5)
+    ]
+    calls = []
+
+    def get_snapshot(sport, date, markets, event_ids):
+        calls.append((date, event_ids))
+        return [{'id': eid, 'bookmakers': [two_way('a', 'h2h', 'Home', 'Away', 0.5),
+                                          two_way('b', 'h2h', 'Home', 'Away', 0.4)]}
+                for eid in event_ids.split(',')]
+
+    directory = str(tmp_path / 'samples')
+    assert collect('nfl', lambda s: games, get_snapshot, directory=directory) == 5
+    assert calls == [(format_time(kickoff - 600), 'g0,g1,g2'), (format_time(kickoff + 7200 - 600), 'g3,g4')]
+    # already stored games are not fetched again
+    assert collect('nfl', lambda s: games, get_snapshot, directory=directory) == 0
+    assert len(calls) == 2
+
+    weights = fit_sport_weights(stored_training_samples('nfl', directory), min_rows=1)
+    assert set(weights) == {'a', 'b'} and max(weights.values()) == 1.0
+
+    prefs_path = str(tmp_path / 'prefs.json')
+    json.dump({'theme': 'dark', PREFS_KEY: {'nba': {'a': 0.5}}}, open(prefs_path, 'w'))
+    assert save_fitted_weights({'nfl': weights, 'nhl': {}}, prefs_path)
+    prefs = json.load(open(prefs_path))
+    assert prefs['theme'] == 'dark'
+    assert prefs[PREFS_KEY] == {'nba': {'a': 0.5}, 'nfl': weights}